@@ -0,0 +1,240 @@
+"""
+Benchmarks for the core rules hot paths.
+
+Reports operations per second, the memory a call allocates and keeps, and
+its peak memory for each case.
+Results can be saved as a named baseline and later compared against it:
+
+    python benchmarks/bench_rules.py --save main
+    python benchmarks/bench_rules.py --compare main
+
+The comparison exits with status 1 if any case got slower than the allowed
+tolerance, so it can gate a change before it reaches the simulation farm.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import argparse
+import contextlib
+import json
+import time
+import tracemalloc
+
+from character import Character
+from combat import Combat
+from dice import Die
+from items import all_items
+from quests import QuestProgress, compile_quest
+from ritual import Ritual
+from spell import Spell
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# --- Benchmark cases ---
+# Each case builds its state once and returns the function to time.
+
+def bench_exploding_roll():
+    die = Die()
+    return die.exploding_roll
+
+def bench_attribute_check_total():
+    char = Character("Bench", 0, 0, 4, 2, 1, skills=["Swords"])
+    return lambda: char._get_attribute_check_total("warrior", ["Swords"])
+
+def bench_take_damage_dice_string():
+    char = Character("Bench", 0, 0, 4, 2, 1)
+    def run():
+        char.hp = char.max_hp
+        char.take_damage("2d6-1", "slashing")
+    return run
+
+def bench_combat_attack():
+    attacker = Character("Attacker", 0, 0, 4, 2, 1, skills=["Swords"])
+    defender = Character("Defender", 0, 0, 3, 3, 0)
+    defender.inventory.append(all_items["leather_armor"])
+    defender.equip(all_items["leather_armor"])
+    combat = Combat(attacker, defender)
+    sword = all_items["sword"]
+    def run():
+        defender.hp = defender.max_hp
+        combat.attack(attacker, defender, sword)
+    return run
+
+def bench_cast_spell():
+    char = Character("Bench", 0, 0, 1, 1, 5, skills=["Thaumaturgy"])
+    spell = Spell("Bench Spell", circle=1, dl=5, mana_cost=1, effect=lambda caster, target, enhancement_level: None)
+    char.spellbook.append(spell)
+    def run():
+        char.mana = char.max_mana
+        char.cast_spell(spell)
+    return run
+
+def bench_perform_ritual():
+    char = Character("Bench", 0, 0, 1, 1, 5, skills=["Thaumaturgy"])
+    spell = Spell("Bench Ritual", circle=4, dl=13, mana_cost=8, effect=lambda caster, target, enhancement_level: None)
+    ritual = Ritual(spell, char)
+    ritual.pool_mana(char, 8)
+    ritual.spend_time(2)
+    return ritual.perform_ritual
+
+def bench_quest_update():
+    objectives = [{"kind": "kill", "description": f"Defeat monster {i}", "target": f"Monster {i}", "count": 3} for i in range(10)]
+    quest = QuestProgress(compile_quest("bench", {"title": "Bench Quest", "description": "A quest for benchmarking.", "objectives": objectives}))
+    event = {"type": "monster_killed", "name": "Nobody"}
+    return lambda: quest.update(event)
+
+BENCHMARKS = {
+    "die.exploding_roll": bench_exploding_roll,
+    "character.attribute_check_total": bench_attribute_check_total,
+    "character.take_damage_dice_string": bench_take_damage_dice_string,
+    "combat.attack": bench_combat_attack,
+    "character.cast_spell": bench_cast_spell,
+    "ritual.perform_ritual": bench_perform_ritual,
+    "quest.update": bench_quest_update,
+}
+
+# --- Measurement ---
+
+def measure_speed(func, min_time=0.2, repeats=5):
+    """Returns the best operations/second over `repeats` timing runs."""
+    # Calibrate the loop count so a run takes about `min_time` seconds
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        loops *= 10
+    loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return loops / best
+
+def _allocation_filters():
+    # Leave out tracemalloc's own bookkeeping for the snapshots
+    return [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<unknown>")]
+
+def measure_allocations(func, calls=100):
+    """
+    Returns (blocks allocated, bytes allocated, peak bytes) per call, traced
+    with tracemalloc. Allocations are the blocks and bytes that a call
+    left allocated. They are read from a snapshot diff around each single
+    call, summing only the source lines whose usage grew. Peak bytes is how
+    far traced memory rose above where the call started; memory allocated
+    and freed within the call only shows up there.
+    """
+    func()  # warm up caches so they are not counted
+    filters = _allocation_filters()
+    tracemalloc.start(1)
+    try:
+        blocks = size = 0
+        for _ in range(calls):
+            before = tracemalloc.take_snapshot()
+            func()
+            after = tracemalloc.take_snapshot()
+            for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno"):
+                if stat.count_diff > 0:
+                    blocks += stat.count_diff
+                if stat.size_diff > 0:
+                    size += stat.size_diff
+        total_peak = 0
+        for _ in range(calls):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total_peak += peak - current
+    finally:
+        tracemalloc.stop()
+    return blocks / calls, size / calls, total_peak / calls
+
+def run_benchmarks(names=None, min_time=0.2):
+    results = {}
+    # The rules print a line for almost every action; keep the report readable.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, setup in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            func = setup()
+            ops = measure_speed(func, min_time)
+            blocks, size, peak_bytes = measure_allocations(func)
+            results[name] = {
+                "ops_per_sec": ops,
+                "blocks_per_call": blocks,
+                "bytes_per_call": size,
+                "peak_bytes_per_call": peak_bytes,
+            }
+    return results
+
+# --- Baselines ---
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_baseline(name, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"Baseline saved to {baseline_path(name)}")
+
+def load_baseline(name):
+    with open(baseline_path(name)) as f:
+        return json.load(f)
+
+def print_results(results):
+    print(f"{'benchmark':<36} {'ops/sec':>12} {'blocks/call':>12} {'bytes/call':>11} {'peak bytes':>11}")
+    for name, result in results.items():
+        print(f"{name:<36} {result['ops_per_sec']:>12,.0f} {result['blocks_per_call']:>12.2f} "
+              f"{result['bytes_per_call']:>11.0f} {result['peak_bytes_per_call']:>11.0f}")
+
+def compare(results, baseline, tolerance):
+    """Prints the change against a baseline. Returns the names of cases that regressed."""
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<36} {'-':>12} {result['ops_per_sec']:>12,.0f}      new")
+            continue
+        old = baseline[name]["ops_per_sec"]
+        new = result["ops_per_sec"]
+        change = new / old - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  SLOWER"
+            regressions.append(name)
+        print(f"{name:<36} {old:>12,.0f} {new:>12,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the core rules hot paths.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--save", metavar="BASELINE", help="save the results as a named baseline")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before failing (default: 0.10)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.min_time)
+    print_results(results)
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.compare:
+        print()
+        regressions = compare(results, load_baseline(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
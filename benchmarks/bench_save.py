@@ -0,0 +1,60 @@
+"""
+Compares the binary save format against pickling the whole Character:
+file size, and saves/loads per second for the same mid-game character.
+
+    python benchmarks/bench_save.py
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import argparse
+import contextlib
+import pickle
+
+from bench_rules import measure_speed
+from character import Character
+from effects import Poisoned
+from items import all_items
+from quests import create_quest
+from save_codec import decode_character, encode_character
+from spells import all_spells
+from talents import all_talents
+
+def make_character():
+    char = Character("Bench", 320, 256, 4, 3, 2, skills=["Swords", "Thaumaturgy", "Perception"],
+                     talents=[all_talents["tough_as_nails"], all_talents["scholar"]])
+    char.spellbook.extend([all_spells["magic_light"], all_spells["healing_hand"]])
+    for key in ("sword", "shield", "leather_armor", "novices_wand", "health_potion", "health_potion", "mana_potion"):
+        char.add_item_to_inventory(all_items[key])
+    char.equip(all_items["sword"])
+    char.equip(all_items["shield"])
+    char.equip(all_items["leather_armor"])
+    char.add_quest(create_quest("goblin_menace"))
+    char.add_quest(create_quest("stolen_heirloom"))
+    char.add_status_effect(Poisoned(duration=3))
+    return char
+
+FORMATS = {
+    "pickle": (lambda char: pickle.dumps(char), pickle.loads),
+    "binary": (encode_character, decode_character),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare save formats.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    args = parser.parse_args(argv)
+
+    print(f"{'format':<8} {'bytes':>8} {'saves/sec':>12} {'loads/sec':>12}")
+    with open(os.devnull, "w") as devnull:
+        for name, (dump, load) in FORMATS.items():
+            with contextlib.redirect_stdout(devnull):
+                char = make_character()
+                data = dump(char)
+                saves = measure_speed(lambda: dump(char), args.min_time)
+                loads = measure_speed(lambda: load(data), args.min_time)
+            print(f"{name:<8} {len(data):>8,} {saves:>12,.0f} {loads:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
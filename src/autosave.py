@@ -0,0 +1,143 @@
+"""
+Saving without stalling the frame. Autosaver.save() only takes a snapshot
+of the player's state on the game thread (plain data, see
+save_codec.character_state); encoding, writing and fsyncing happen on a
+background thread. If another save is asked for while one is being
+written, only the newest snapshot is kept. With a SaveJournal, each
+snapshot also compacts the journal (see save_journal).
+"""
+import threading
+
+from event_manager import event_manager
+from save_codec import character_state
+from save_manager import DEFAULT_SAVE, pack_save, write_save_file
+from scheduler import scheduler, TICKS_PER_SECOND
+
+class Autosaver:
+    """
+    Background saves for one player. Besides save(), two policies are
+    available: save_every() for periodic saves in game time, and save_on()
+    to save whenever one of the given events is posted.
+    """
+    def __init__(self, player, filename=DEFAULT_SAVE, scheduler=scheduler, manager=event_manager, compress=True,
+                 journal=None, world_snapshot=None):
+        self.player = player
+        self.journal = journal
+        # Returns the encoded world to save along with the player, if there is one
+        self.world_snapshot = world_snapshot
+        self.filename = filename
+        self.compress = compress
+        self.scheduler = scheduler
+        self.manager = manager
+        self.saves_written = 0
+        self.last_error = None
+        # Numbers of save() requests: the last one made, and the newest
+        # that was written and that failed
+        self._requested = 0
+        self._saved_through = 0
+        self._failed_through = 0
+        self._timers = []
+        self._subscriptions = []
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def save(self):
+        """
+        Snapshots the player now and writes the save in the background.
+        Returns a request number to pass to result(), or None once closed.
+        """
+        snapshot = character_state(self.player)
+        world = self.world_snapshot() if self.world_snapshot else b""
+        with self._condition:
+            if self._closed:
+                return None
+            # Journal segments up to `covered` can go once this snapshot is written
+            covered = self.journal.rotate() if self.journal else None
+            self._requested += 1
+            self._pending = (snapshot, world, covered, self._requested)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return self._requested
+
+    def save_every(self, seconds):
+        """Saves every `seconds` of game time; returns the timer handle."""
+        handle = self.scheduler.call_every(seconds * TICKS_PER_SECOND, self.save)
+        self._timers.append(handle)
+        return handle
+
+    def save_on(self, *event_types):
+        """Saves whenever an event of one of `event_types` is posted."""
+        for event_type in event_types:
+            self._subscriptions.append(self.manager.subscribe(event_type, self._on_event, owner=self))
+
+    def _on_event(self, event):
+        self.save()
+
+    def stop_policies(self):
+        for handle in self._timers:
+            handle.cancel()
+        for subscription in self._subscriptions:
+            self.manager.unsubscribe(subscription)
+        self._timers = []
+        self._subscriptions = []
+
+    def result(self, request):
+        """
+        Whether the save asked for by `request` (from save()) reached the
+        disk: True once it or a newer snapshot is written, False if its
+        write failed, None while it is still pending.
+        """
+        with self._condition:
+            if self._saved_through >= request:
+                return True
+            if self._failed_through >= request:
+                return False
+            return None
+
+    def wait(self, timeout=None):
+        """Blocks until every requested save is on disk. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """Stops the policies, finishes any pending save and ends the worker thread."""
+        self.stop_policies()
+        self.wait(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                (snapshot, world, covered, request), self._pending = self._pending, None
+                self._busy = True
+            saved = False
+            try:
+                write_save_file(pack_save(snapshot, self.compress, world=world), self.filename)
+                if covered is not None:
+                    self.journal.discard_through(covered)
+                self.saves_written += 1
+                self.last_error = None
+                saved = True
+            except Exception as e:
+                self.last_error = e
+                print(f"Error saving game: {e}")
+            finally:
+                with self._condition:
+                    if saved:
+                        self._saved_through = request
+                    else:
+                        self._failed_through = request
+                    self._busy = False
+                    self._condition.notify_all()
@@ -0,0 +1,81 @@
+import numpy as np
+from dice import Die
+
+class BatchDice:
+    """
+    Rolls many dice at once using NumPy.
+    Every method returns an integer array instead of a single value, so
+    simulations can draw thousands of rolls with one call.
+    """
+    def __init__(self, sides=6, seed=None):
+        self.sides = sides
+        self.rng = np.random.default_rng(seed)
+
+    def roll(self, count):
+        """Rolls `count` dice."""
+        return self.rng.integers(1, self.sides + 1, size=count)
+
+    def roll_matrix(self, rows, cols):
+        """Rolls a rows x cols matrix of dice."""
+        return self.rng.integers(1, self.sides + 1, size=(rows, cols))
+
+    def exploding_roll(self, count):
+        """Makes `count` exploding rolls. Only the dice that rolled max are rerolled."""
+        totals = self.roll(count)
+        active = np.flatnonzero(totals == self.sides)
+        while active.size:
+            rerolls = self.rng.integers(1, self.sides + 1, size=active.size)
+            totals[active] += rerolls
+            active = active[rerolls == self.sides]
+        return totals
+
+    def exploding_roll_matrix(self, rows, cols):
+        """Makes a rows x cols matrix of exploding rolls."""
+        return self.exploding_roll(rows * cols).reshape(rows, cols)
+
+class BufferedDie(Die):
+    """
+    A drop-in replacement for Die that serves single rolls from a block
+    pre-drawn by a BatchDice. Assign it to `character.d6` or `combat.d6`
+    to take the per-roll RNG cost out of long simulations.
+    """
+    def __init__(self, sides=6, batch=None, buffer_size=4096):
+        super().__init__(sides)
+        self.batch = batch if batch is not None else BatchDice(sides)
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._index = 0
+        self._resized = {}
+
+    def _refill(self):
+        self._buffer = self.batch.roll(self.buffer_size).tolist()
+        self._index = 0
+
+    def roll(self):
+        if self._index >= len(self._buffer):
+            self._refill()
+        value = self._buffer[self._index]
+        self._index += 1
+        return value
+
+    def with_sides(self, sides):
+        if sides == self.sides:
+            return self
+        resized = self._resized.get(sides)
+        if resized is None:
+            # Share the generator so the resized die stays on the same stream
+            resized = BufferedDie(sides, BatchDice(sides, seed=self.batch.rng), self.buffer_size)
+            self._resized[sides] = resized
+        return resized
+
+    def rolls(self, count):
+        if count > self.buffer_size:
+            return self.batch.roll(count).tolist()
+        if self._index + count > len(self._buffer):
+            self._refill()
+        values = self._buffer[self._index:self._index + count]
+        self._index += count
+        return values
+
+    def exploding_rolls(self, count):
+        return self.batch.exploding_roll(count).tolist()
@@ -1,12 +1,16 @@
-import pygame
-from dice import Die
+from dice import Die, DiceExpression
 from spell import Spell
 from talent import Talent
 from items import Weapon, Armor, MagicImplement, Potion
 from talents import all_talents
 from event_manager import event_manager
+from rng import DICE
+from modifiers import ModifierStack, ModifiedStats
+from inventory import Inventory
+from effects import StatusEffects
+from scheduler import scheduler, TICKS_PER_SECOND
 import ritual
-import quest
+import quests
 
 SKILLS = {
     "warrior": ["Axes", "Blunt", "Polearms", "Riding", "Swords", "Unarmed"],
@@ -14,27 +18,43 @@ SKILLS = {
     "mage": ["Alchemy", "Awareness", "Herbalism", "Lore", "Thaumaturgy"],
 }
 
-class Character(pygame.sprite.Sprite):
-    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, color=(255, 0, 0)):
-        super().__init__()
+class Character:
+    """
+    The rules model of a character. It holds no rendering state and does not
+    import pygame; screens draw it through a CharacterSprite. `x`, `y` is the
+    top-left map position in pixels and `color` is what the sprite is filled with.
+    """
+    __slots__ = (
+        "name", "x", "y", "color",
+        "attributes", "skills", "talents", "spellbook", "sustained_spells", "spell_timers",
+        "status_effects", "inventory", "journal",
+        "equipped_weapon", "equipped_body_armor", "equipped_shield", "equipped_hands", "equipped_implement",
+        "d6", "damage_resistances", "modifiers",
+        "level", "xp", "xp_to_next_level",
+        "hp", "base_max_hp", "fate", "mana", "base_max_mana", "defense",
+        "__weakref__",
+    )
+
+    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, color=(255, 0, 0), rng=None):
         self.name = name
+        self.x = x
+        self.y = y
+        self.color = color
 
-        self.image = pygame.Surface((40, 40))
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-
-        self.attributes = {
+        # Every bonus from items, talents and effects goes through here
+        self.modifiers = ModifierStack()
+        self.attributes = ModifiedStats({
             "warrior": warrior,
             "rogue": rogue,
             "mage": mage,
-        }
+        }, self.modifiers)
         self.skills = skills if skills is not None else []
         self.talents = talents if talents is not None else []
         self.spellbook = []
         self.sustained_spells = []
-        self.status_effects = []
-        self.inventory = []
+        self.spell_timers = {}  # sustained spell -> TimerHandle for its expiry
+        self.status_effects = StatusEffects(self)
+        self.inventory = Inventory()
         self.journal = []
         self.equipped_weapon = None
         self.equipped_body_armor = None
@@ -42,6 +62,8 @@ class Character(pygame.sprite.Sprite):
         self.equipped_hands = None
         self.equipped_implement = None
         self.d6 = Die()
+        if rng is not None:
+            self.set_rng(rng)
         self.damage_resistances = {}
 
         # Advancement
@@ -49,29 +71,115 @@ class Character(pygame.sprite.Sprite):
         self.xp = 0
         self.xp_to_next_level = 100
 
-        # Bonuses
-        self.ranged_attack_bonus = 0
-        self.melee_damage_bonus = 0
-        self.awareness_bonus = 0
-        self.lore_bonus = 0
-        self.thaumaturgy_bonus = 0
-
         self.hp = 6 + self.attributes["warrior"]
-        self.max_hp = self.hp
+        self.base_max_hp = self.hp
 
         self.fate = max(1, self.attributes["rogue"])
 
         self.mana = 2 * self.attributes["mage"]
-        self.max_mana = self.mana
+        self.base_max_mana = self.mana
 
         self.defense = (self.attributes["warrior"] + self.attributes["rogue"]) // 2 + 4
 
         self.apply_talents()
 
+    def __getstate__(self):
+        # Only slots, so the default state is (None, {slot: value})
+        _, slots = super().__getstate__()
+        # Timers belong to the running scheduler; keep how long each sustained spell has left
+        slots["spell_timers"] = {spell: self.spell_time_left(spell) for spell in self.sustained_spells}
+        return None, slots
+
+    def __setstate__(self, state):
+        _, slots = state
+        timers = slots.pop("spell_timers", {})
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self.spell_timers = {}
+        for spell, ticks in timers.items():
+            self.sustain_spell(spell, ticks)
+
+    def set_rng(self, rng):
+        """Draws this character's dice from the `dice` stream of an RNGService."""
+        self.d6 = Die(rng=rng.stream(DICE))
+
     def apply_talents(self):
         for talent in self.talents:
             talent.apply(self)
 
+    def add_talent(self, talent):
+        if talent not in self.talents:
+            self.talents.append(talent)
+            talent.apply(self)
+
+    def remove_talent(self, talent):
+        if talent in self.talents:
+            self.talents.remove(talent)
+            talent.remove(self)
+
+    def add_modifiers(self, source, *modifiers):
+        """
+        Registers the modifiers granted by `source`. Raising max HP or Mana
+        raises the current value by the same amount, as a new talent would.
+        """
+        max_hp, max_mana = self.max_hp, self.max_mana
+        self.modifiers.add(source, *modifiers)
+        self._adjust_pools(max_hp, max_mana)
+
+    def remove_modifiers(self, source):
+        """Takes back everything `source` granted."""
+        max_hp, max_mana = self.max_hp, self.max_mana
+        removed = self.modifiers.remove(source)
+        self._adjust_pools(max_hp, max_mana)
+        return removed
+
+    def _adjust_pools(self, old_max_hp, old_max_mana):
+        if self.max_hp != old_max_hp:
+            self.hp = min(self.hp + max(0, self.max_hp - old_max_hp), self.max_hp)
+        if self.max_mana != old_max_mana:
+            self.mana = min(self.mana + max(0, self.max_mana - old_max_mana), self.max_mana)
+
+    @property
+    def max_hp(self):
+        return self.modifiers.apply("max_hp", self.base_max_hp)
+
+    @max_hp.setter
+    def max_hp(self, value):
+        self.base_max_hp = self.modifiers.base_for("max_hp", value)
+
+    @property
+    def max_mana(self):
+        return self.modifiers.apply("max_mana", self.base_max_mana)
+
+    @max_mana.setter
+    def max_mana(self, value):
+        self.base_max_mana = self.modifiers.base_for("max_mana", value)
+
+    @property
+    def ranged_attack_bonus(self):
+        return self.modifiers.total("ranged_attack")
+
+    @property
+    def melee_damage_bonus(self):
+        return self.modifiers.total("melee_damage")
+
+    @property
+    def awareness_bonus(self):
+        return self.modifiers.total("awareness")
+
+    @property
+    def lore_bonus(self):
+        return self.modifiers.total("lore")
+
+    @property
+    def thaumaturgy_bonus(self):
+        return self.modifiers.total("thaumaturgy")
+
+    @property
+    def spell_cost_penalty(self):
+        """Extra Mana per spell, from armor."""
+        return self.modifiers.total("spell_cost")
+
     def equip(self, item):
         if item not in self.inventory:
             print(f"{self.name} does not have {item.name} in their inventory.")
@@ -81,6 +189,7 @@ class Character(pygame.sprite.Sprite):
             if self.equipped_weapon:
                 self.unequip(self.equipped_weapon)
             self.equipped_weapon = item
+            self._update_shield_modifiers()
             print(f"{self.name} equipped {item.name}.")
         elif isinstance(item, Armor):
             if item.armor_type == "shield":
@@ -100,18 +209,27 @@ class Character(pygame.sprite.Sprite):
             if self.equipped_implement:
                 self.unequip(self.equipped_implement)
             self.equipped_implement = item
-            self.thaumaturgy_bonus += item.thaumaturgy_bonus
             print(f"{self.name} equipped {item.name}.")
         else:
             print(f"{item.name} is not an equippable item.")
+            return
 
-        # Apply passive bonuses from the equipped item
-        if item.properties.get("melee_damage_bonus"):
-            self.melee_damage_bonus += item.properties["melee_damage_bonus"]
+        if item is self.equipped_shield:
+            self._update_shield_modifiers()
+        else:
+            self.add_modifiers(item, *item.modifiers())
+
+    def _update_shield_modifiers(self):
+        # Can't get shield bonus if using a two-handed weapon
+        shield = self.equipped_shield
+        if shield:
+            two_handed = bool(self.equipped_weapon and self.equipped_weapon.two_handed)
+            self.add_modifiers(shield, *shield.modifiers(with_defense=not two_handed))
 
     def unequip(self, item):
         if item == self.equipped_weapon:
             self.equipped_weapon = None
+            self._update_shield_modifiers()
             print(f"{self.name} unequipped {item.name}.")
         elif item == self.equipped_body_armor:
             self.equipped_body_armor = None
@@ -123,15 +241,13 @@ class Character(pygame.sprite.Sprite):
             self.equipped_hands = None
             print(f"{self.name} unequipped {item.name}.")
         elif item == self.equipped_implement:
-            self.thaumaturgy_bonus -= item.thaumaturgy_bonus
             self.equipped_implement = None
             print(f"{self.name} unequipped {item.name}.")
         else:
             print(f"{item.name} is not equipped.")
+            return
 
-        # Remove passive bonuses from the unequipped item
-        if item.properties.get("melee_damage_bonus"):
-            self.melee_damage_bonus -= item.properties["melee_damage_bonus"]
+        self.remove_modifiers(item)
 
     def use_item(self, item):
         if item not in self.inventory:
@@ -147,89 +263,117 @@ class Character(pygame.sprite.Sprite):
         else:
             print(f"{item.name} is not a usable item.")
 
+    def post_inventory_events(self, enabled=True):
+        """
+        Starts (or stops) posting an inventory_updated event for every change
+        to this character's inventory. Only the player's inventory is worth
+        telling the game about, so monsters being stocked or a save being
+        restored don't touch the event bus.
+        """
+        self.inventory.unsubscribe(self._on_inventory_changed)
+        if enabled:
+            self.inventory.subscribe(self._on_inventory_changed)
+
+    def _on_inventory_changed(self, item, delta):
+        event_manager.post({"type": "inventory_updated", "item": item, "count": delta, "character": self})
+
     def add_item_to_inventory(self, item):
         self.inventory.append(item)
-        event_manager.post({"type": "inventory_updated", "item": item, "character": self})
         print(f"{self.name} received {item.name}.")
 
     def has_item(self, item_name):
-        return any(item.name == item_name for item in self.inventory)
+        return item_name in self.inventory
 
     def remove_item_from_inventory(self, item_name):
-        for item in self.inventory:
-            if item.name == item_name:
-                self.inventory.remove(item)
-                print(f"{self.name} lost {item.name}.")
-                return True
+        item = self.inventory.remove_named(item_name)
+        if item:
+            print(f"{self.name} lost {item.name}.")
+            return True
         return False
 
     @property
     def total_defense(self):
-        bonus = 0
-        if self.equipped_body_armor:
-            bonus += self.equipped_body_armor.defense_bonus
-        if self.equipped_hands:
-            bonus += self.equipped_hands.defense_bonus
-
-        # Can't get shield bonus if using a two-handed weapon
-        if self.equipped_shield:
-            if not (self.equipped_weapon and self.equipped_weapon.two_handed):
-                bonus += self.equipped_shield.defense_bonus
-
-        return self.defense + bonus
+        return self.modifiers.apply("defense", self.defense)
 
     @property
     def is_seriously_wounded(self):
         return self.hp <= self.max_hp / 2
 
+    def sustain_spell(self, spell, ticks):
+        """Keeps `spell` up for `ticks` ticks of game time, restarting its timer if it is already up."""
+        if spell not in self.sustained_spells:
+            self.sustained_spells.append(spell)
+        scheduler.cancel(self.spell_timers.get(spell))
+        self.spell_timers[spell] = scheduler.call_later(ticks, self.end_sustained_spell, spell)
+
+    def spell_time_left(self, spell):
+        """Ticks until the sustained `spell` ends; its full duration if it has no running timer."""
+        timer = self.spell_timers.get(spell)
+        if timer is None or not timer.active:
+            return spell.duration * TICKS_PER_SECOND
+        return max(1, timer.due - scheduler.now)
+
+    def end_sustained_spell(self, spell):
+        scheduler.cancel(self.spell_timers.pop(spell, None))
+        if spell in self.sustained_spells:
+            self.sustained_spells.remove(spell)
+            print(f"{self.name}'s {spell.name} ends.")
+
+    def dismiss_sustained_spells(self):
+        for spell in list(self.sustained_spells):
+            self.end_sustained_spell(spell)
+
     def get_sustained_penalty(self):
         return -len(self.sustained_spells)
 
     def add_status_effect(self, effect):
-        # Prevent duplicate effects of the same name
-        if not self.get_status_effect(effect.name):
-            self.status_effects.append(effect)
-            effect.on_apply(self)
+        # Effects of the same name follow the effect's stack rule
+        if self.status_effects.add(effect) is effect:
             print(f"{self.name} is now {effect.name}.")
 
+    def remove_status_effect(self, effect):
+        return self.status_effects.remove(effect)
+
     def get_status_effect(self, effect_name):
-        for effect in self.status_effects:
-            if effect.name == effect_name:
-                return effect
-        return None
+        return self.status_effects.get(effect_name)
 
-    def _get_attribute_check_total(self, attribute, relevant_skills):
+    def get_check_modifier(self, attribute, relevant_skills):
+        """
+        Returns (modifier, has_skill) for an attribute check: everything that
+        is added to the d6 roll, and whether the roll may explode.
+        """
         if attribute not in self.attributes:
             raise ValueError(f"Invalid attribute: {attribute}")
 
-        roll = self.d6.roll()
-        attribute_value = self.attributes[attribute]
-
         has_skill = any(skill in self.skills for skill in relevant_skills)
 
-        skill_bonus = 0
+        modifier = self.attributes[attribute]
         if has_skill:
-            skill_bonus = 2
-
-        if has_skill and roll == 6:
-            roll += self.d6.exploding_roll()
-
-        total = roll + attribute_value + skill_bonus
+            modifier += 2
 
         # Apply talent bonuses for specific skills
         if "Awareness" in relevant_skills:
-            total += self.awareness_bonus
+            modifier += self.awareness_bonus
         if "Lore" in relevant_skills:
-            total += self.lore_bonus
+            modifier += self.lore_bonus
         if "Thaumaturgy" in relevant_skills:
-            total += self.thaumaturgy_bonus
+            modifier += self.thaumaturgy_bonus
 
-        total += self.get_sustained_penalty()
+        modifier += self.get_sustained_penalty()
 
         if self.is_seriously_wounded:
-            total -= 3
+            modifier -= 3
+
+        return modifier, has_skill
 
-        return total
+    def _get_attribute_check_total(self, attribute, relevant_skills):
+        modifier, has_skill = self.get_check_modifier(attribute, relevant_skills)
+
+        roll = self.d6.roll()
+        if has_skill and roll == 6:
+            roll += self.d6.exploding_roll()
+
+        return roll + modifier
 
     def attribute_check(self, attribute, relevant_skills, dl):
         total = self._get_attribute_check_total(attribute, relevant_skills)
@@ -248,28 +392,10 @@ class Character(pygame.sprite.Sprite):
 
     def take_damage(self, damage, damage_type=None, damage_bonus=0):
         if isinstance(damage, str):
-            # Handle dice notation, e.g., "1d6", "2d6-1"
-            parts = damage.lower().split('d')
-            num_dice = int(parts[0])
-
-            modifier = 0
-            if '-' in parts[1]:
-                d_parts = parts[1].split('-')
-                dice_type = int(d_parts[0])
-                modifier = -int(d_parts[1])
-            elif '+' in parts[1]:
-                d_parts = parts[1].split('+')
-                dice_type = int(d_parts[0])
-                modifier = int(d_parts[1])
-            else:
-                dice_type = int(parts[1])
-
-            total_damage = 0
-            for _ in range(num_dice):
-                # Damage rolls always explode
-                total_damage += self.d6.exploding_roll()
-
-            damage = total_damage + modifier
+            # Dice notation, e.g., "1d6", "2d6-1". Parsed once and cached.
+            damage = DiceExpression.parse(damage)
+        if isinstance(damage, DiceExpression):
+            damage = damage.roll(self.d6)
 
         damage += damage_bonus
 
@@ -327,11 +453,7 @@ class Character(pygame.sprite.Sprite):
             return False
 
         # Calculate final mana cost and DL
-        mana_cost = spell.mana_cost
-        if self.equipped_body_armor:
-            mana_cost += self.equipped_body_armor.armor_penalty
-        if self.equipped_shield:
-            mana_cost += self.equipped_shield.armor_penalty
+        mana_cost = spell.mana_cost + self.spell_cost_penalty
 
         enhancement_cost = enhancement_level * (spell.mana_cost // 2)
         mana_cost += enhancement_cost
@@ -362,8 +484,9 @@ class Character(pygame.sprite.Sprite):
             else:
                 self.mana -= mana_cost
 
-            if spell.duration > 0 and spell not in self.sustained_spells:
-                self.sustained_spells.append(spell)
+            if spell.duration > 0:
+                # Recasting a sustained spell restarts its duration
+                self.sustain_spell(spell, spell.duration * TICKS_PER_SECOND)
 
             spell.effect(caster=self, target=target, enhancement_level=enhancement_level)
             return True
@@ -413,11 +536,13 @@ class Character(pygame.sprite.Sprite):
             self.xp_to_next_level = int(self.xp_to_next_level * 1.5) # Increase xp requirement for next level
             leveled_up = True
             print(f"{self.name} has reached level {self.level}!")
+            event_manager.post({"type": "level_up", "level": self.level, "character": self})
         return leveled_up
 
-    def add_quest(self, quest: 'quest.Quest'):
+    def add_quest(self, quest: 'quests.QuestProgress'):
         if quest not in self.journal:
             self.journal.append(quest)
+            event_manager.post({"type": "quest_added", "quest": quest, "character": self})
             print(f"New quest added to journal: {quest.title}")
 
     def get_quest(self, quest_title):
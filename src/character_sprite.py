@@ -0,0 +1,20 @@
+import pygame
+
+SPRITE_SIZE = 40
+
+class CharacterSprite(pygame.sprite.Sprite):
+    """
+    The on-screen view of a Character. It owns the Surface and Rect, while the
+    Character keeps the authoritative position; call sync() after moving the rect.
+    """
+    def __init__(self, character):
+        super().__init__()
+        self.character = character
+        self.image = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
+        self.image.fill(character.color)
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (character.x, character.y)
+
+    def sync(self):
+        """Writes the sprite's position back to its character."""
+        self.character.x, self.character.y = self.rect.topleft
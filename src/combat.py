@@ -1,25 +1,44 @@
+import random
 from character import Character
-from dice import Die
-from items import Weapon
+from dice import Die, DiceExpression
+from items import Weapon, all_items
 from effects import Poisoned
+from rng import DICE, AI
+
+FIRE_SPRAY_DAMAGE = DiceExpression.parse("2d6")
+FLEE_SKILLS = ["Acrobatics"]
+# Wall-clock seconds the monster AI may search per turn
+AI_TIME_BUDGET = 0.002
+
+def first_action(monster, target, budget=None):
+    """Monster AI that always takes the monster's first action, a plain attack for most."""
+    return monster.ai_actions[0]
 
 class Combat:
-    def __init__(self, char1, char2):
+    def __init__(self, char1, char2, rng=None, monster_ai=first_action):
         self.char1 = char1
         self.char2 = char2
-        self.d6 = Die()
+        # monster_ai(monster, target, budget) -> the action a monster takes on its turn
+        self.monster_ai = monster_ai
+        if rng is not None:
+            self.d6 = Die(rng=rng.stream(DICE))
+            self.ai_rng = rng.stream(AI)
+        else:
+            self.d6 = Die()
+            self.ai_rng = random
+        self.fled = None
+        # None searches to full depth regardless of time, for reproducible simulations
+        self.ai_budget = AI_TIME_BUDGET
 
     def determine_initiative(self):
-        char1_roll = self.d6.roll()
-        char2_roll = self.d6.roll()
+        while True:
+            char1_roll, char2_roll = self.d6.rolls(2)
 
-        if char1_roll > char2_roll:
-            return self.char1, self.char2
-        elif char2_roll > char1_roll:
-            return self.char2, self.char1
-        else:
+            if char1_roll > char2_roll:
+                return self.char1, self.char2
+            elif char2_roll > char1_roll:
+                return self.char2, self.char1
             # Reroll on tie
-            return self.determine_initiative()
 
     def attack(self, attacker, defender, weapon):
         if not isinstance(weapon, Weapon):
@@ -67,7 +86,49 @@ class Combat:
         message = ""
 
         if attack_name == "Fire Spray":
-            damage_dealt = defender.take_damage("2d6", "fire")
+            damage_dealt = defender.take_damage(FIRE_SPRAY_DAMAGE, "fire")
             message = f"{attacker.name} unleashes a spray of fire for {damage_dealt} damage!"
 
         return message, damage_dealt
+
+    def process_status_effects(self, character):
+        """
+        Ticks the character's status effects at the start of their turn.
+        Returns a log message for every effect that wore off.
+        """
+        return [str(event) for event in character.status_effects.tick()]
+
+    @staticmethod
+    def flee_dl(opponent):
+        """DL to get away from `opponent`: their Rogue + 3, +2 if they know a chase skill."""
+        dl = opponent.attributes["rogue"] + 3
+        if any(skill in opponent.skills for skill in FLEE_SKILLS):
+            dl += 2
+        return dl
+
+    def flee(self, character, opponent):
+        """Rogue check to escape the fight, against the opponent's passive DL."""
+        success, _ = character.attribute_check("rogue", FLEE_SKILLS, self.flee_dl(opponent))
+        if success:
+            self.fled = character
+        return success
+
+    def monster_turn(self, monster, target):
+        """Performs a monster's action against `target` and returns a log message."""
+        action = self.monster_ai(monster, target, self.ai_budget)
+
+        if action == "flee":
+            if self.flee(monster, target):
+                return f"{monster.name} flees!"
+            return f"{monster.name} tries to flee but can't get away!"
+
+        if action != "attack":
+            message, _ = self.special_attack(monster, target, action)
+            return message
+
+        # Standard attack with the equipped weapon
+        weapon = monster.equipped_weapon or all_items["unarmed_strike"]
+        success, total, damage = self.attack(monster, target, weapon)
+        if success:
+            return f"{monster.name} hits for {damage} damage with {weapon.name}!"
+        return f"{monster.name} missed with {weapon.name}!"
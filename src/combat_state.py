@@ -0,0 +1,203 @@
+from collections import namedtuple
+from combat import Combat, FIRE_SPRAY_DAMAGE, FLEE_SKILLS
+from items import all_items
+
+# Everything about a combatant that cannot change during a fight. Profiles are
+# shared between copies of a state, so cloning only copies the few mutable fields.
+CombatantProfile = namedtuple("CombatantProfile", [
+    "name",
+    "max_hp",
+    "defense",          # base defense, used against weapons that ignore armor
+    "total_defense",
+    "weapon_name",
+    "damage",           # DiceExpression of the equipped weapon
+    "damage_type",
+    "damage_bonus",     # melee damage bonus
+    "ignores_armor",
+    "attack_modifier",  # check modifier for the weapon's attack, without the wounded penalty
+    "attack_skill",     # whether the attack roll explodes
+    "attack_bonus",     # ranged attack bonus, added after the check
+    "resistances",
+    "poisonous",        # Giant Spider bite
+    "flee_modifier",    # check modifier for fleeing, without the wounded penalty
+    "flee_skill",
+    "flee_dl",          # DL for others to escape from this combatant
+])
+
+class CombatantState:
+    """The mutable part of a combatant: HP, mana, fate and status-effect timers."""
+    __slots__ = ("profile", "hp", "mana", "fate", "effects")
+
+    def __init__(self, profile, hp, mana, fate, effects=()):
+        self.profile = profile
+        self.hp = hp
+        self.mana = mana
+        self.fate = fate
+        # Tuple of (name, turns left, damage per turn, damage type); replaced, never mutated
+        self.effects = effects
+
+    @classmethod
+    def from_character(cls, character):
+        weapon = character.equipped_weapon or all_items["unarmed_strike"]
+        if weapon.type == "ranged":
+            attribute, attack_bonus, damage_bonus = "rogue", character.ranged_attack_bonus, 0
+        else:
+            attribute, attack_bonus, damage_bonus = "warrior", 0, character.melee_damage_bonus
+        modifier, has_skill = character.get_check_modifier(attribute, [weapon.skill])
+        flee_modifier, flee_skill = character.get_check_modifier("rogue", FLEE_SKILLS)
+        if character.is_seriously_wounded:
+            # Applied from the live HP instead
+            modifier += 3
+            flee_modifier += 3
+
+        profile = CombatantProfile(
+            name=character.name,
+            max_hp=character.max_hp,
+            defense=character.defense,
+            total_defense=character.total_defense,
+            weapon_name=weapon.name,
+            damage=weapon.damage,
+            damage_type=weapon.damage_type,
+            damage_bonus=damage_bonus,
+            ignores_armor=bool(weapon.properties.get("ignores_armor")),
+            attack_modifier=modifier,
+            attack_skill=has_skill,
+            attack_bonus=attack_bonus,
+            resistances=dict(character.damage_resistances),
+            poisonous=character.name == "Giant Spider",
+            flee_modifier=flee_modifier,
+            flee_skill=flee_skill,
+            flee_dl=Combat.flee_dl(character),
+        )
+        effects = tuple(
+            (effect.name, effect.duration, getattr(effect, "damage", 0), getattr(effect, "damage_type", None))
+            for effect in character.status_effects
+        )
+        return cls(profile, character.hp, character.mana, character.fate, effects)
+
+    def copy(self):
+        clone = CombatantState.__new__(CombatantState)
+        clone.profile = self.profile
+        clone.hp = self.hp
+        clone.mana = self.mana
+        clone.fate = self.fate
+        clone.effects = self.effects
+        return clone
+
+    @property
+    def is_dead(self):
+        return self.hp <= 0
+
+    @property
+    def is_seriously_wounded(self):
+        return self.hp <= self.profile.max_hp / 2
+
+    @property
+    def check_modifier(self):
+        modifier = self.profile.attack_modifier
+        if self.is_seriously_wounded:
+            modifier -= 3
+        return modifier
+
+    @property
+    def flee_modifier(self):
+        modifier = self.profile.flee_modifier
+        if self.is_seriously_wounded:
+            modifier -= 3
+        return modifier
+
+    def has_effect(self, name):
+        return any(effect[0] == name for effect in self.effects)
+
+    def take_damage(self, damage, damage_type=None):
+        """Mirrors Character.take_damage for an already rolled amount."""
+        resistance = self.profile.resistances.get(damage_type) if damage_type else None
+        if resistance:
+            damage = int(damage * (1 - resistance))
+        self.hp = max(0, self.hp - damage)
+        return damage
+
+    def __repr__(self):
+        return f"<CombatantState {self.profile.name} hp={self.hp}/{self.profile.max_hp}>"
+
+class CombatState:
+    """
+    A compact snapshot of a fight that can be cloned cheaply, for AI search.
+    The apply_* methods follow Combat.attack, Combat.special_attack and
+    Combat.process_status_effects, rolling with the given Die.
+    """
+    __slots__ = ("combatants", "turn")
+
+    def __init__(self, combatants, turn=0):
+        self.combatants = combatants
+        self.turn = turn  # index of the combatant whose turn it is
+
+    @classmethod
+    def from_characters(cls, characters, turn=0):
+        return cls([CombatantState.from_character(character) for character in characters], turn)
+
+    def copy(self):
+        clone = CombatState.__new__(CombatState)
+        clone.combatants = [combatant.copy() for combatant in self.combatants]
+        clone.turn = self.turn
+        return clone
+
+    def attack_dl(self, attacker, defender):
+        weapon_ignores_armor = self.combatants[attacker].profile.ignores_armor
+        profile = self.combatants[defender].profile
+        return profile.defense if weapon_ignores_armor else profile.total_defense
+
+    def apply_attack(self, attacker, defender, die):
+        """Attacks with the equipped weapon. Returns (success, total, damage dealt)."""
+        attacking = self.combatants[attacker]
+        defending = self.combatants[defender]
+        profile = attacking.profile
+
+        roll = die.roll()
+        if profile.attack_skill and roll == 6:
+            roll += die.exploding_roll()
+        total = roll + attacking.check_modifier + profile.attack_bonus
+        if total < self.attack_dl(attacker, defender):
+            return False, total, 0
+
+        damage = profile.damage.roll(die) + profile.damage_bonus
+        damage_dealt = defending.take_damage(damage, profile.damage_type)
+
+        if profile.poisonous and die.roll() > 3 and not defending.has_effect("Poisoned"):
+            defending.effects = defending.effects + (("Poisoned", 3, 2, "poison"),)
+        return True, total, damage_dealt
+
+    def apply_special(self, attacker, defender, attack_name, die):
+        """Applies a special attack. Returns the damage dealt."""
+        if attack_name == "Fire Spray":
+            return self.combatants[defender].take_damage(FIRE_SPRAY_DAMAGE.roll(die), "fire")
+        return 0
+
+    def tick_status_effects(self, index):
+        """Start-of-turn status effect processing for one combatant."""
+        combatant = self.combatants[index]
+        if not combatant.effects:
+            return
+        remaining = []
+        for name, turns_left, damage, damage_type in combatant.effects:
+            if damage:
+                combatant.take_damage(damage, damage_type)
+            if turns_left > 1:
+                remaining.append((name, turns_left - 1, damage, damage_type))
+        combatant.effects = tuple(remaining)
+
+    def apply_action(self, action, actor, target, die):
+        """Applies "attack" or a special attack name for `actor` against `target`."""
+        if action == "attack":
+            return self.apply_attack(actor, target, die)[2]
+        return self.apply_special(actor, target, action, die)
+
+    def end_turn(self):
+        self.turn = (self.turn + 1) % len(self.combatants)
+
+    def living(self):
+        return [index for index, combatant in enumerate(self.combatants) if not combatant.is_dead]
+
+    @property
+    def is_over(self):
+        return len(self.living()) <= 1
@@ -1,11 +1,14 @@
 import random
+import re
 
 class Die:
-    def __init__(self, sides=6):
+    def __init__(self, sides=6, rng=None):
         self.sides = sides
+        # Any object with randint(), e.g. a stream from RNGService. Defaults to the global random module.
+        self.rng = rng if rng is not None else random
 
     def roll(self):
-        return random.randint(1, self.sides)
+        return self.rng.randint(1, self.sides)
 
     def exploding_roll(self):
         total = 0
@@ -15,3 +18,106 @@ class Die:
             if roll != self.sides:
                 break
         return total
+
+    def with_sides(self, sides):
+        """Returns a die with the given number of sides that draws from the same source."""
+        if sides == self.sides:
+            return self
+        return Die(sides, self.rng)
+
+    def __getstate__(self):
+        # The random module itself can't be pickled; restore the default on load
+        state = self.__dict__.copy()
+        if state["rng"] is random:
+            state["rng"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.rng is None:
+            self.rng = random
+
+    def rolls(self, count):
+        """Rolls the die `count` times and returns the results as a list."""
+        return [self.roll() for _ in range(count)]
+
+    def exploding_rolls(self, count):
+        """Makes `count` exploding rolls and returns the results as a list."""
+        return [self.exploding_roll() for _ in range(count)]
+
+_DICE_PATTERN = re.compile(r"^(\d*)d(\d+)(?:kh(\d+))?([+-]\d+)?(nx)?$")
+
+class DiceExpression:
+    """
+    A compiled dice expression such as "1d6", "2d6-1" or "4d6kh3+2".
+    Dice explode unless the notation ends in "nx" ("2d6nx") or the expression
+    is parsed with exploding=False.
+    Build these with DiceExpression.parse() so each string is only parsed once;
+    rolling an expression does no string work.
+    """
+    _cache = {}
+
+    def __init__(self, num_dice, sides, modifier=0, keep_highest=None, exploding=True):
+        self.num_dice = num_dice
+        self.sides = sides
+        self.modifier = modifier
+        self.keep_highest = keep_highest
+        self.exploding = exploding
+
+    @classmethod
+    def parse(cls, text, exploding=True):
+        key = (text, exploding)
+        expression = cls._cache.get(key)
+        if expression is None:
+            match = _DICE_PATTERN.match(text.lower().replace(" ", ""))
+            if not match:
+                raise ValueError(f"Invalid dice expression: {text}")
+            num_dice, sides, keep_highest, modifier, no_explode = match.groups()
+            expression = cls(
+                num_dice=int(num_dice) if num_dice else 1,
+                sides=int(sides),
+                modifier=int(modifier) if modifier else 0,
+                keep_highest=int(keep_highest) if keep_highest else None,
+                exploding=exploding and not no_explode,
+            )
+            cls._cache[key] = expression
+        return expression
+
+    def roll(self, die):
+        """Rolls the expression using `die` (or a die of the right size from the same source)."""
+        die = die.with_sides(self.sides)
+        if self.exploding:
+            rolls = die.exploding_rolls(self.num_dice)
+        else:
+            rolls = die.rolls(self.num_dice)
+        if self.keep_highest is not None:
+            rolls = sorted(rolls, reverse=True)[:self.keep_highest]
+        return sum(rolls) + self.modifier
+
+    def _key(self):
+        return (self.num_dice, self.sides, self.modifier, self.keep_highest, self.exploding)
+
+    def __eq__(self, other):
+        # An expression equals its canonical notation, which encodes every field,
+        # so it hashes like that string
+        if isinstance(other, str):
+            return str(self) == other
+        if not isinstance(other, DiceExpression):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __str__(self):
+        text = f"{self.num_dice}d{self.sides}"
+        if self.keep_highest is not None:
+            text += f"kh{self.keep_highest}"
+        if self.modifier:
+            text += f"{self.modifier:+d}"
+        if not self.exploding:
+            text += "nx"
+        return text
+
+    def __repr__(self):
+        return f"DiceExpression('{self}')"
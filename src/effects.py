@@ -1,11 +1,24 @@
+import heapq
+from collections import namedtuple
+
+# How a new effect combines with one of the same name that is already active
+IGNORE = "ignore"    # keep the existing effect
+REFRESH = "refresh"  # restart the existing effect's duration
+STACK = "stack"      # add a stack and keep the longer duration
+
 class StatusEffect:
     """
-    Base class for status effects.
+    Base class for status effects. `modifiers` are applied to the owner for
+    as long as the effect lasts.
     """
+    modifiers = ()
+    stack_rule = IGNORE
+
     def __init__(self, name, duration):
         self.name = name
         self.duration = duration
         self.owner = None
+        self.stacks = 1
 
     def on_apply(self, owner):
         """Called when the effect is first applied."""
@@ -27,6 +40,8 @@ class Poisoned(StatusEffect):
     """
     Deals damage to the owner at the start of their turn.
     """
+    damage_type = "poison"
+
     def __init__(self, duration, damage=2):
         super().__init__("Poisoned", duration)
         self.damage = damage
@@ -34,4 +49,106 @@ class Poisoned(StatusEffect):
     def on_turn_start(self):
         if self.owner:
             print(f"{self.owner.name} takes {self.damage} damage from poison.")
-            self.owner.take_damage(self.damage, 'poison')
+            self.owner.take_damage(self.damage, self.damage_type)
+
+
+class ExpiryEvent(namedtuple("ExpiryEvent", ["owner", "effect"])):
+    """An effect that wore off during StatusEffects.tick()."""
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.effect.name} has worn off for {self.owner.name}."
+
+class StatusEffects:
+    """
+    The status effects on one character, keyed by name. Expiry times are kept
+    on a min-heap in ticks, so tick() finds everything that wore off without
+    scanning. Effects are called as before (on_apply, on_turn_start,
+    on_remove) and keep their `duration` up to date, so existing StatusEffect
+    subclasses need no changes. Iteration yields the effects in the order
+    they were applied.
+    """
+    def __init__(self, owner):
+        self.owner = owner
+        self._effects = {}
+        self._expires_at = {}  # name -> tick
+        self._expiry = []      # heap of (tick, sequence, effect); stale entries are skipped
+        self._clock = 0
+        self._sequence = 0
+
+    def _schedule(self, effect):
+        expires_at = self._clock + effect.duration
+        self._expires_at[effect.name] = expires_at
+        self._sequence += 1
+        heapq.heappush(self._expiry, (expires_at, self._sequence, effect))
+
+    def add(self, effect):
+        """
+        Applies `effect`, following the stack rule of the effect already
+        active under that name if there is one. Returns the active effect,
+        or None if the new one was ignored.
+        """
+        existing = self._effects.get(effect.name)
+        if existing is None:
+            self._effects[effect.name] = effect
+            effect.on_apply(self.owner)
+            self.owner.add_modifiers(effect, *effect.modifiers)
+            self._schedule(effect)
+            return effect
+
+        if existing.stack_rule == REFRESH:
+            existing.duration = effect.duration
+        elif existing.stack_rule == STACK:
+            existing.stacks += 1
+            existing.duration = max(existing.duration, effect.duration)
+        else:
+            return None
+        self._schedule(existing)
+        return existing
+
+    def remove(self, effect):
+        if self._effects.get(effect.name) is not effect:
+            return False
+        del self._effects[effect.name]
+        del self._expires_at[effect.name]
+        self.owner.remove_modifiers(effect)
+        effect.on_remove()
+        return True
+
+    def get(self, name):
+        return self._effects.get(name)
+
+    def tick(self):
+        """
+        Advances every effect by one turn: runs on_turn_start, removes the
+        ones whose duration ran out and returns an ExpiryEvent for each.
+        """
+        if not self._effects:
+            return []
+        self._clock += 1
+        for effect in list(self._effects.values()):
+            effect.on_turn_start()
+
+        expired = []
+        while self._expiry and self._expiry[0][0] <= self._clock:
+            expires_at, _, effect = heapq.heappop(self._expiry)
+            if self._expires_at.get(effect.name) == expires_at and self.remove(effect):
+                effect.duration = 0
+                expired.append(ExpiryEvent(self.owner, effect))
+
+        for name, effect in self._effects.items():
+            effect.duration = self._expires_at[name] - self._clock
+        return expired
+
+    def clear(self):
+        for effect in list(self._effects.values()):
+            self.remove(effect)
+
+    def __contains__(self, name):
+        return name in self._effects
+
+    def __iter__(self):
+        return iter(list(self._effects.values()))
+
+    def __len__(self):
+        return len(self._effects)
@@ -0,0 +1,138 @@
+import heapq
+from combat import Combat
+from entities import Monster
+from items import all_items
+from monster_ai import choose_monster_action
+
+def lowest_hp_target(encounter, actor, enemies):
+    """Default targeting: the living enemy with the least HP."""
+    return min(enemies, key=lambda enemy: enemy.hp)
+
+class Encounter:
+    """
+    A fight between any number of parties, each a list of Characters.
+
+    Everyone rolls initiative once when the encounter starts. Turn order is
+    kept in a heap keyed by (round, initiative roll, tie-breaker), so ties are
+    settled by a random tie-breaker instead of rerolling, and each turn costs
+    O(log n). Fallen combatants are skipped when they reach the front.
+    """
+    def __init__(self, parties, rng=None, choose_target=lowest_hp_target, monster_ai=choose_monster_action):
+        # Combat only supplies the rules here; the parties live on the encounter.
+        self.combat = Combat(None, None, rng=rng, monster_ai=monster_ai)
+        self.choose_target = choose_target
+        self.parties = []
+        self.party_of = {}
+        self.initiative = {}
+        self.round = 1
+        self.started = False
+        self._queue = []
+        self._sequence = 0
+        for party in parties:
+            self.add_party(party)
+
+    def add_party(self, members):
+        """Adds a new party; its members act from the next round. Returns the party index."""
+        self.parties.append([])
+        party_index = len(self.parties) - 1
+        for member in members:
+            self.add_combatant(member, party_index)
+        return party_index
+
+    def add_combatant(self, character, party_index):
+        """Rolls initiative for `character` and queues it as a member of a party."""
+        self.parties[party_index].append(character)
+        self.party_of[character] = party_index
+        roll = self.combat.d6.roll()
+        tie_breaker = self.combat.ai_rng.random()
+        self.initiative[character] = (-roll, tie_breaker)
+        # Combatants who join a fight in progress wait for the next round
+        self._push(character, self.round + 1 if self.started else self.round)
+
+    def _push(self, character, round_number):
+        roll, tie_breaker = self.initiative[character]
+        self._sequence += 1
+        heapq.heappush(self._queue, (round_number, roll, tie_breaker, self._sequence, character))
+
+    def living(self, party_index):
+        return [member for member in self.parties[party_index] if not member.is_dead]
+
+    def enemies_of(self, character):
+        own_party = self.party_of[character]
+        return [
+            member
+            for party_index, party in enumerate(self.parties) if party_index != own_party
+            for member in party if not member.is_dead
+        ]
+
+    @property
+    def is_over(self):
+        return sum(1 for party_index in range(len(self.parties)) if self.living(party_index)) <= 1
+
+    @property
+    def winning_party(self):
+        """Index of the only party left standing, or None while the fight goes on."""
+        if not self.is_over:
+            return None
+        for party_index in range(len(self.parties)):
+            if self.living(party_index):
+                return party_index
+        return None
+
+    def turn_order(self):
+        """Living combatants in the order they will act this round."""
+        return [entry[-1] for entry in sorted(self._queue) if entry[0] == self.round and not entry[-1].is_dead]
+
+    def next_actor(self):
+        """Removes and returns the next living combatant, or None if nobody can act."""
+        while self._queue:
+            round_number, _, _, _, character = heapq.heappop(self._queue)
+            if character.is_dead:
+                continue
+            self.round = round_number
+            self.started = True
+            self._push(character, round_number + 1)
+            return character
+        return None
+
+    def take_turn(self):
+        """
+        Plays the next combatant's turn: ticks its status effects, picks a
+        target with `choose_target` and attacks. Returns the log messages.
+        """
+        if self.is_over:
+            return []
+        actor = self.next_actor()
+        if actor is None:
+            return []
+
+        messages = self.combat.process_status_effects(actor)
+        if actor.is_dead:
+            return messages
+
+        enemies = self.enemies_of(actor)
+        if not enemies:
+            return messages
+        target = self.choose_target(self, actor, enemies)
+
+        if isinstance(actor, Monster):
+            messages.append(self.combat.monster_turn(actor, target))
+        else:
+            weapon = actor.equipped_weapon or all_items["unarmed_strike"]
+            success, total, damage = self.combat.attack(actor, target, weapon)
+            if success:
+                messages.append(f"{actor.name} hits {target.name} for {damage} damage with {weapon.name}!")
+            else:
+                messages.append(f"{actor.name} missed {target.name} with {weapon.name}!")
+
+        if target.is_dead:
+            messages.append(f"{target.name} has fallen!")
+        return messages
+
+    def run(self, max_turns=1000):
+        """Plays turns until one party is left. Returns the winning party index (None on timeout)."""
+        for _ in range(max_turns):
+            if self.is_over:
+                break
+            self.take_turn()
+        return self.winning_party
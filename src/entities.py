@@ -1,11 +1,17 @@
 from character import Character
 from items import all_items
-from quests import all_quests
+from quests import create_quest
+from rng import LOOT
 import random
 
 class NPC(Character):
-    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, dialogue="...", color=(0, 0, 255)):
-        super().__init__(name, x, y, warrior, rogue, mage, skills, talents, color)
+    __slots__ = ("dialogue",)
+
+    # Integer or boolean attributes that are part of the saved world
+    saved_flags = ()
+
+    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, dialogue="...", color=(0, 0, 255), rng=None):
+        super().__init__(name, x, y, warrior, rogue, mage, skills, talents, color, rng)
         self.dialogue = dialogue
 
     def interact(self, player):
@@ -13,17 +19,32 @@ class NPC(Character):
         return self.dialogue
 
 class Monster(Character):
-    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, color=(0, 255, 0), xp_value=0, loot_table=None):
-        super().__init__(name, x, y, warrior, rogue, mage, skills, talents, color)
+    # Actions the monster AI chooses between, and how many plies it searches
+    __slots__ = ("xp_value", "loot_table", "loot_rng")
+
+    ai_actions = ("attack",)
+    ai_depth = 2
+
+    def __init__(self, name, x, y, warrior, rogue, mage, skills=None, talents=None, color=(0, 255, 0), xp_value=0, loot_table=None, rng=None):
+        super().__init__(name, x, y, warrior, rogue, mage, skills, talents, color, rng)
         self.xp_value = xp_value
         self.loot_table = loot_table if loot_table is not None else []
+        self.loot_rng = rng.stream(LOOT) if rng is not None else random
+
+    def set_rng(self, rng):
+        super().set_rng(rng)
+        self.loot_rng = rng.stream(LOOT)
 
     def drop_loot(self):
         if self.loot_table:
-            return random.choice(self.loot_table)
+            return self.loot_rng.choice(self.loot_table)
         return None
 
 class TownGuard(NPC):
+    __slots__ = ("heirloom_quest_complete",)
+
+    saved_flags = ("heirloom_quest_complete",)
+
     def __init__(self, x, y):
         super().__init__(
             name="Town Guard",
@@ -45,7 +66,7 @@ class TownGuard(NPC):
 
         if not heirloom_quest:
             # Give the quest
-            player.add_quest(all_quests["stolen_heirloom"])
+            player.add_quest(create_quest("stolen_heirloom"))
             return "A bandit leader stole my family's heirloom! Please, get it back."
 
         if heirloom_quest.is_complete:
@@ -61,6 +82,8 @@ class TownGuard(NPC):
             return "Still searching for that heirloom? The bandit leader must have it."
 
 class Goblin(Monster):
+    __slots__ = ()
+
     def __init__(self, x, y):
         loot_table = [all_items["dagger"], all_items["health_potion"]]
         super().__init__(
@@ -76,6 +99,9 @@ class Goblin(Monster):
         )
 
 class GiantRat(Monster):
+    __slots__ = ()
+    ai_actions = ("attack", "flee")
+
     def __init__(self, x, y):
         super().__init__(
             name="Giant Rat",
@@ -90,6 +116,8 @@ class GiantRat(Monster):
         )
 
 class Skeleton(Monster):
+    __slots__ = ()
+
     def __init__(self, x, y):
         loot_table = [all_items["sword"]]
         super().__init__(
@@ -106,6 +134,10 @@ class Skeleton(Monster):
         self.damage_resistances = {"slashing": 0.5, "piercing": 0.5}
 
 class Bandit(Monster):
+    __slots__ = ()
+    ai_actions = ("attack", "flee")
+    ai_depth = 3
+
     def __init__(self, x, y):
         loot_table = [
             all_items["health_potion"],
@@ -133,6 +165,8 @@ class Bandit(Monster):
         self.equip(leather_armor)
 
 class GiantSpider(Monster):
+    __slots__ = ()
+
     def __init__(self, x, y):
         super().__init__(
             name="Giant Spider",
@@ -150,6 +184,10 @@ class GiantSpider(Monster):
         self.equip(bite)
 
 class BanditLeader(Bandit):
+    __slots__ = ()
+    # The leader carries the heirloom and stands his ground
+    ai_actions = ("attack",)
+
     def __init__(self, x, y):
         # Call the parent's __init__ but we will override some values
         super().__init__(x, y)
@@ -159,7 +197,6 @@ class BanditLeader(Bandit):
         self.attributes["rogue"] = 3
         self.xp_value = 250
         self.color = (255, 0, 0) # Red to stand out
-        self.image.fill(self.color)
 
         # The Bandit Leader always drops the heirloom
         self.loot_table = [all_items["stolen_heirloom"]]
@@ -171,6 +208,10 @@ class BanditLeader(Bandit):
         self.equip(chain_mail)
 
 class Drake(Monster):
+    __slots__ = ()
+    ai_actions = ("attack", "Fire Spray")
+    ai_depth = 4
+
     def __init__(self, x, y):
         super().__init__(
             name="Drake",
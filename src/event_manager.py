@@ -1,17 +1,191 @@
+import weakref
+from operator import itemgetter
+
+def _ref(obj):
+    """A weak reference to `obj` if it supports one, else a strong one behind the same interface."""
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return lambda: obj
+
+class Subscription:
+    """
+    Handle for one listener on one event type, returned by subscribe().
+    Bound methods are held weakly, so the subscription dies with the object
+    the method belongs to; other callables are held strongly until
+    unsubscribed. The owner, if any, is also held weakly.
+    """
+    __slots__ = ("event_type", "key", "_listener", "_owner", "active")
+
+    def __init__(self, event_type, listener, owner=None, key=None):
+        self.event_type = event_type
+        self.key = key
+        if hasattr(listener, "__self__") and hasattr(listener, "__func__"):
+            self._listener = weakref.WeakMethod(listener)
+        else:
+            self._listener = lambda: listener
+        self._owner = _ref(owner) if owner is not None else None
+        self.active = True
+
+    @property
+    def route(self):
+        """Where the subscription is filed: the event type, or (event type, key)."""
+        return self.event_type if self.key is None else (self.event_type, self.key)
+
+    @property
+    def listener(self):
+        return self._listener() if self.active else None
+
+    @property
+    def owner(self):
+        return self._owner() if self._owner is not None else None
+
+    @property
+    def alive(self):
+        """False once unsubscribed, or once the listener or owner has been collected."""
+        if not self.active or self._listener() is None:
+            return False
+        return self._owner is None or self._owner() is not None
+
+    def unsubscribe(self):
+        self.active = False
+
+def _item_name(event):
+    return event["item"].name
+
 class EventManager:
-    def __init__(self):
-        self.listeners = {}
+    """
+    Dispatches events to subscribers. In immediate mode (the default) post()
+    calls listeners right away. In queued mode post() only buffers the event
+    and flush(), called once per frame, dispatches the whole batch; events
+    with a coalescing rule are merged with a pending one while they wait.
+    """
+    def __init__(self, queued=False):
+        self.listeners = {}  # event type, or (event type, key) -> list of Subscriptions
+        self.routing_keys = {}
+        self.add_routing_key("monster_killed", itemgetter("name"))
+        self.add_routing_key("inventory_updated", _item_name)
+        self.queued = queued
+        self._queue = []
+        self._pending = {}   # (event type, coalescing key) -> index in _queue
+        # No rule for monster_killed or inventory_updated: quest objectives
+        # count those one by one, and a pickup merged with a loss would vanish
+        self.coalescing_rules = {}
 
-    def subscribe(self, event_type, listener):
-        if event_type not in self.listeners:
-            self.listeners[event_type] = []
-        self.listeners[event_type].append(listener)
+    def add_routing_key(self, event_type, key):
+        """
+        Lets listeners subscribe to `event_type` for one value of key(event)
+        only, e.g. ("monster_killed", "Goblin"), so dispatch skips the rest.
+        """
+        self.routing_keys[event_type] = key
+
+    def add_coalescing_rule(self, event_type, key, merge):
+        """
+        While queued, an event of `event_type` whose key(event) matches a
+        pending one replaces it with merge(pending, event).
+        """
+        self.coalescing_rules[event_type] = (key, merge)
+
+    def subscribe(self, event_type, listener, owner=None, key=None):
+        """
+        Calls listener(event) for every posted event of `event_type`, or with
+        a `key`, only for those whose routing key matches, and returns the
+        Subscription. Subscribing the same listener with the same owner and
+        key twice returns the existing subscription.
+        """
+        if key is not None and event_type not in self.routing_keys:
+            raise ValueError(f"No routing key registered for {event_type} events")
+        route = event_type if key is None else (event_type, key)
+        subscriptions = self.listeners.setdefault(route, [])
+        for subscription in subscriptions:
+            if subscription.alive and subscription.listener == listener and subscription.owner is owner:
+                return subscription
+        subscription = Subscription(event_type, listener, owner, key)
+        subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.unsubscribe()
+        self._prune(subscription.route)
+
+    def unsubscribe_owner(self, owner):
+        """Removes every subscription registered with `owner`."""
+        for subscriptions in self.listeners.values():
+            for subscription in subscriptions:
+                if subscription.owner is owner:
+                    subscription.unsubscribe()
+        for route in list(self.listeners):
+            self._prune(route)
+
+    def _prune(self, route):
+        subscriptions = self.listeners.get(route)
+        if subscriptions is None:
+            return
+        alive = [subscription for subscription in subscriptions if subscription.alive]
+        if alive:
+            self.listeners[route] = alive
+        else:
+            del self.listeners[route]
 
     def post(self, event):
+        if not self.queued:
+            self.dispatch(event)
+            return
+
+        rule = self.coalescing_rules.get(event.get("type"))
+        if rule:
+            key, merge = rule
+            pending_key = (event["type"], key(event))
+            index = self._pending.get(pending_key)
+            if index is not None:
+                self._queue[index] = merge(self._queue[index], event)
+                return
+            self._pending[pending_key] = len(self._queue)
+        self._queue.append(event)
+
+    def flush(self):
+        """
+        Dispatches every queued event, including any that listeners post
+        while the batch is being handled. Returns how many were dispatched.
+        """
+        dispatched = 0
+        while self._queue:
+            batch = self._queue
+            self._queue = []
+            self._pending = {}
+            for event in batch:
+                self.dispatch(event)
+            dispatched += len(batch)
+        return dispatched
+
+    def dispatch(self, event):
+        """Calls the listeners for `event` now, whatever the mode."""
         event_type = event.get("type")
-        if event_type in self.listeners:
-            for listener in self.listeners[event_type]:
-                listener(event)
+        self._dispatch_route(event_type, event)
+        key = self.routing_keys.get(event_type)
+        if key is not None:
+            self._dispatch_route((event_type, key(event)), event)
+
+    def _dispatch_route(self, route, event):
+        subscriptions = self.listeners.get(route)
+        if not subscriptions:
+            return
+        stale = False
+        # Snapshot, so listeners can subscribe or unsubscribe while handling the event
+        for subscription in tuple(subscriptions):
+            listener = subscription.listener
+            if listener is None or not subscription.alive:
+                stale = True
+                continue
+            listener(event)
+        if stale:
+            self._prune(route)
+
+    def listener_counts(self):
+        """Live listeners per event type, or (event type, key), for spotting leaks while debugging."""
+        for route in list(self.listeners):
+            self._prune(route)
+        return {route: len(subscriptions) for route, subscriptions in self.listeners.items()}
 
 # Global instance of the event manager
 event_manager = EventManager()
@@ -0,0 +1,94 @@
+class Inventory:
+    """
+    A character's items, stacked by name. Identical items (same name) share
+    one stack with a count, so membership, counting and removal are O(1).
+
+    It can be used like the list it replaces: append/extend/remove, `in`,
+    len() and iteration (which yields each item once per copy held).
+    Listeners registered with subscribe() are called as listener(item, delta)
+    after every change, with a positive delta for additions.
+    """
+    def __init__(self, items=None):
+        self._stacks = {}  # name -> [item, count], in the order first added
+        self._size = 0
+        self._listeners = []
+        if items:
+            self.extend(items)
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, item, delta):
+        for listener in self._listeners:
+            listener(item, delta)
+
+    def add(self, item, count=1):
+        stack = self._stacks.get(item.name)
+        if stack:
+            stack[1] += count
+        else:
+            self._stacks[item.name] = [item, count]
+        self._size += count
+        self._notify(item, count)
+
+    def append(self, item):
+        self.add(item)
+
+    def extend(self, items):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item, count=1):
+        """Removes `count` copies of `item`. Raises ValueError if there aren't enough."""
+        stack = self._stacks.get(item.name)
+        if not stack or stack[1] < count:
+            raise ValueError(f"{item.name} not in inventory")
+        stack[1] -= count
+        if stack[1] == 0:
+            del self._stacks[item.name]
+        self._size -= count
+        self._notify(stack[0], -count)
+
+    def remove_named(self, name, count=1):
+        """Removes `count` copies of the item called `name`. Returns the item, or None if missing."""
+        item = self.get(name)
+        if item is None or self.count(name) < count:
+            return None
+        self.remove(item, count)
+        return item
+
+    def get(self, name):
+        stack = self._stacks.get(name)
+        return stack[0] if stack else None
+
+    def count(self, item_or_name):
+        name = item_or_name if isinstance(item_or_name, str) else item_or_name.name
+        stack = self._stacks.get(name)
+        return stack[1] if stack else 0
+
+    def stacks(self):
+        """(item, count) pairs in the order the items were first picked up."""
+        return [(item, count) for item, count in self._stacks.values()]
+
+    def clear(self):
+        for item, count in self.stacks():
+            self.remove(item, count)
+
+    def __contains__(self, item_or_name):
+        name = item_or_name if isinstance(item_or_name, str) else item_or_name.name
+        return name in self._stacks
+
+    def __iter__(self):
+        for item, count in self.stacks():
+            for _ in range(count):
+                yield item
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "Inventory(" + ", ".join(f"{item.name} x{count}" for item, count in self.stacks()) + ")"
@@ -1,4 +1,6 @@
 from spells import all_spells
+from dice import DiceExpression
+from modifiers import Modifier
 
 class Item:
     def __init__(self, name, description, properties=None):
@@ -6,12 +8,20 @@ class Item:
         self.description = description
         self.properties = properties if properties is not None else {}
 
+    def modifiers(self):
+        """The modifiers this item grants while equipped."""
+        if self.properties.get("melee_damage_bonus"):
+            return [Modifier("melee_damage", self.properties["melee_damage_bonus"])]
+        return []
+
     def __str__(self):
         return self.name
 
 class Weapon(Item):
     def __init__(self, name, description, damage, skill, weapon_type, damage_type="blunt", two_handed=False, properties=None):
         super().__init__(name, description, properties)
+        if isinstance(damage, str):
+            damage = DiceExpression.parse(damage)
         self.damage = damage
         self.skill = skill
         self.type = weapon_type
@@ -25,6 +35,15 @@ class Armor(Item):
         self.armor_penalty = armor_penalty
         self.armor_type = armor_type # e.g., "body", "shield", "hands"
 
+    def modifiers(self, with_defense=True):
+        modifiers = super().modifiers()
+        if with_defense and self.defense_bonus:
+            modifiers.append(Modifier("defense", self.defense_bonus))
+        # Gloves don't hinder spellcasting
+        if self.armor_penalty and self.armor_type != "hands":
+            modifiers.append(Modifier("spell_cost", self.armor_penalty))
+        return modifiers
+
 class Potion(Item):
     def __init__(self, name, description, effect, properties=None):
         super().__init__(name, description, properties)
@@ -42,6 +61,12 @@ class MagicImplement(Item):
         self.max_mana = 10 * self.level
         self.mana_pool = self.max_mana
 
+    def modifiers(self):
+        modifiers = super().modifiers()
+        if self.thaumaturgy_bonus:
+            modifiers.append(Modifier("thaumaturgy", self.thaumaturgy_bonus))
+        return modifiers
+
 # --- Item Instances ---
 
 unarmed_strike = Weapon(
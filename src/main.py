@@ -9,7 +9,9 @@ from screens.combat import CombatScreen
 from screens.inventory import InventoryScreen
 from screens.advancement import AdvancementScreen
 from screens.journal import JournalScreen
-from save_manager import load_game, save_game
+from save_manager import load_slot, new_slot_path
+from scheduler import scheduler
+from event_manager import event_manager
 
 class GameState(Enum):
     MAIN_MENU = 0
@@ -28,6 +30,9 @@ def main():
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Warrior Rogue Mage")
 
+    # Game events are batched and dispatched once per frame
+    event_manager.queued = True
+
     game_state = GameState.MAIN_MENU
     main_menu_screen = MainMenuScreen()
     creation_screen = None
@@ -62,13 +67,18 @@ def main():
                 combat_screen.handle_event(event)
                 if combat_screen.is_over and event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     if combat_screen.winner == player:
-                        active_monster.kill()
+                        gameplay_screen.remove(active_monster)
                         if combat_screen.leveled_up:
                             advancement_screen = AdvancementScreen(player)
                             game_state = GameState.ADVANCEMENT
                         else:
                             game_state = GameState.GAMEPLAY
+                    elif combat_screen.combat.fled == active_monster:
+                        gameplay_screen.remove(active_monster) # It ran off the map
+                        game_state = GameState.GAMEPLAY
                     else: # Player lost
+                        gameplay_screen.abandon()
+                        gameplay_screen = None
                         game_state = GameState.MAIN_MENU
                     combat_screen = None
             elif game_state == GameState.INVENTORY:
@@ -98,9 +108,12 @@ def main():
                 creation_screen = CharacterCreationScreen()
                 game_state = GameState.CHARACTER_CREATION
             elif main_menu_screen.selected_option == "load_game":
-                player = load_game()
+                save_path = main_menu_screen.selected_save.path
+                player, world = load_slot(save_path)
                 if player:
-                    gameplay_screen = GameplayScreen(player)
+                    if gameplay_screen:
+                        gameplay_screen.close()
+                    gameplay_screen = GameplayScreen(player, save_path, world)
                     game_state = GameState.GAMEPLAY
                 else:
                     main_menu_screen.selected_option = None
@@ -112,10 +125,13 @@ def main():
             creation_screen.draw(screen)
             if creation_screen.is_done:
                 player = creation_screen.character
-                gameplay_screen = GameplayScreen(player)
+                if gameplay_screen:
+                    gameplay_screen.close()
+                gameplay_screen = GameplayScreen(player, new_slot_path())
                 game_state = GameState.GAMEPLAY
 
         elif game_state == GameState.GAMEPLAY:
+            scheduler.advance() # Game time only passes while exploring
             new_state_from_update, active_monster = gameplay_screen.update(screen)
             if new_state_from_update == GameState.COMBAT:
                 combat_screen = CombatScreen(player, active_monster)
@@ -138,8 +154,13 @@ def main():
             journal_screen.update()
             journal_screen.draw(screen)
 
+        event_manager.flush()
+        if gameplay_screen:
+            gameplay_screen.commit_journal()
         pygame.display.flip()
 
+    if gameplay_screen:
+        gameplay_screen.close()
     pygame.quit()
     sys.exit()
 
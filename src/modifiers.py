@@ -0,0 +1,101 @@
+from collections import namedtuple
+from collections.abc import MutableMapping
+
+ADD = "add"
+SET = "set"
+
+# A single change to a stat. "add" modifiers are summed onto the base value;
+# a "set" modifier replaces it outright (the lowest one wins if there are several).
+Modifier = namedtuple("Modifier", ["stat", "value", "kind"], defaults=[ADD])
+
+class ModifierStack:
+    """
+    All modifiers currently affecting a character, grouped by their source
+    (an item, talent, spell or status effect). Removing a source takes back
+    exactly what it added. Each stat's aggregate is cached and only
+    recomputed after a source touching that stat is added or removed.
+    """
+    def __init__(self):
+        self._sources = {}
+        self._cache = {}  # stat -> (sum of adds, lowest set or None)
+
+    def add(self, source, *modifiers):
+        """Registers modifiers for `source`, replacing any it already had."""
+        self.remove(source)
+        if not modifiers:
+            return
+        self._sources[source] = modifiers
+        for modifier in modifiers:
+            self._cache.pop(modifier.stat, None)
+
+    def remove(self, source):
+        """Drops every modifier from `source`. Returns False if it had none."""
+        modifiers = self._sources.pop(source, None)
+        if modifiers is None:
+            return False
+        for modifier in modifiers:
+            self._cache.pop(modifier.stat, None)
+        return True
+
+    def __contains__(self, source):
+        return source in self._sources
+
+    def sources(self):
+        return list(self._sources)
+
+    def _aggregate(self, stat):
+        aggregate = self._cache.get(stat)
+        if aggregate is None:
+            added = 0
+            fixed = None
+            for modifiers in self._sources.values():
+                for modifier in modifiers:
+                    if modifier.stat != stat:
+                        continue
+                    if modifier.kind == SET:
+                        fixed = modifier.value if fixed is None else min(fixed, modifier.value)
+                    else:
+                        added += modifier.value
+            aggregate = self._cache[stat] = (added, fixed)
+        return aggregate
+
+    def apply(self, stat, base):
+        """The value of `stat` after all modifiers, starting from `base`."""
+        added, fixed = self._aggregate(stat)
+        return fixed if fixed is not None else base + added
+
+    def total(self, stat):
+        """The sum of all "add" modifiers on `stat`, e.g. a flat bonus."""
+        return self.apply(stat, 0)
+
+    def base_for(self, stat, value):
+        """The base value that makes `stat` come out as `value`."""
+        return value - self._aggregate(stat)[0]
+
+class ModifiedStats(MutableMapping):
+    """
+    A dict-like view of base stats with a ModifierStack applied. Reading gives
+    the modified value; writing sets the base so the modified value matches,
+    so `stats["mage"] += 1` works as expected while modifiers are active.
+    """
+    def __init__(self, base, modifiers):
+        self.base = base
+        self.modifiers = modifiers
+
+    def __getitem__(self, stat):
+        return self.modifiers.apply(stat, self.base[stat])
+
+    def __setitem__(self, stat, value):
+        self.base[stat] = self.modifiers.base_for(stat, value)
+
+    def __delitem__(self, stat):
+        del self.base[stat]
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __repr__(self):
+        return repr(dict(self))
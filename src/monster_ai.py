@@ -0,0 +1,168 @@
+import time
+from functools import lru_cache
+
+from combat import FIRE_SPRAY_DAMAGE, AI_TIME_BUDGET as DEFAULT_BUDGET
+from combat_state import CombatState
+from dice import DiceExpression
+from probability import check_success_probability, damage_pmf
+
+DEFAULT_DEPTH = 4       # plies
+CHANCE_BUCKETS = 3      # damage outcomes per chance node
+
+
+class _OutOfTime(Exception):
+    pass
+
+def damage_buckets(expression, damage_bonus=0, resistance=0.0, buckets=CHANCE_BUCKETS):
+    """
+    Collapses a damage PMF into at most `buckets` (probability, damage) outcomes
+    of roughly equal probability, each represented by its rounded mean.
+    """
+    if isinstance(expression, str):
+        expression = DiceExpression.parse(expression)
+    return _damage_buckets(expression, damage_bonus, resistance, buckets)
+
+@lru_cache(maxsize=None)
+def _damage_buckets(expression, damage_bonus, resistance, buckets):
+    pmf = damage_pmf(expression, damage_bonus, resistance)
+    outcomes = []
+    bucket_prob = bucket_mass = 0.0
+    target = 1.0 / buckets
+    for value, prob in pmf.items():
+        bucket_prob += prob
+        bucket_mass += value * prob
+        if bucket_prob >= target * (len(outcomes) + 1) - 1e-12:
+            outcomes.append((bucket_prob, round(bucket_mass / bucket_prob)))
+            bucket_prob = bucket_mass = 0.0
+    if bucket_prob > 0:
+        outcomes.append((bucket_prob, round(bucket_mass / bucket_prob)))
+    total = sum(prob for prob, _ in outcomes)
+    return tuple((prob / total, damage) for prob, damage in outcomes)
+
+def flee_value(state, monster):
+    """
+    Value of a successful escape, on the same scale as evaluate(). Running
+    gives up the fight along with whatever the monster had left to fight
+    with, so it scores minus the monster's HP fraction: a healthy monster
+    only runs from a fight it expects to lose outright, a dying one takes
+    any way out.
+    """
+    fleeing = state.combatants[monster]
+    return -fleeing.hp / fleeing.profile.max_hp
+
+def evaluate(state, monster, player):
+    """Monster's view of a position, from -1 (monster dead) to 1 (player dead)."""
+    monster_state = state.combatants[monster]
+    player_state = state.combatants[player]
+    if player_state.is_dead:
+        return 1.0
+    if monster_state.is_dead:
+        return -1.0
+    return monster_state.hp / monster_state.profile.max_hp - player_state.hp / player_state.profile.max_hp
+
+class MonsterAI:
+    """
+    Picks a monster's action with a time-budgeted expectimax search over
+    CombatState copies. Dice are chance nodes whose outcomes come from the
+    exact distributions in probability.py. The player is modelled as always
+    attacking. Search deepens one ply at a time until `max_depth` or the
+    wall-clock budget runs out, and the deepest completed search wins.
+    A budget of None searches to `max_depth`, which is reproducible.
+    """
+    def __init__(self, actions, max_depth=DEFAULT_DEPTH, budget=DEFAULT_BUDGET):
+        self.actions = tuple(actions)
+        self.max_depth = max_depth
+        self.budget = budget
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = 0.0
+
+    @classmethod
+    def for_monster(cls, monster, budget=DEFAULT_BUDGET):
+        return cls(monster.ai_actions, monster.ai_depth, budget)
+
+    def choose_action(self, state, monster, player):
+        """Returns the best action for combatant `monster` against `player` in `state`."""
+        if len(self.actions) == 1:
+            return self.actions[0]
+
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = time.perf_counter() + self.budget if self.budget is not None else None
+        best = self.actions[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                values = {action: self._action_value(state, monster, player, action, depth) for action in self.actions}
+            except _OutOfTime:
+                break
+            best = max(self.actions, key=lambda action: values[action])
+            self.depth_reached = depth
+        return best
+
+    def _check_time(self):
+        self.nodes += 1
+        if self._deadline is not None and self.nodes & 63 == 0 and time.perf_counter() > self._deadline:
+            raise _OutOfTime()
+
+    def _turn_value(self, state, monster, player, depth):
+        """Value of `state` at the start of whoever's turn it is."""
+        self._check_time()
+        if depth == 0 or state.is_over:
+            return evaluate(state, monster, player)
+
+        actor = state.turn
+        state = state.copy()
+        state.tick_status_effects(actor)
+        if state.is_over:
+            return evaluate(state, monster, player)
+
+        if actor == monster:
+            return max(self._action_value(state, monster, player, action, depth) for action in self.actions)
+        return self._attack_value(state, player, monster, monster, player, depth)
+
+    def _after(self, state, monster, player, depth, target=None, damage=0, damage_type=None):
+        child = state.copy()
+        if damage:
+            child.combatants[target].take_damage(damage, damage_type)
+        child.end_turn()
+        return self._turn_value(child, monster, player, depth - 1)
+
+    def _attack_value(self, state, attacker, defender, monster, player, depth):
+        attacking = state.combatants[attacker]
+        profile = attacking.profile
+        dl = state.attack_dl(attacker, defender)
+        hit = check_success_probability(attacking.check_modifier + profile.attack_bonus, profile.attack_skill, dl)
+
+        value = 0.0
+        if hit < 1.0:
+            value += (1.0 - hit) * self._after(state, monster, player, depth)
+        if hit > 0.0:
+            resistance = state.combatants[defender].profile.resistances.get(profile.damage_type, 0.0)
+            for prob, damage in damage_buckets(profile.damage, profile.damage_bonus, resistance):
+                value += hit * prob * self._after(state, monster, player, depth, defender, damage)
+        return value
+
+    def _action_value(self, state, monster, player, action, depth):
+        if action == "attack":
+            return self._attack_value(state, monster, player, monster, player, depth)
+
+        if action == "flee":
+            fleeing = state.combatants[monster]
+            escape = check_success_probability(fleeing.flee_modifier, fleeing.profile.flee_skill, state.combatants[player].profile.flee_dl)
+            return escape * flee_value(state, monster) + (1.0 - escape) * self._after(state, monster, player, depth)
+
+        if action == "Fire Spray":
+            resistance = state.combatants[player].profile.resistances.get("fire", 0.0)
+            return sum(
+                prob * self._after(state, monster, player, depth, player, damage)
+                for prob, damage in damage_buckets(FIRE_SPRAY_DAMAGE, 0, resistance)
+            )
+
+        raise ValueError(f"Unknown monster action: {action}")
+
+def choose_monster_action(monster, target, budget=DEFAULT_BUDGET):
+    """Chooses what `monster` does on its turn against `target`."""
+    if len(monster.ai_actions) == 1:
+        return monster.ai_actions[0]
+    state = CombatState.from_characters([monster, target])
+    return MonsterAI.for_monster(monster, budget).choose_action(state, 0, 1)
@@ -0,0 +1,118 @@
+"""
+Exact outcome distributions for checks and damage rolls.
+
+Distributions are computed by convolution instead of sampling. An exploding
+die has an infinite tail, so it is cut off at the first explosion level whose
+faces are each less likely than `epsilon`. What is discarded is the chance of
+reaching that level, which is less than `sides * epsilon` per die (so less
+than `num_dice * sides * epsilon` for a roll of several dice).
+Results are memoized on their inputs and returned as read-only
+{total: probability} mappings, so callers must not modify them.
+"""
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import factorial
+from types import MappingProxyType
+
+from dice import DiceExpression
+
+DEFAULT_EPSILON = 1e-9
+
+def _convolve(pmf_a, pmf_b):
+    result = {}
+    for value_a, prob_a in pmf_a.items():
+        for value_b, prob_b in pmf_b.items():
+            total = value_a + value_b
+            result[total] = result.get(total, 0.0) + prob_a * prob_b
+    return result
+
+def _shift(pmf, offset):
+    return {value + offset: prob for value, prob in pmf.items()}
+
+def _freeze(pmf):
+    return MappingProxyType(dict(sorted(pmf.items())))
+
+@lru_cache(maxsize=None)
+def die_pmf(sides=6, exploding=False, epsilon=DEFAULT_EPSILON):
+    """PMF of a single die, optionally exploding on its highest face."""
+    face = 1.0 / sides
+    if not exploding:
+        return _freeze({value: face for value in range(1, sides + 1)})
+
+    pmf = {}
+    base = 0
+    reach = 1.0  # chance that every previous roll was a max
+    while reach * face >= epsilon:
+        for value in range(1, sides):
+            pmf[base + value] = reach * face
+        base += sides
+        reach *= face
+    return _freeze(pmf)
+
+@lru_cache(maxsize=None)
+def check_pmf(modifier, has_skill, sides=6, epsilon=DEFAULT_EPSILON):
+    """
+    PMF of an attribute check total: one die plus `modifier`.
+    With a relevant skill the die explodes on its highest face.
+    """
+    return _freeze(_shift(die_pmf(sides, has_skill, epsilon), modifier))
+
+@lru_cache(maxsize=None)
+def check_success_probability(modifier, has_skill, dl, sides=6, epsilon=DEFAULT_EPSILON):
+    """P(total >= dl) for a check with the given modifier."""
+    return sum(prob for total, prob in check_pmf(modifier, has_skill, sides, epsilon).items() if total >= dl)
+
+def attribute_check_probability(character, attribute, relevant_skills, dl, epsilon=DEFAULT_EPSILON):
+    """Chance that `character.attribute_check(attribute, relevant_skills, dl)` succeeds."""
+    modifier, has_skill = character.get_check_modifier(attribute, relevant_skills)
+    return check_success_probability(modifier, has_skill, dl, character.d6.sides, epsilon)
+
+def _keep_highest_pmf(single, num_dice, keep):
+    # Enumerate multisets of die results, weighting each by its multinomial count.
+    values = list(single.items())
+    pmf = {}
+    for combo in combinations_with_replacement(values, num_dice):
+        prob = 1.0
+        counts = {}
+        for value, value_prob in combo:
+            prob *= value_prob
+            counts[value] = counts.get(value, 0) + 1
+        arrangements = factorial(num_dice)
+        for count in counts.values():
+            arrangements //= factorial(count)
+        total = sum(sorted((value for value, _ in combo), reverse=True)[:keep])
+        pmf[total] = pmf.get(total, 0.0) + prob * arrangements
+    return pmf
+
+def damage_pmf(expression, damage_bonus=0, resistance=0.0, epsilon=DEFAULT_EPSILON):
+    """
+    PMF of the damage dealt by `expression` (a DiceExpression or dice string),
+    including a flat damage bonus and a fractional damage resistance, as in
+    Character.take_damage.
+    """
+    if isinstance(expression, str):
+        expression = DiceExpression.parse(expression)
+    return _damage_pmf(expression, damage_bonus, resistance, epsilon)
+
+@lru_cache(maxsize=None)
+def _damage_pmf(expression, damage_bonus, resistance, epsilon):
+    single = die_pmf(expression.sides, expression.exploding, epsilon)
+    if expression.keep_highest is not None and expression.keep_highest < expression.num_dice:
+        pmf = _keep_highest_pmf(single, expression.num_dice, expression.keep_highest)
+    else:
+        pmf = {0: 1.0}
+        for _ in range(expression.num_dice):
+            pmf = _convolve(pmf, single)
+
+    pmf = _shift(pmf, expression.modifier + damage_bonus)
+    if resistance:
+        resisted = {}
+        for value, prob in pmf.items():
+            value = int(value * (1 - resistance))
+            resisted[value] = resisted.get(value, 0.0) + prob
+        pmf = resisted
+    return _freeze(pmf)
+
+def expected_value(pmf):
+    """Mean of a PMF."""
+    return sum(value * prob for value, prob in pmf.items())
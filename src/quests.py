@@ -1,34 +1,303 @@
-from quest import Quest, KillObjective, CollectObjective
+"""
+Quest content, loaded from the JSON or TOML files in assets/quests.
+
+Each file defines one quest; its id is the file name without the extension.
+The catalog only lists the folder when it is first used, and reads,
+validates and compiles a file the first time that quest is asked for.
+Compiled definitions are immutable and shared by every player; what a
+player has done towards a quest is a QuestProgress record, which is just
+a counter per objective and a bitset of the finished ones.
+
+    title = "Goblin Menace"
+    description = "..."
+
+    [[objectives]]
+    kind = "kill"            # or "collect" (with `item`) or "level" (with `level`)
+    description = "Defeat the Goblin"
+    target = "Goblin"
+    count = 1                # optional
+
+    [[rewards]]
+    kind = "xp"              # or "item" (with `item` and optional `count`)
+    amount = 100
+"""
+import json
+import os
+import tomllib
+from array import array
+from collections import namedtuple
+
 from items import all_items
 
-def goblin_menace_reward(player):
-    player.add_xp(100)
-    player.inventory.append(all_items["health_potion"])
-
-goblin_menace = Quest(
-    title="Goblin Menace",
-    description="A goblin has been spotted nearby. Please get rid of it.",
-    objectives=[
-        KillObjective("Defeat the Goblin", "Goblin", 1)
-    ],
-    reward_func=goblin_menace_reward
-)
-
-def heirloom_reward(player):
-    player.add_xp(300)
-    player.add_item_to_inventory(all_items["rune_blade"])
-
-stolen_heirloom = Quest(
-    title="The Stolen Heirloom",
-    description="A bandit leader has stolen a precious family heirloom. Get it back!",
-    objectives=[
-        KillObjective("Defeat the Bandit Leader", "Bandit Leader", 1),
-        CollectObjective("Recover the Stolen Heirloom", all_items["stolen_heirloom"])
-    ],
-    reward_func=heirloom_reward
-)
-
-all_quests = {
-    "goblin_menace": goblin_menace,
-    "stolen_heirloom": stolen_heirloom,
+QUEST_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'assets', 'quests')
+QUEST_EXTENSIONS = (".json", ".toml")
+
+QuestDefinition = namedtuple("QuestDefinition", ["id", "title", "description", "objectives", "rewards"])
+ObjectiveDefinition = namedtuple("ObjectiveDefinition", ["kind", "description", "target", "count"])
+RewardDefinition = namedtuple("RewardDefinition", ["kind", "target", "count"])
+
+class QuestFormatError(ValueError):
+    """A quest file that is missing fields or refers to things that don't exist."""
+
+def _field(data, name, expected_type, where, default=None):
+    value = data.get(name, default)
+    if value is None:
+        raise QuestFormatError(f"{where}: missing '{name}'")
+    if not isinstance(value, expected_type) or isinstance(value, bool):
+        raise QuestFormatError(f"{where}: '{name}' should be {expected_type.__name__}, got {value!r}")
+    return value
+
+def _item_key(data, where):
+    key = _field(data, "item", str, where)
+    if key not in all_items:
+        raise QuestFormatError(f"{where}: unknown item '{key}'")
+    return key
+
+# QuestProgress keeps each objective's count in an unsigned 16-bit counter
+MAX_COUNT = 0xFFFF
+
+def _count(data, where):
+    count = _field(data, "count", int, where, default=1)
+    if not 1 <= count <= MAX_COUNT:
+        raise QuestFormatError(f"{where}: 'count' must be between 1 and {MAX_COUNT}")
+    return count
+
+def _kill_progress(objective, event):
+    return 1 if event["name"] == objective.target else 0
+
+def _collect_progress(objective, event):
+    return 1 if event["item"].name == all_items[objective.target].name and event.get("count", 1) > 0 else 0
+
+def _level_progress(objective, event):
+    return 1 if event["level"] >= objective.target else 0
+
+# compile(data, where) -> ObjectiveDefinition; the event it listens for and
+# key(objective), the routing key to subscribe with, or None for every event
+# of that type; progress(objective, event) -> how much the event counts for
+ObjectiveKind = namedtuple("ObjectiveKind", ["compile", "event_type", "key", "progress"])
+
+OBJECTIVE_KINDS = {
+    "kill": ObjectiveKind(
+        lambda data, where: ObjectiveDefinition("kill", _field(data, "description", str, where), _field(data, "target", str, where), _count(data, where)),
+        "monster_killed", lambda objective: objective.target, _kill_progress,
+    ),
+    "collect": ObjectiveKind(
+        lambda data, where: ObjectiveDefinition("collect", _field(data, "description", str, where), _item_key(data, where), 1),
+        "inventory_updated", lambda objective: all_items[objective.target].name, _collect_progress,
+    ),
+    "level": ObjectiveKind(
+        lambda data, where: ObjectiveDefinition("level", _field(data, "description", str, where), _field(data, "level", int, where), 1),
+        "level_up", None, _level_progress,
+    ),
+}
+
+def _give_items(player, reward):
+    for _ in range(reward.count):
+        player.add_item_to_inventory(all_items[reward.target])
+
+# compile(data, where) -> RewardDefinition; give(player, reward)
+RewardKind = namedtuple("RewardKind", ["compile", "give"])
+
+REWARD_KINDS = {
+    "xp": RewardKind(
+        lambda data, where: RewardDefinition("xp", None, _field(data, "amount", int, where)),
+        lambda player, reward: player.add_xp(reward.count),
+    ),
+    "item": RewardKind(
+        lambda data, where: RewardDefinition("item", _item_key(data, where), _count(data, where)),
+        _give_items,
+    ),
 }
+
+def _compile_entries(entries, kinds, where):
+    if not isinstance(entries, list):
+        raise QuestFormatError(f"{where}: should be a list")
+    compiled = []
+    for index, entry in enumerate(entries):
+        entry_where = f"{where}[{index}]"
+        if not isinstance(entry, dict):
+            raise QuestFormatError(f"{entry_where}: should be a table")
+        kind = _field(entry, "kind", str, entry_where)
+        if kind not in kinds:
+            raise QuestFormatError(f"{entry_where}: unknown kind '{kind}'")
+        compiled.append(kinds[kind].compile(entry, entry_where))
+    return tuple(compiled)
+
+def compile_quest(quest_id, data, where=None):
+    """Validates parsed quest data and returns its QuestDefinition."""
+    where = where or quest_id
+    if not isinstance(data, dict):
+        raise QuestFormatError(f"{where}: should be a table")
+    objectives = _compile_entries(data.get("objectives"), OBJECTIVE_KINDS, f"{where} objectives")
+    if not objectives:
+        raise QuestFormatError(f"{where}: a quest needs at least one objective")
+    return QuestDefinition(
+        id=quest_id,
+        title=_field(data, "title", str, where),
+        description=_field(data, "description", str, where),
+        objectives=objectives,
+        rewards=_compile_entries(data.get("rewards", []), REWARD_KINDS, f"{where} rewards"),
+    )
+
+def load_quest_file(path):
+    quest_id, extension = os.path.splitext(os.path.basename(path))
+    with open(path, "rb") as f:
+        try:
+            if extension == ".toml":
+                data = tomllib.load(f)
+            else:
+                data = json.load(f)
+        except (tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
+            raise QuestFormatError(f"{path}: {e}") from e
+    return compile_quest(quest_id, data, where=path)
+
+class QuestCatalog:
+    """Index of quest files in a folder, compiled on first reference."""
+    def __init__(self, folder=QUEST_FOLDER):
+        self.folder = folder
+        self._paths = None
+        self._definitions = {}
+
+    def _index(self):
+        if self._paths is None:
+            self._paths = {}
+            if os.path.isdir(self.folder):
+                for filename in sorted(os.listdir(self.folder)):
+                    quest_id, extension = os.path.splitext(filename)
+                    if extension in QUEST_EXTENSIONS:
+                        if quest_id in self._paths:
+                            raise QuestFormatError(f"Quest '{quest_id}' is defined more than once in {self.folder}")
+                        self._paths[quest_id] = os.path.join(self.folder, filename)
+        return self._paths
+
+    def ids(self):
+        return list(self._index())
+
+    def __contains__(self, quest_id):
+        return quest_id in self._index()
+
+    def __len__(self):
+        return len(self._index())
+
+    def get(self, quest_id):
+        """The QuestDefinition for `quest_id`. Raises KeyError if there is no such quest."""
+        definition = self._definitions.get(quest_id)
+        if definition is None:
+            path = self._index()[quest_id]
+            definition = self._definitions[quest_id] = load_quest_file(path)
+        return definition
+
+    __getitem__ = get
+
+    def validate_all(self):
+        """Compiles every quest, e.g. from a content check; raises on the first bad file."""
+        return [self.get(quest_id) for quest_id in self.ids()]
+
+def give_rewards(rewards, player):
+    for reward in rewards:
+        REWARD_KINDS[reward.kind].give(player, reward)
+
+quest_catalog = QuestCatalog()
+
+ObjectiveStatus = namedtuple("ObjectiveStatus", ["description", "current", "required", "is_complete"])
+
+class QuestProgress:
+    """
+    One player's progress on a quest: a 16-bit counter per objective and a
+    bitset of the objectives that are done. Everything else (title, text,
+    targets, rewards) is read from the shared QuestDefinition, and a saved
+    record holds only the quest id and those few bytes.
+    """
+    __slots__ = ("definition", "counters", "completed", "_subscriptions", "__weakref__")
+
+    def __init__(self, definition):
+        self.definition = definition
+        self.counters = array("H", bytes(2 * len(definition.objectives)))
+        self.completed = 0
+        self._subscriptions = []
+
+    def __getstate__(self):
+        # Subscriptions belong to the running game, not to a save
+        return (self.definition.id, self.counters.tobytes(), self.completed)
+
+    def __setstate__(self, state):
+        quest_id, counters, self.completed = state
+        self.definition = quest_catalog.get(quest_id)
+        self.counters = array("H")
+        self.counters.frombytes(counters)
+        self._subscriptions = []
+
+    @property
+    def id(self):
+        return self.definition.id
+
+    @property
+    def title(self):
+        return self.definition.title
+
+    @property
+    def description(self):
+        return self.definition.description
+
+    @property
+    def is_complete(self):
+        return self.completed == (1 << len(self.definition.objectives)) - 1
+
+    def objective_complete(self, index):
+        return bool(self.completed >> index & 1)
+
+    @property
+    def objectives(self):
+        """A read-only status line per objective, e.g. for the journal screen."""
+        return [
+            ObjectiveStatus(objective.description, self.counters[index], objective.count, self.objective_complete(index))
+            for index, objective in enumerate(self.definition.objectives)
+        ]
+
+    def _routes(self):
+        """(event type, routing key or None) for every unfinished objective."""
+        routes = set()
+        for index, objective in enumerate(self.definition.objectives):
+            if not self.objective_complete(index):
+                kind = OBJECTIVE_KINDS[objective.kind]
+                routes.add((kind.event_type, kind.key(objective) if kind.key else None))
+        return routes
+
+    def subscribe(self, manager, owner=None):
+        """Subscribes to just the events the unfinished objectives need, e.g. ("monster_killed", "Goblin")."""
+        for event_type, key in self._routes():
+            subscription = manager.subscribe(event_type, self.update, owner=owner, key=key)
+            if subscription not in self._subscriptions:
+                self._subscriptions.append(subscription)
+
+    def update(self, event):
+        """Counts `event` towards every unfinished objective it matches."""
+        completed = self.completed
+        for index, objective in enumerate(self.definition.objectives):
+            if self.objective_complete(index):
+                continue
+            kind = OBJECTIVE_KINDS[objective.kind]
+            if event.get("type") != kind.event_type:
+                continue
+            amount = kind.progress(objective, event)
+            if amount:
+                self.counters[index] = min(objective.count, self.counters[index] + amount)
+                if self.counters[index] >= objective.count:
+                    self.completed |= 1 << index
+                    print(f"Objective complete: {objective.description}")
+        if self.completed != completed:
+            # Stop listening for what only finished objectives needed
+            routes = self._routes()
+            for subscription in self._subscriptions:
+                if (subscription.event_type, subscription.key) not in routes:
+                    subscription.unsubscribe()
+            self._subscriptions = [subscription for subscription in self._subscriptions if subscription.active]
+
+    def give_reward(self, player):
+        if self.is_complete:
+            give_rewards(self.definition.rewards, player)
+            print(f"Quest '{self.title}' complete! Reward received.")
+
+def create_quest(quest_id):
+    """A fresh progress record for the catalog quest `quest_id`."""
+    return QuestProgress(quest_catalog.get(quest_id))
@@ -0,0 +1,40 @@
+import hashlib
+import random
+
+# Names of the standard streams
+DICE = "dice"
+LOOT = "loot"
+AI = "ai"
+
+class RNGService:
+    """
+    Hands out named random streams that are seeded independently of each other.
+    Two services built from the same seed produce the same numbers on every
+    stream, no matter in which order the streams are used. spawn() derives a
+    child service for a worker process, so sharded simulations stay reproducible.
+    """
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self._streams = {}
+
+    def derive_seed(self, name):
+        """Returns a 64-bit seed derived from this service's seed and `name`."""
+        digest = hashlib.sha256(f"{self.seed}:{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "little")
+
+    def stream(self, name):
+        """Returns the stream called `name`, creating it on first use."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = random.Random(self.derive_seed(name))
+            self._streams[name] = stream
+        return stream
+
+    def spawn(self, index):
+        """Returns an independent child service, e.g. one per worker process."""
+        return RNGService(self.derive_seed(f"child:{index}"))
+
+    def __repr__(self):
+        return f"RNGService(seed={self.seed})"
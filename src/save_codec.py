@@ -0,0 +1,325 @@
+"""
+The save file format: a compact, versioned binary encoding of a character's
+state, and nothing else. Items, talents, spells and quests are written as
+their catalog keys, so a save doesn't depend on how those classes are laid
+out and loads against whatever the current content defines.
+
+    magic b"WRMS", format version (u16), then the body for that version
+
+Integers are little-endian and strings are UTF-8 with a u16 length. To
+change the format, bump SAVE_VERSION, add a reader for the new body to
+READERS and a migration from the previous version to MIGRATIONS; older
+files are then read with their own reader and migrated forward one
+version at a time.
+"""
+import struct
+from functools import lru_cache
+
+from character import Character
+from effects import Poisoned
+from items import all_items
+from quests import QuestProgress, quest_catalog
+from spells import all_spells
+from talents import all_talents
+
+MAGIC = b"WRMS"
+SAVE_VERSION = 2
+
+HEADER = struct.Struct("<4sH")
+EQUIPMENT_SLOTS = ("equipped_weapon", "equipped_body_armor", "equipped_shield", "equipped_hands", "equipped_implement")
+
+class SaveFormatError(ValueError):
+    """
+    A save that can't be read (not a save file, truncated, or from a newer
+    version), or state that doesn't fit the format and can't be written.
+    """
+
+# Status effect kind -> (class, args(effect) -> ints passed back to the class after the duration)
+EFFECT_TYPES = {
+    "poisoned": (Poisoned, lambda effect: (effect.damage,)),
+}
+
+def _keys_by_name(catalog):
+    # Copied or unpickled characters hold copies of catalog entries, so match on name rather than identity
+    return {entry.name: key for key, entry in catalog.items()}
+
+def _catalog_key(keys, entry, what):
+    key = keys.get(entry.name)
+    if key is None:
+        raise SaveFormatError(f"Can't save {what} '{entry.name}': it isn't in the catalog")
+    return key
+
+@lru_cache(maxsize=None)
+def _struct(fmt):
+    return struct.Struct("<" + fmt)
+
+class BinaryWriter:
+    """
+    Builds little-endian binary data from struct formats and length-prefixed
+    strings. A value that doesn't fit its format raises SaveFormatError
+    naming `field`.
+    """
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt, *values, field="value"):
+        try:
+            self.parts.append(_struct(fmt).pack(*values))
+        except struct.error as e:
+            raise SaveFormatError(f"Can't save {field} {values}: {e}") from e
+
+    def string(self, value, field="string"):
+        data = value.encode("utf-8")
+        self.pack("H", len(data), field=f"length of {field}")
+        self.parts.append(data)
+
+    def strings(self, values, field="list"):
+        self.pack("H", len(values), field=f"length of {field}")
+        for value in values:
+            self.string(value, field)
+
+    def raw(self, data):
+        self.parts.append(bytes(data))
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+class BinaryReader:
+    """Reads what a BinaryWriter wrote; running out of data raises SaveFormatError."""
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, fmt):
+        packer = _struct(fmt)
+        try:
+            values = packer.unpack_from(self.data, self.offset)
+        except struct.error as e:
+            raise SaveFormatError("Save file is truncated") from e
+        self.offset += packer.size
+        return values
+
+    def string(self):
+        (length,) = self.unpack("H")
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.data):
+            raise SaveFormatError("Save file is truncated")
+        return bytes(self.data[start:self.offset]).decode("utf-8")
+
+    def strings(self):
+        (count,) = self.unpack("H")
+        return [self.string() for _ in range(count)]
+
+    def raw(self, length):
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.data):
+            raise SaveFormatError("Save file is truncated")
+        return self.data[start:self.offset]
+
+def character_state(character):
+    """The plain-data state of `character` that a save keeps."""
+    item_keys = _keys_by_name(all_items)
+    talent_keys = _keys_by_name(all_talents)
+    spell_keys = _keys_by_name(all_spells)
+    return {
+        "name": character.name,
+        "position": (int(character.x), int(character.y)),
+        "color": tuple(character.color),
+        "attributes": tuple(character.attributes.base[name] for name in ("warrior", "rogue", "mage")),
+        "level": character.level,
+        "xp": character.xp,
+        "xp_to_next_level": character.xp_to_next_level,
+        "hp": character.hp,
+        "base_max_hp": character.base_max_hp,
+        "fate": character.fate,
+        "mana": character.mana,
+        "base_max_mana": character.base_max_mana,
+        "defense": character.defense,
+        "skills": list(character.skills),
+        "talents": [_catalog_key(talent_keys, talent, "talent") for talent in character.talents],
+        "spells": [_catalog_key(spell_keys, spell, "spell") for spell in character.spellbook],
+        # Sustained spells with the ticks of game time they have left
+        "sustained": [
+            (_catalog_key(spell_keys, spell, "spell"), character.spell_time_left(spell))
+            for spell in character.sustained_spells
+        ],
+        "inventory": [(_catalog_key(item_keys, item, "item"), count) for item, count in character.inventory.stacks()],
+        "equipment": [
+            _catalog_key(item_keys, item, "item") if item else ""
+            for item in (getattr(character, slot) for slot in EQUIPMENT_SLOTS)
+        ],
+        "quests": [
+            (quest.id, list(quest.counters), quest.completed)
+            for quest in character.journal
+        ],
+        "effects": [_effect_state(effect) for effect in character.status_effects],
+    }
+
+def _effect_state(effect):
+    for kind, (cls, args) in EFFECT_TYPES.items():
+        if type(effect) is cls:
+            return (kind, effect.duration, effect.stacks, tuple(args(effect)))
+    raise SaveFormatError(f"Can't save status effect '{effect.name}': no entry in EFFECT_TYPES")
+
+def encode_state(state):
+    writer = BinaryWriter()
+    writer.parts.append(HEADER.pack(MAGIC, SAVE_VERSION))
+    writer.string(state["name"], "name")
+    writer.pack("ii3B", *state["position"], *state["color"], field="position and color")
+    writer.pack("3h", *state["attributes"], field="attributes")
+    writer.pack("HII", state["level"], state["xp"], state["xp_to_next_level"], field="level and xp")
+    writer.pack("6h", state["hp"], state["base_max_hp"], state["fate"],
+                state["mana"], state["base_max_mana"], state["defense"],
+                field="hp, fate, mana and defense")
+    writer.strings(state["skills"], "skills")
+    writer.strings(state["talents"], "talents")
+    writer.strings(state["spells"], "spells")
+
+    writer.pack("H", len(state["inventory"]), field="inventory size")
+    for key, count in state["inventory"]:
+        writer.string(key, "item")
+        writer.pack("H", count, field=f"count of item '{key}'")
+    writer.strings(state["equipment"], "equipment")
+
+    writer.pack("H", len(state["quests"]), field="quest count")
+    for quest_id, counters, completed in state["quests"]:
+        writer.string(quest_id, "quest")
+        writer.pack(f"B{len(counters)}HI", len(counters), *counters, completed,
+                    field=f"progress of quest '{quest_id}'")
+
+    writer.pack("H", len(state["effects"]), field="status effect count")
+    for kind, duration, stacks, args in state["effects"]:
+        writer.string(kind, "status effect")
+        writer.pack(f"hBB{len(args)}h", duration, stacks, len(args), *args,
+                    field=f"status effect '{kind}'")
+
+    writer.pack("H", len(state["sustained"]), field="sustained spell count")
+    for key, ticks in state["sustained"]:
+        writer.string(key, "sustained spell")
+        writer.pack("I", ticks, field=f"time left on spell '{key}'")
+    return writer.getvalue()
+
+def _read_v1(reader):
+    state = {"name": reader.string()}
+    x, y, *color = reader.unpack("ii3B")
+    state["position"] = (x, y)
+    state["color"] = tuple(color)
+    state["attributes"] = reader.unpack("3h")
+    state["level"], state["xp"], state["xp_to_next_level"] = reader.unpack("HII")
+    (state["hp"], state["base_max_hp"], state["fate"],
+     state["mana"], state["base_max_mana"], state["defense"]) = reader.unpack("6h")
+    state["skills"] = reader.strings()
+    state["talents"] = reader.strings()
+    state["spells"] = reader.strings()
+
+    (count,) = reader.unpack("H")
+    state["inventory"] = [(reader.string(), reader.unpack("H")[0]) for _ in range(count)]
+    state["equipment"] = reader.strings()
+
+    (count,) = reader.unpack("H")
+    state["quests"] = []
+    for _ in range(count):
+        quest_id = reader.string()
+        (length,) = reader.unpack("B")
+        *counters, completed = reader.unpack(f"{length}HI")
+        state["quests"].append((quest_id, counters, completed))
+
+    (count,) = reader.unpack("H")
+    state["effects"] = []
+    for _ in range(count):
+        kind = reader.string()
+        duration, stacks, length = reader.unpack("hBB")
+        state["effects"].append((kind, duration, stacks, reader.unpack(f"{length}h")))
+    return state
+
+def _read_v2(reader):
+    # Version 2 added sustained spells after the status effects
+    state = _read_v1(reader)
+    (count,) = reader.unpack("H")
+    state["sustained"] = [(reader.string(), reader.unpack("I")[0]) for _ in range(count)]
+    return state
+
+# Format version -> reader for that version's body
+READERS = {
+    1: _read_v1,
+    2: _read_v2,
+}
+
+# Format version -> function turning that version's state into the next version's
+MIGRATIONS = {
+    1: lambda state: dict(state, sustained=[]),
+}
+
+def decode_state(data):
+    """The state in a save, migrated to the current format version."""
+    if len(data) < HEADER.size:
+        raise SaveFormatError("Not a save file")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a save file")
+    if version not in READERS:
+        raise SaveFormatError(f"Save format version {version} is not supported (this game writes version {SAVE_VERSION})")
+    state = READERS[version](BinaryReader(data, HEADER.size))
+    while version < SAVE_VERSION:
+        state = MIGRATIONS[version](state)
+        version += 1
+    return state
+
+def character_from_state(state):
+    """A new Character with the saved state. Content that no longer exists is skipped."""
+    warrior, rogue, mage = state["attributes"]
+    x, y = state["position"]
+    character = Character(
+        state["name"], x, y, warrior, rogue, mage,
+        skills=list(state["skills"]),
+        talents=[all_talents[key] for key in state["talents"] if key in all_talents],
+        color=tuple(state["color"]),
+    )
+    character.spellbook.extend(all_spells[key] for key in state["spells"] if key in all_spells)
+
+    for key, count in state["inventory"]:
+        if key in all_items:
+            character.inventory.add(all_items[key], count)
+    for key in state["equipment"]:
+        if key in all_items:
+            character.equip(all_items[key])
+
+    for quest_id, counters, completed in state["quests"]:
+        if quest_id not in quest_catalog:
+            print(f"Quest '{quest_id}' no longer exists; dropping it from the journal.")
+            continue
+        quest = QuestProgress(quest_catalog.get(quest_id))
+        for index, count in enumerate(counters[:len(quest.counters)]):
+            quest.counters[index] = count
+        quest.completed = completed & ((1 << len(quest.counters)) - 1)
+        character.journal.append(quest)
+
+    for key, ticks in state["sustained"]:
+        if key in all_spells:
+            character.sustain_spell(all_spells[key], ticks)
+
+    for kind, duration, stacks, args in state["effects"]:
+        if kind in EFFECT_TYPES:
+            effect = EFFECT_TYPES[kind][0](duration, *args)
+            character.status_effects.add(effect)
+            effect.stacks = stacks
+
+    # Set last, so talents and equipment don't adjust them again
+    character.level = state["level"]
+    character.xp = state["xp"]
+    character.xp_to_next_level = state["xp_to_next_level"]
+    character.base_max_hp = state["base_max_hp"]
+    character.base_max_mana = state["base_max_mana"]
+    character.defense = state["defense"]
+    character.hp = state["hp"]
+    character.mana = state["mana"]
+    character.fate = state["fate"]
+    return character
+
+def encode_character(character):
+    return encode_state(character_state(character))
+
+def decode_character(data):
+    return character_from_state(decode_state(data))
@@ -0,0 +1,336 @@
+"""
+A write-ahead journal of what changed since the last save.
+
+SaveJournal.commit() runs once per frame. It compares the player with what
+it last recorded and appends a small record for each thing that changed:
+vitals (HP, mana, fate, XP, level, max HP and mana), an item count, an
+equipment slot, a quest's progress, what the player chose on levelling up
+(attributes, skills, talents, spells) or the state of a map in the world.
+Every record holds the new value, not a difference, so replaying a record
+twice is harmless; load_game() replays the journal over the save and ends
+up where the game was.
+
+That covers what the player earns. A crash loses the current frame's
+changes to those, and everything the journal doesn't record (where the
+player stands, status effects, sustained spells, the hazard cooldown)
+goes back to the last full save.
+
+Records go to numbered segment files next to the save (slot1.sav.wal.3).
+When the autosaver takes a snapshot it calls rotate(), so later records go
+to a new segment, and once the snapshot is on disk it deletes the segments
+the snapshot covers. That is the compaction: the journal never holds more
+than what happened since the last save that finished.
+
+    u16 payload length, u8 kind, payload, u32 CRC-32 of kind and payload
+
+A torn record at the end of a segment, from a crash mid-write, fails its
+length or checksum check and ends the replay of that segment.
+"""
+import glob
+import os
+import struct
+import time
+import zlib
+
+from items import all_items
+from quests import QuestProgress, quest_catalog
+from save_codec import EQUIPMENT_SLOTS, BinaryReader, BinaryWriter
+from spells import all_spells
+from talents import all_talents
+
+VITALS = 1
+ITEM = 2
+EQUIP = 3
+QUEST = 4
+MAP = 5
+ADVANCEMENT = 6
+
+RECORD_HEADER = struct.Struct("<HB")
+RECORD_CHECKSUM = struct.Struct("<I")
+# hp, mana, fate, base max HP, base max mana, defense, level, xp, xp to next level
+VITALS_FORMAT = struct.Struct("<6hHII")
+ITEM_FORMAT = struct.Struct("<H")
+EQUIP_FORMAT = struct.Struct("<B")
+QUEST_FORMAT = struct.Struct("<IB")
+MAP_FORMAT = struct.Struct("<H")
+ATTRIBUTES = ("warrior", "rogue", "mage")
+
+def segment_path(save_path, generation):
+    return f"{save_path}.wal.{generation}"
+
+def segment_generations(save_path):
+    """The generations of the journal segments of `save_path`, oldest first."""
+    generations = []
+    for path in glob.glob(glob.escape(save_path) + ".wal.*"):
+        suffix = path.rsplit(".", 1)[1]
+        if suffix.isdigit():
+            generations.append(int(suffix))
+    return sorted(generations)
+
+def _vitals(player):
+    return (player.hp, player.mana, player.fate, player.base_max_hp, player.base_max_mana,
+            player.defense, player.level, player.xp, player.xp_to_next_level)
+
+def _advancement(player):
+    return (tuple(player.attributes.base[name] for name in ATTRIBUTES), tuple(player.skills),
+            tuple(talent.name for talent in player.talents), tuple(spell.name for spell in player.spellbook))
+
+def _catalog_keys(catalog, names):
+    keys = {entry.name: key for key, entry in catalog.items()}
+    return [keys[name] for name in names if name in keys]
+
+def _record(kind, payload):
+    body = bytes([kind]) + payload
+    return RECORD_HEADER.pack(len(payload), kind) + payload + RECORD_CHECKSUM.pack(zlib.crc32(body))
+
+class SaveJournal:
+    """
+    The journal of one player's save. Appends are flushed to the OS every
+    commit, which is enough to survive the game crashing; they are fsynced
+    at most every `sync_interval` seconds, and on rotate() and close().
+    """
+    def __init__(self, save_path, player, world=None, sync_interval=1.0):
+        self.save_path = save_path
+        self.player = player
+        self.world = world
+        self.sync_interval = sync_interval
+        generations = segment_generations(save_path)
+        self.generation = generations[-1] + 1 if generations else 1
+        self.size = 0  # bytes in the current segment
+        self._file = None
+        self._last_sync = 0.0
+
+        # What the records so far say; commit() writes whatever differs
+        self._vitals = _vitals(player)
+        self._advancement = _advancement(player)
+        self._equipment = [getattr(player, slot) for slot in EQUIPMENT_SLOTS]
+        self._quests = {quest.id: (quest.counters.tobytes(), quest.completed)
+                        for quest in player.journal}
+        self._dirty_items = {}
+        player.inventory.subscribe(self._on_inventory_changed)
+
+    def _on_inventory_changed(self, item, delta):
+        self._dirty_items[item.name] = item
+
+    def _pending_records(self):
+        records = []
+        player = self.player
+
+        for item in self._dirty_items.values():
+            key = _item_key(item)
+            if key is not None:
+                records.append(_record(ITEM, ITEM_FORMAT.pack(player.inventory.count(item)) + key.encode("utf-8")))
+        self._dirty_items = {}
+
+        for index, slot in enumerate(EQUIPMENT_SLOTS):
+            item = getattr(player, slot)
+            if item is not self._equipment[index]:
+                self._equipment[index] = item
+                key = _item_key(item) if item else ""
+                if key is not None:
+                    records.append(_record(EQUIP, EQUIP_FORMAT.pack(index) + key.encode("utf-8")))
+
+        for quest in player.journal:
+            progress = (quest.counters.tobytes(), quest.completed)
+            if self._quests.get(quest.id) != progress:
+                self._quests[quest.id] = progress
+                payload = QUEST_FORMAT.pack(quest.completed, len(quest.counters)) + progress[0] + quest.id.encode("utf-8")
+                records.append(_record(QUEST, payload))
+
+        if self.world is not None:
+            for map_name, state in self.world.loaded_maps():
+                if state.changed:
+                    state.changed = False
+                    name = map_name.encode("utf-8")
+                    records.append(_record(MAP, MAP_FORMAT.pack(len(name)) + name + state.encode()))
+
+        advancement = _advancement(player)
+        if advancement != self._advancement:
+            self._advancement = advancement
+            attributes, skills, talents, spells = advancement
+            writer = BinaryWriter()
+            writer.pack("3h", *attributes)
+            writer.strings(skills)
+            writer.strings(_catalog_keys(all_talents, talents))
+            writer.strings(_catalog_keys(all_spells, spells))
+            records.append(_record(ADVANCEMENT, writer.getvalue()))
+
+        # Last, so the values it sets win over any adjustment replaying an equip or a talent makes
+        vitals = _vitals(player)
+        if vitals != self._vitals:
+            self._vitals = vitals
+            records.append(_record(VITALS, VITALS_FORMAT.pack(*vitals)))
+        return records
+
+    def commit(self):
+        """
+        Appends a record for everything that changed since the last commit.
+        Returns how many. Nothing is recorded while the player is dead: Fate
+        either brings them back, and the next commit catches up, or the run
+        is over and the journal is discarded.
+        """
+        if self.player.is_dead:
+            return 0
+        records = self._pending_records()
+        if records:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.save_path)), exist_ok=True)
+                self._file = open(segment_path(self.save_path, self.generation), "ab")
+            data = b"".join(records)
+            self._file.write(data)
+            self._file.flush()
+            self.size += len(data)
+        if self._file is not None and time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync()
+        return len(records)
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def rotate(self):
+        """
+        Starts a new segment, for a snapshot being taken now. Returns the
+        generation of the last segment that snapshot covers.
+        """
+        self.commit()
+        self._close_segment()
+        covered = self.generation
+        self.generation += 1
+        self.size = 0
+        return covered
+
+    def discard_through(self, generation):
+        """Deletes the segments up to `generation`, once a snapshot that covers them is on disk."""
+        for old in segment_generations(self.save_path):
+            if old <= generation and old != self.generation:
+                self._remove_segment(old)
+
+    def _remove_segment(self, generation):
+        try:
+            os.remove(segment_path(self.save_path, generation))
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        self.commit()
+        self._close_segment()
+        self.player.inventory.unsubscribe(self._on_inventory_changed)
+
+    def discard(self):
+        """Deletes every segment and stops recording, e.g. when the player lost and the run since the last save is void."""
+        self._close_segment()
+        for generation in segment_generations(self.save_path):
+            self._remove_segment(generation)
+        self.player.inventory.unsubscribe(self._on_inventory_changed)
+
+def _item_key(item):
+    for key, catalog_item in all_items.items():
+        if catalog_item.name == item.name:
+            return key
+    return None
+
+def _read_records(data):
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, kind = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + length
+        if end + RECORD_CHECKSUM.size > len(data):
+            return  # torn write
+        payload = data[start:end]
+        (checksum,) = RECORD_CHECKSUM.unpack_from(data, end)
+        if checksum != zlib.crc32(bytes([kind]) + payload):
+            return
+        yield kind, payload
+        offset = end + RECORD_CHECKSUM.size
+
+def _apply_vitals(player, payload):
+    (player.hp, player.mana, player.fate, player.base_max_hp, player.base_max_mana,
+     player.defense, player.level, player.xp, player.xp_to_next_level) = VITALS_FORMAT.unpack(payload)
+
+def _apply_item(player, payload):
+    (count,) = ITEM_FORMAT.unpack_from(payload)
+    item = all_items.get(payload[ITEM_FORMAT.size:].decode("utf-8"))
+    if item is None:
+        return
+    difference = count - player.inventory.count(item)
+    if difference > 0:
+        player.inventory.add(item, difference)
+    elif difference < 0:
+        player.inventory.remove(item, -difference)
+
+def _apply_equip(player, payload):
+    (index,) = EQUIP_FORMAT.unpack_from(payload)
+    key = payload[EQUIP_FORMAT.size:].decode("utf-8")
+    current = getattr(player, EQUIPMENT_SLOTS[index])
+    if key == "":
+        if current:
+            player.unequip(current)
+    elif key in all_items and current is not all_items[key]:
+        player.equip(all_items[key])
+
+def _apply_quest(player, payload):
+    completed, length = QUEST_FORMAT.unpack_from(payload)
+    counters_end = QUEST_FORMAT.size + 2 * length
+    quest_id = payload[counters_end:].decode("utf-8")
+    if quest_id not in quest_catalog:
+        return
+    quest = next((quest for quest in player.journal if quest.id == quest_id), None)
+    if quest is None:
+        quest = QuestProgress(quest_catalog.get(quest_id))
+        player.journal.append(quest)
+    counters = struct.unpack_from(f"<{length}H", payload, QUEST_FORMAT.size)
+    for index, count in enumerate(counters[:len(quest.counters)]):
+        quest.counters[index] = count
+    quest.completed = completed & ((1 << len(quest.counters)) - 1)
+
+def _apply_advancement(player, payload):
+    reader = BinaryReader(payload)
+    for name, value in zip(ATTRIBUTES, reader.unpack("3h")):
+        player.attributes.base[name] = value
+    player.skills[:] = reader.strings()
+    talents = [all_talents[key] for key in reader.strings() if key in all_talents]
+    for talent in list(player.talents):
+        if talent not in talents:
+            player.remove_talent(talent)
+    for talent in talents:
+        player.add_talent(talent)
+    player.spellbook[:] = [all_spells[key] for key in reader.strings() if key in all_spells]
+
+APPLY = {
+    VITALS: _apply_vitals,
+    ITEM: _apply_item,
+    EQUIP: _apply_equip,
+    QUEST: _apply_quest,
+    ADVANCEMENT: _apply_advancement,
+}
+
+def _apply_map(world, payload):
+    (length,) = MAP_FORMAT.unpack_from(payload)
+    name_end = MAP_FORMAT.size + length
+    world.replace_map(payload[MAP_FORMAT.size:name_end].decode("utf-8"), payload[name_end:])
+
+def replay_journal(player, save_path, world=None):
+    """
+    Applies every journal segment of `save_path` to `player`, and to `world`
+    if given, oldest first. Returns the number of records applied.
+    """
+    replayed = 0
+    for generation in segment_generations(save_path):
+        with open(segment_path(save_path, generation), "rb") as f:
+            data = f.read()
+        for kind, payload in _read_records(data):
+            if kind in APPLY:
+                APPLY[kind](player, payload)
+                replayed += 1
+            elif kind == MAP and world is not None:
+                _apply_map(world, payload)
+                replayed += 1
+    return replayed
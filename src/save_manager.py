@@ -1,29 +1,204 @@
-import pickle
+"""
+Save slots. Each slot is one file in SAVE_FOLDER:
+
+    header (FILE_HEADER), character name (UTF-8), payload, world
+
+The header carries what a save browser shows (name, level, when it was
+saved) plus a CRC-32 and the size of the payload, so list_saves() only
+reads the first few dozen bytes of each file and a corrupt save is caught
+before anything is decoded. The payload is a save_codec encoding,
+optionally zlib-compressed. The world (see world.WorldState) follows it
+uncompressed, so its map chunks can be decoded one at a time; it checks
+its own index and chunks.
+"""
 import os
+import struct
+import tempfile
+import time
+import zlib
+from collections import namedtuple
+
+from save_codec import SaveFormatError, character_state, decode_character, encode_state
+from save_journal import replay_journal
+from world import WorldState
+
+SAVE_FOLDER = "saves"
+SAVE_EXTENSION = ".sav"
+
+FILE_MAGIC = b"WRMF"
+FILE_VERSION = 2
+COMPRESSED = 0x01
+
+FILE_PREFIX = struct.Struct("<4sH")
+# magic, header version, flags, level, timestamp, CRC-32 of the payload as
+# stored, stored size, decoded size, world size, length of the name that follows
+FILE_HEADER = struct.Struct("<4sHBxHdIIIIH")
+# Header version -> header; version 1 files have no world
+FILE_HEADERS = {
+    1: struct.Struct("<4sHBxHdIIIH"),
+    2: FILE_HEADER,
+}
+
+SaveInfo = namedtuple("SaveInfo", ["path", "name", "level", "timestamp", "checksum", "stored_size", "size", "compressed", "world_size"])
+
+def slot_path(slot, folder=SAVE_FOLDER):
+    return os.path.join(folder, slot + SAVE_EXTENSION)
+
+def new_slot_path(folder=SAVE_FOLDER):
+    """The path of the first unused slot, e.g. saves/slot3.sav."""
+    number = 1
+    while os.path.exists(slot_path(f"slot{number}", folder)):
+        number += 1
+    return slot_path(f"slot{number}", folder)
+
+DEFAULT_SAVE = slot_path("slot1")
 
-def save_game(player, filename="savegame.dat"):
-    """Saves the player object to a file."""
+def pack_save(state, compress=True, timestamp=None, world=b""):
+    """A complete save file for `state` (see save_codec.character_state) and the encoded `world`."""
+    payload = encode_state(state)
+    stored = zlib.compress(payload) if compress else payload
+    name = state["name"].encode("utf-8")
+    header = FILE_HEADER.pack(
+        FILE_MAGIC, FILE_VERSION, COMPRESSED if compress else 0, state["level"],
+        time.time() if timestamp is None else timestamp,
+        zlib.crc32(stored), len(stored), len(payload), len(world), len(name),
+    )
+    return header + name + stored + world
+
+def _header_struct(data, path):
+    if len(data) < FILE_PREFIX.size:
+        raise SaveFormatError(f"{path}: not a save file")
+    magic, version = FILE_PREFIX.unpack_from(data)
+    if magic != FILE_MAGIC:
+        raise SaveFormatError(f"{path}: not a save file")
+    if version not in FILE_HEADERS:
+        raise SaveFormatError(f"{path}: save file version {version} is not supported")
+    return FILE_HEADERS[version]
+
+def _unpack_header(data, path):
+    header = _header_struct(data, path)
+    if len(data) < header.size:
+        raise SaveFormatError(f"{path}: save file is truncated")
+    fields = header.unpack_from(data)
+    _, version, flags, level, timestamp, checksum, stored_size, size = fields[:8]
+    world_size = fields[8] if version >= 2 else 0
+    name_length = fields[-1]
+    name = data[header.size:header.size + name_length]
+    if len(name) != name_length:
+        raise SaveFormatError(f"{path}: save file is truncated")
+    info = SaveInfo(path, bytes(name).decode("utf-8", "replace"), level, timestamp, checksum,
+                    stored_size, size, bool(flags & COMPRESSED), world_size)
+    return info, header.size + name_length
+
+def read_save_info(path):
+    """The header of the save at `path`, without reading the payload."""
+    with open(path, "rb") as f:
+        data = f.read(FILE_PREFIX.size)
+        header = _header_struct(data, path)
+        data += f.read(header.size - FILE_PREFIX.size)
+        if len(data) == header.size:
+            data += f.read(header.unpack_from(data)[-1])
+    return _unpack_header(data, path)[0]
+
+def unpack_save(data, path="save"):
+    """
+    The save_codec payload of a save file, after checking its size and
+    checksum, and the encoded world after it (empty for saves without one).
+    """
+    info, offset = _unpack_header(data, path)
+    stored = data[offset:offset + info.stored_size]
+    world = data[offset + info.stored_size:]
+    if len(stored) != info.stored_size or zlib.crc32(stored) != info.checksum or len(world) != info.world_size:
+        raise SaveFormatError(f"{path}: save file is corrupt")
+    payload = zlib.decompress(stored) if info.compressed else stored
+    if len(payload) != info.size:
+        raise SaveFormatError(f"{path}: save file is corrupt")
+    return payload, world
+
+def list_saves(folder=SAVE_FOLDER):
+    """SaveInfo for every readable save in `folder`, newest first."""
+    saves = []
+    if not os.path.isdir(folder):
+        return saves
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.name.endswith(SAVE_EXTENSION):
+            try:
+                saves.append(read_save_info(entry.path))
+            except (OSError, SaveFormatError) as e:
+                print(f"Skipping unreadable save: {e}")
+    saves.sort(key=lambda info: info.timestamp, reverse=True)
+    return saves
+
+def write_save_file(data, filename):
+    """
+    Writes `data` to a temporary file next to `filename`, syncs it to disk
+    and renames it over the old save, so a crash mid-write leaves the
+    previous save intact.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".save-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    # Make the rename itself durable where the platform allows it
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def save_game(player, filename=DEFAULT_SAVE, compress=True, world=None):
+    """Saves the player's state, and the world's if given, to a file."""
     try:
-        with open(filename, "wb") as f:
-            pickle.dump(player, f)
+        world_data = world.to_bytes() if world is not None else b""
+        write_save_file(pack_save(character_state(player), compress, world=world_data), filename)
         print(f"Game saved to {filename}")
     except Exception as e:
         print(f"Error saving game: {e}")
 
-def load_game(filename="savegame.dat"):
-    """Loads the player object from a file."""
+def load_slot(filename=DEFAULT_SAVE):
+    """
+    Loads a player and the world from a file, replaying any journal of
+    changes made after it was written. Returns (player, world); the world is
+    a fresh WorldState for saves made without one, and both are None if the
+    file can't be read.
+    """
     if not os.path.exists(filename):
-        return None
+        return None, None
 
     try:
         with open(filename, "rb") as f:
-            player = pickle.load(f)
+            data = f.read()
+        # Only slot files are read. Saves from before them were pickles,
+        # which are never loaded, since unpickling runs whatever code the
+        # file asks for
+        payload, world_data = unpack_save(data, filename)
+        player = decode_character(payload)
+        world = WorldState.from_bytes(world_data) if world_data else WorldState()
+        recovered = replay_journal(player, filename, world)
+        if recovered:
+            print(f"Recovered {recovered} changes made after the last save")
         print(f"Game loaded from {filename}")
-        return player
+        return player, world
     except Exception as e:
         print(f"Error loading game: {e}")
-        return None
+        return None, None
+
+def load_game(filename=DEFAULT_SAVE):
+    """Loads a player from a file, or returns None if it can't be read."""
+    return load_slot(filename)[0]
 
-def save_file_exists(filename="savegame.dat"):
+def save_file_exists(filename=DEFAULT_SAVE):
     """Checks if a save file exists."""
     return os.path.exists(filename)
@@ -0,0 +1,127 @@
+"""
+A hierarchical timer wheel for game-time callbacks.
+
+Game time is counted in ticks; the main loop advances the global `scheduler`
+by one tick per frame while the world is running. Scheduling and cancelling
+are O(1). Each advance only touches the timers that fire plus, every
+SLOTS ticks, one bucket of the next level up that is cascaded down, so
+frames cost nothing for timers that are still far away.
+"""
+
+TICKS_PER_SECOND = 60
+
+class TimerHandle:
+    """A scheduled callback. Keep it to cancel the timer."""
+    __slots__ = ("due", "callback", "args", "interval", "_bucket")
+
+    def __init__(self, due, callback, args, interval=None):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self._bucket = None
+
+    @property
+    def active(self):
+        return self._bucket is not None
+
+    def cancel(self):
+        if self._bucket is not None:
+            del self._bucket[self]
+            self._bucket = None
+
+    def __getstate__(self):
+        # A saved handle comes back detached; timers don't survive a save
+        return (self.due, self.callback, self.args, self.interval)
+
+    def __setstate__(self, state):
+        self.due, self.callback, self.args, self.interval = state
+        self._bucket = None
+
+class Scheduler:
+    """
+    `levels` wheels of `2 ** bits` slots each. Level L holds timers due
+    within 2 ** (bits * (L + 1)) ticks; anything further out waits in an
+    overflow bucket that is re-sorted whenever the top wheel turns over.
+    """
+    def __init__(self, bits=6, levels=4):
+        self.bits = bits
+        self.slots = 1 << bits
+        self.mask = self.slots - 1
+        self.levels = levels
+        # Buckets are dicts used as ordered sets, so a handle can remove itself in O(1)
+        self._wheels = [[{} for _ in range(self.slots)] for _ in range(levels)]
+        self._overflow = {}
+        self.now = 0
+
+    def call_later(self, delay, callback, *args):
+        """Runs callback(*args) after `delay` ticks (at least one)."""
+        return self.call_at(self.now + max(1, int(delay)), callback, *args)
+
+    def call_at(self, tick, callback, *args):
+        handle = TimerHandle(max(tick, self.now + 1), callback, args)
+        self._insert(handle)
+        return handle
+
+    def call_every(self, interval, callback, *args):
+        """Runs callback(*args) every `interval` ticks until cancelled."""
+        interval = max(1, int(interval))
+        handle = TimerHandle(self.now + interval, callback, args, interval)
+        self._insert(handle)
+        return handle
+
+    def cancel(self, handle):
+        if handle is not None:
+            handle.cancel()
+
+    def _insert(self, handle):
+        for level in range(self.levels):
+            shift = self.bits * level
+            if (handle.due >> shift) - (self.now >> shift) < self.slots:
+                bucket = self._wheels[level][(handle.due >> shift) & self.mask]
+                break
+        else:
+            bucket = self._overflow
+        bucket[handle] = None
+        handle._bucket = bucket
+
+    def _cascade(self, level):
+        shift = self.bits * level
+        index = (self.now >> shift) & self.mask
+        bucket = self._wheels[level][index]
+        self._wheels[level][index] = {}
+        for handle in bucket:
+            self._insert(handle)
+
+    def advance(self, ticks=1):
+        """Moves game time forward, running every timer that comes due."""
+        for _ in range(ticks):
+            self.now += 1
+            # Turn over the higher wheels first so their timers can land in the lower ones
+            for level in range(self.levels - 1, 0, -1):
+                if self.now & ((1 << (self.bits * level)) - 1) == 0:
+                    if level == self.levels - 1 and (self.now >> (self.bits * level)) & self.mask == 0:
+                        overflow = self._overflow
+                        self._overflow = {}
+                        for handle in overflow:
+                            self._insert(handle)
+                    self._cascade(level)
+
+            index = self.now & self.mask
+            bucket = self._wheels[0][index]
+            if not bucket:
+                continue
+            self._wheels[0][index] = {}
+            for handle in list(bucket):
+                if handle._bucket is not bucket:
+                    continue  # cancelled by an earlier callback
+                handle._bucket = None
+                if handle.interval:
+                    handle.due += handle.interval
+                    self._insert(handle)
+                handle.callback(*handle.args)
+
+    def __len__(self):
+        return sum(len(bucket) for wheel in self._wheels for bucket in wheel) + len(self._overflow)
+
+scheduler = Scheduler()
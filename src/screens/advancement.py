@@ -121,8 +121,7 @@ class AdvancementScreen:
                 self.buttons = self._create_main_buttons()
             else: # A talent button was clicked
                 talent = all_talents[name]
-                self.player.talents.append(talent)
-                talent.apply(self.player) # Apply the talent's effect immediately
+                self.player.add_talent(talent)
                 self.is_done = True
 
         elif self.selection_state == "spell":
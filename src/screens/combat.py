@@ -1,11 +1,11 @@
 import pygame
 from character import Character
 from combat import Combat
+from monster_ai import choose_monster_action
 from ui import Button
 from items import all_items
 from spells import all_spells
 from event_manager import event_manager
-import random
 def draw_text(surface, text, font, color, x, y):
     text_surface = font.render(text, True, color)
     text_rect = text_surface.get_rect()
@@ -16,7 +16,7 @@ class CombatScreen:
     def __init__(self, player, opponent):
         self.player = player
         self.opponent = opponent
-        self.combat = Combat(player, opponent)
+        self.combat = Combat(player, opponent, monster_ai=choose_monster_action)
         self.font = pygame.font.Font(None, 36)
         self.is_over = False
         self.winner = None
@@ -74,7 +74,7 @@ class CombatScreen:
                 self.buttons = self._create_spell_buttons()
             elif self.buttons["dismiss"].is_clicked(event):
                 if self.player.sustained_spells:
-                    self.player.sustained_spells.clear()
+                    self.player.dismiss_sustained_spells()
                     self.combat_log.append("You dismissed all sustained spells.")
         elif self.selection_state == "spell_selection":
             if self.buttons["back"].is_clicked(event):
@@ -185,33 +185,18 @@ class CombatScreen:
 
     def _process_status_effects(self, character):
         if self.is_over: return
-
-        # Use a copy to allow modification during iteration
-        for effect in list(character.status_effects):
-            effect.on_turn_start()
-            effect.duration -= 1
-            if effect.duration <= 0:
-                effect.on_remove()
-                character.status_effects.remove(effect)
-                self.combat_log.append(f"{effect.name} has worn off for {character.name}.")
+        self.combat_log.extend(self.combat.process_status_effects(character))
 
     def _monster_turn(self):
         if self.is_over: return
         self._process_status_effects(self.opponent)
         if self.is_over: return # Effects might end the combat
 
-        # Drake special attack logic
-        if self.opponent.name == "Drake" and random.random() < 0.5:
-            message, damage_dealt = self.combat.special_attack(self.opponent, self.player, "Fire Spray")
-            self.combat_log.append(message)
-        else:
-            # Standard attack for all other monsters
-            weapon = self.opponent.equipped_weapon or all_items["unarmed_strike"]
-            success, total, damage = self.combat.attack(self.opponent, self.player, weapon)
-            if success:
-                self.combat_log.append(f"{self.opponent.name} hits for {damage} damage with {weapon.name}!")
-            else:
-                self.combat_log.append(f"{self.opponent.name} missed with {weapon.name}!")
+        self.combat_log.append(self.combat.monster_turn(self.opponent, self.player))
+
+        if self.combat.fled == self.opponent:
+            self.is_over = True
+            return
 
         if self.player.is_dead:
             if self.player.fate > 0:
@@ -275,6 +260,11 @@ class CombatScreen:
             draw_text(screen, msg, self.font, (255, 255, 255), 100, 250 + i * 40)
 
         if self.is_over:
-            winner_msg = f"{self.winner.name} wins!" if self.winner else "It's a draw!"
+            if self.winner:
+                winner_msg = f"{self.winner.name} wins!"
+            elif self.combat.fled:
+                winner_msg = f"{self.combat.fled.name} got away!"
+            else:
+                winner_msg = "It's a draw!"
             draw_text(screen, winner_msg, self.font, (255, 255, 0), 300, 50)
             draw_text(screen, "Press ESC to continue", self.font, (255, 255, 255), 250, 550)
@@ -1,10 +1,18 @@
 import pygame
 from character import Character
-from entities import TownGuard, Goblin, GiantRat, Skeleton, Bandit, GiantSpider, BanditLeader, Drake
-from save_manager import save_game
+from character_sprite import CharacterSprite
+from entities import NPC
+from autosave import Autosaver
+from save_manager import DEFAULT_SAVE
+from save_journal import SaveJournal
 from tilemap import Map, Camera
+from world import WorldState
 from event_manager import event_manager
 from ui import Button
+from scheduler import scheduler
+
+AUTOSAVE_SECONDS = 120 # of game time
+JOURNAL_COMPACT_BYTES = 64 * 1024
 
 def draw_text(surface, text, font, color, x, y):
     text_surface = font.render(text, True, color)
@@ -13,50 +21,124 @@ def draw_text(surface, text, font, color, x, y):
     surface.blit(text_surface, text_rect)
 
 class GameplayScreen:
-    def __init__(self, player):
+    def __init__(self, player, save_path=DEFAULT_SAVE, world=None):
         self.player = player
         self.font = pygame.font.Font(None, 36)
 
-        self.map = Map("town.txt")
+        # Who is left on each map, NPC flags and so on; saved with the player
+        self.world = world if world is not None else WorldState()
+        self.map = Map(self.world.current_map)
+        self.map_state = self.world.map_state(self.world.current_map)
         self.camera = Camera(self.map.width, self.map.height)
 
+        # Characters are plain objects; the screen owns their sprites
+        self.sprites_by_character = {}
         self.all_sprites = pygame.sprite.Group()
-        self.all_sprites.add(self.player)
+        self.player_sprite = self._add_sprite(self.player)
 
         self.npcs = pygame.sprite.Group()
-        guard = TownGuard(x=10 * 32, y=5 * 32) # Place entities on the map grid
-        self.all_sprites.add(guard)
-        self.npcs.add(guard)
-
         self.monsters = pygame.sprite.Group()
-        goblin = Goblin(x=15 * 32, y=12 * 32)
-        rat = GiantRat(x=5 * 32, y=14 * 32)
-        skeleton = Skeleton(x=15 * 32, y=3 * 32)
-        bandit = Bandit(x=3 * 32, y=3 * 32)
-        spider = GiantSpider(x=17 * 32, y=8 * 32)
-        bandit_leader = BanditLeader(x=18 * 32, y=2 * 32)
-        drake = Drake(x=12 * 32, y=14 * 32)
-        self.all_sprites.add(goblin, rat, skeleton, bandit, spider, bandit_leader, drake)
-        self.monsters.add(goblin, rat, skeleton, bandit, spider, bandit_leader, drake)
+        self.spawn_ids = {} # character -> its spawn id on this map
+        for spawn_id, character in self.map_state.spawn(self.world.current_map):
+            self.spawn_ids[character] = spawn_id
+            group = self.npcs if isinstance(character, NPC) else self.monsters
+            group.add(self._add_sprite(character))
 
         self.player_speed = 5
         self.dialogue_to_show = None
         self.active_monster = None
-        self.save_message_timer = 0
-        self.rest_message = ""
-        self.rest_message_timer = 0
-        self.hazard_message = ""
-        self.hazard_message_timer = 0
-        self.hazard_cooldown = 0
+        # Timed on-screen messages by kind ("save", "rest", "hazard"); each
+        # removes itself when its timer fires
+        self.messages = {}
+        self.message_timers = {}
+        self.hazard_ready = True
+        self.hazard_timer = None
+        self.manual_save = None # request number of the F5 save being written
+        if self.world.hazard_cooldown:
+            self._start_hazard_cooldown(self.world.hazard_cooldown)
 
         self.rest_button = Button(700, 10, 90, 40, "Rest", (0, 100, 0), (255, 255, 255))
 
+        # The player's pickups and losses go to the event bus, for quests
+        self.player.post_inventory_events()
         self._subscribe_quests()
 
+        # Saves are written on a background thread, so they never hold up a
+        # frame; in between, the journal records changes as they happen
+        self.journal = SaveJournal(save_path, self.player, self.world)
+        self.autosaver = Autosaver(self.player, save_path, journal=self.journal, world_snapshot=self.world_snapshot)
+        self.autosaver.save_every(AUTOSAVE_SECONDS)
+        self.autosaver.save_on("quest_added", "level_up")
+        # Start from a fresh snapshot; after a load this also folds in the recovered journal
+        self.autosaver.save()
+
+    def _add_sprite(self, character):
+        sprite = CharacterSprite(character)
+        self.sprites_by_character[character] = sprite
+        self.all_sprites.add(sprite)
+        return sprite
+
+    def remove(self, character):
+        """Takes a character off the map for good, e.g. a defeated monster."""
+        sprite = self.sprites_by_character.pop(character, None)
+        if sprite:
+            sprite.kill()
+        spawn_id = self.spawn_ids.pop(character, None)
+        if spawn_id is not None:
+            self.map_state.remove(spawn_id)
+
+    def sync_world(self):
+        """Copies what is only held by live objects (HP, NPC flags, the hazard cooldown) into the world state."""
+        for character, spawn_id in self.spawn_ids.items():
+            self.map_state.record(spawn_id, character)
+        if self.hazard_timer is not None and self.hazard_timer.active:
+            self.world.hazard_cooldown = self.hazard_timer.due - scheduler.now
+        else:
+            self.world.hazard_cooldown = 0
+
+    def world_snapshot(self):
+        self.sync_world()
+        return self.world.to_bytes()
+
     def _subscribe_quests(self):
+        # Objectives subscribe to just the kills and items they need. The
+        # screen owns the subscriptions, so close() (or the screen going away) drops them.
         for quest in self.player.journal:
-            for objective in quest.objectives:
-                event_manager.subscribe("monster_killed", objective.update)
+            self._subscribe_quest(quest)
+        event_manager.subscribe("quest_added", self._on_quest_added, owner=self)
+
+    def _subscribe_quest(self, quest):
+        quest.subscribe(event_manager, owner=self)
+
+    def _on_quest_added(self, event):
+        if event["character"] is self.player:
+            self._subscribe_quest(event["quest"])
+
+    def close(self):
+        """Detaches the screen from the event bus when it is replaced, after finishing any save in progress."""
+        event_manager.unsubscribe_owner(self)
+        self.player.post_inventory_events(False)
+        self.sync_world()
+        self.journal.close()
+        self.autosaver.close()
+
+    def abandon(self):
+        """
+        Detaches the screen after the player lost. Changes since the last
+        save are thrown away, so loading the slot brings back that save
+        rather than the fallen character.
+        """
+        event_manager.unsubscribe_owner(self)
+        self.player.post_inventory_events(False)
+        self.autosaver.close()
+        self.journal.discard()
+
+    def commit_journal(self):
+        """Records this frame's changes; called once per frame, whatever screen is showing."""
+        self.sync_world()
+        self.journal.commit()
+        if self.journal.size > JOURNAL_COMPACT_BYTES:
+            self.autosaver.save()
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -70,14 +152,14 @@ class GameplayScreen:
                 from main import GameState
                 return GameState.INVENTORY
             elif event.key == pygame.K_F5:
-                save_game(self.player)
-                self.save_message_timer = 120
+                # Reported by update() once the background write has finished
+                self.manual_save = self.autosaver.save()
             elif event.key == pygame.K_j:
                 from main import GameState
                 return GameState.JOURNAL
             elif event.key == pygame.K_d:
                 if self.player.sustained_spells:
-                    self.player.sustained_spells.clear()
+                    self.player.dismiss_sustained_spells()
                     print("You have dismissed all sustained spells.")
 
         if self.rest_button.is_clicked(event):
@@ -86,11 +168,28 @@ class GameplayScreen:
             self.player.rest()
             hp_recovered = self.player.hp - hp_before
             mana_recovered = self.player.mana - mana_before
-            self.rest_message = f"Rested. HP +{hp_recovered}, Mana +{mana_recovered}"
-            self.rest_message_timer = 120 # Show message for 2 seconds
+            self.show_message("rest", f"Rested. HP +{hp_recovered}, Mana +{mana_recovered}", 120) # Show message for 2 seconds
 
         return None
 
+    def show_message(self, kind, text, ticks):
+        """Shows `text` for `ticks` frames, replacing any message of the same kind."""
+        scheduler.cancel(self.message_timers.get(kind))
+        self.messages[kind] = text
+        self.message_timers[kind] = scheduler.call_later(ticks, self._hide_message, kind)
+
+    def _hide_message(self, kind):
+        self.messages.pop(kind, None)
+        self.message_timers.pop(kind, None)
+
+    def _start_hazard_cooldown(self, ticks):
+        self.hazard_ready = False
+        self.hazard_timer = scheduler.call_later(ticks, self._hazard_cooldown_over)
+
+    def _hazard_cooldown_over(self):
+        self.hazard_ready = True
+        self.hazard_timer = None
+
     def update(self, screen):
         # Player movement
         vx, vy = 0, 0
@@ -104,47 +203,41 @@ class GameplayScreen:
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
             vy = self.player_speed
 
-        self.player.rect.x += vx
+        self.player_sprite.rect.x += vx
         self.check_collisions('x')
-        self.player.rect.y += vy
+        self.player_sprite.rect.y += vy
         self.check_collisions('y')
+        self.player_sprite.sync()
 
-        self.camera.update(self.player)
-
-        if self.save_message_timer > 0:
-            self.save_message_timer -= 1
-
-        if self.rest_message_timer > 0:
-            self.rest_message_timer -= 1
+        self.camera.update(self.player_sprite)
 
-        if self.hazard_message_timer > 0:
-            self.hazard_message_timer -= 1
-
-        if self.hazard_cooldown > 0:
-            self.hazard_cooldown -= 1
+        if self.manual_save is not None:
+            saved = self.autosaver.result(self.manual_save)
+            if saved is not None:
+                self.show_message("save", "Game Saved!" if saved else "Save failed!", 120)
+                self.manual_save = None
 
         # Hazard collision logic
-        if self.hazard_cooldown == 0:
-            hits = pygame.sprite.spritecollide(self.player, self.map.hazards, False)
+        if self.hazard_ready:
+            hits = pygame.sprite.spritecollide(self.player_sprite, self.map.hazards, False)
             if hits:
                 hazard = hits[0]
                 hp_before = self.player.hp
                 self.player.take_damage(hazard.damage, hazard.damage_type)
                 damage_taken = hp_before - self.player.hp
-                self.hazard_message = f"Took {damage_taken} {hazard.damage_type} damage!"
-                self.hazard_message_timer = 120 # Show message for 2 seconds
-                self.hazard_cooldown = 60 # 1 second cooldown
+                self.show_message("hazard", f"Took {damage_taken} {hazard.damage_type} damage!", 120) # Show message for 2 seconds
+                self._start_hazard_cooldown(60) # 1 second cooldown
 
         # Interaction logic
         self.dialogue_to_show = None
         for npc in self.npcs:
-            if self.player.rect.colliderect(npc.rect.inflate(20, 20)):
-                self.dialogue_to_show = npc.interact(self.player)
+            if self.player_sprite.rect.colliderect(npc.rect.inflate(20, 20)):
+                self.dialogue_to_show = npc.character.interact(self.player)
                 break
 
         for monster in self.monsters:
-            if self.player.rect.colliderect(monster.rect.inflate(20, 20)):
-                self.active_monster = monster
+            if self.player_sprite.rect.colliderect(monster.rect.inflate(20, 20)):
+                self.active_monster = monster.character
                 from main import GameState
                 return GameState.COMBAT, self.active_monster
 
@@ -153,25 +246,24 @@ class GameplayScreen:
 
     def check_collisions(self, direction):
         if direction == 'x':
-            hits = pygame.sprite.spritecollide(self.player, self.map.walls, False)
+            hits = pygame.sprite.spritecollide(self.player_sprite, self.map.walls, False)
             if hits:
-                if self.player.rect.x > hits[0].rect.x: # Moving left
-                    self.player.rect.left = hits[0].rect.right
+                if self.player_sprite.rect.x > hits[0].rect.x: # Moving left
+                    self.player_sprite.rect.left = hits[0].rect.right
                 else: # Moving right
-                    self.player.rect.right = hits[0].rect.left
+                    self.player_sprite.rect.right = hits[0].rect.left
         if direction == 'y':
-            hits = pygame.sprite.spritecollide(self.player, self.map.walls, False)
+            hits = pygame.sprite.spritecollide(self.player_sprite, self.map.walls, False)
             if hits:
-                if self.player.rect.y > hits[0].rect.y: # Moving up
-                    self.player.rect.top = hits[0].rect.bottom
+                if self.player_sprite.rect.y > hits[0].rect.y: # Moving up
+                    self.player_sprite.rect.top = hits[0].rect.bottom
                 else: # Moving down
-                    self.player.rect.bottom = hits[0].rect.top
+                    self.player_sprite.rect.bottom = hits[0].rect.top
 
     def draw(self, screen):
         screen.fill((25, 100, 25))
 
-        for sprite in self.map.all_tiles:
-            screen.blit(sprite.image, self.camera.apply(sprite))
+        self.map.draw(screen, self.camera)
 
         for sprite in self.all_sprites:
             screen.blit(sprite.image, self.camera.apply(sprite))
@@ -179,14 +271,14 @@ class GameplayScreen:
         if self.dialogue_to_show:
             draw_text(screen, self.dialogue_to_show, self.font, (255, 255, 255), 100, 450)
 
-        if self.save_message_timer > 0:
-            draw_text(screen, "Game Saved!", self.font, (255, 255, 0), 350, 10)
+        if "save" in self.messages:
+            draw_text(screen, self.messages["save"], self.font, (255, 255, 0), 350, 10)
 
-        if self.rest_message_timer > 0:
-            draw_text(screen, self.rest_message, self.font, (173, 216, 230), 250, 50)
+        if "rest" in self.messages:
+            draw_text(screen, self.messages["rest"], self.font, (173, 216, 230), 250, 50)
 
-        if self.hazard_message_timer > 0:
-            draw_text(screen, self.hazard_message, self.font, (255, 100, 100), 250, 80)
+        if "hazard" in self.messages:
+            draw_text(screen, self.messages["hazard"], self.font, (255, 100, 100), 250, 80)
 
         self.rest_button.draw(screen)
         self._draw_hud(screen)
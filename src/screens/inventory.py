@@ -18,8 +18,9 @@ class InventoryScreen:
 
     def _create_buttons(self):
         buttons = {}
-        # Create buttons for each item in the inventory
-        for i, item in enumerate(self.player.inventory):
+        # Create buttons for each stack in the inventory
+        self.stacks = self.player.inventory.stacks()
+        for i, (item, count) in enumerate(self.stacks):
             if isinstance(item, (Weapon, Armor, MagicImplement)):
                 buttons[f"equip_{i}"] = Button(500, 100 + i * 50, 100, 40, "Equip", (0, 200, 0), (255, 255, 255))
             elif isinstance(item, Potion):
@@ -38,18 +39,18 @@ class InventoryScreen:
                     self.is_done = True
                 elif name.startswith("equip_"):
                     item_index = int(name.split("_")[1])
-                    item_to_equip = self.player.inventory[item_index]
+                    item_to_equip, _ = self.stacks[item_index]
                     self.player.equip(item_to_equip)
                     # Recreate buttons to reflect changes
                     self.buttons = self._create_buttons()
                 elif name.startswith("use_"):
                     item_index = int(name.split("_")[1])
-                    # Ensure the index is still valid after potential list modifications
-                    if item_index < len(self.player.inventory):
-                        item_to_use = self.player.inventory[item_index]
-                        self.player.use_item(item_to_use)
-                        # Recreate buttons to reflect the new inventory state
-                        self.buttons = self._create_buttons()
+                    item_to_use, _ = self.stacks[item_index]
+                    self.player.use_item(item_to_use)
+                    # Recreate buttons to reflect the new inventory state
+                    self.buttons = self._create_buttons()
+                # The button dict was replaced; don't keep iterating the old one
+                break
 
     def update(self):
         pass
@@ -61,19 +62,22 @@ class InventoryScreen:
 
         # Draw inventory items
         draw_text(screen, "Items:", self.font, (255, 255, 255), 10, 50)
-        for i, item in enumerate(self.player.inventory):
-            draw_text(screen, item.name, self.font, (255, 255, 255), 10, 100 + i * 50)
+        for i, (item, count) in enumerate(self.stacks):
+            label = f"{item.name} x{count}" if count > 1 else item.name
+            draw_text(screen, label, self.font, (255, 255, 255), 10, 100 + i * 50)
 
         # Draw equipped items
         draw_text(screen, "Equipped:", self.font, (255, 255, 255), 300, 50)
         weapon_name = self.player.equipped_weapon.name if self.player.equipped_weapon else "None"
-        armor_name = self.player.equipped_armor.name if self.player.equipped_armor else "None"
+        armor_name = self.player.equipped_body_armor.name if self.player.equipped_body_armor else "None"
+        shield_name = self.player.equipped_shield.name if self.player.equipped_shield else "None"
         implement_name = self.player.equipped_implement.name if self.player.equipped_implement else "None"
         draw_text(screen, f"Weapon: {weapon_name}", self.font, (255, 255, 255), 300, 100)
         draw_text(screen, f"Armor: {armor_name}", self.font, (255, 255, 255), 300, 150)
-        draw_text(screen, f"Implement: {implement_name}", self.font, (255, 255, 255), 300, 200)
+        draw_text(screen, f"Shield: {shield_name}", self.font, (255, 255, 255), 300, 200)
+        draw_text(screen, f"Implement: {implement_name}", self.font, (255, 255, 255), 300, 250)
         if self.player.equipped_implement:
-            draw_text(screen, f"  Mana: {self.player.equipped_implement.mana_pool}/{self.player.equipped_implement.max_mana}", self.font, (255, 255, 255), 300, 230)
+            draw_text(screen, f"  Mana: {self.player.equipped_implement.mana_pool}/{self.player.equipped_implement.max_mana}", self.font, (255, 255, 255), 300, 280)
 
 
         # Draw buttons
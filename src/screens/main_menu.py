@@ -1,6 +1,10 @@
+import time
+
 import pygame
 from ui import Button
-from save_manager import save_file_exists
+from save_manager import list_saves
+
+SAVES_PER_PAGE = 7
 
 def draw_text(surface, text, font, color, x, y):
     text_surface = font.render(text, True, color)
@@ -11,28 +15,62 @@ def draw_text(surface, text, font, color, x, y):
 class MainMenuScreen:
     def __init__(self):
         self.font = pygame.font.Font(None, 50)
+        self.small_font = pygame.font.Font(None, 28)
         self.selected_option = None
+        self.selected_save = None # SaveInfo of the save to load
+
+        # Only the headers are read, so this stays quick with hundreds of saves
+        self.saves = list_saves()
+        self.choosing_save = False
+        self.scroll = 0
 
         self.buttons = self._create_buttons()
+        self.back_button = Button(300, 530, 200, 50, "Back", (200, 200, 0), (0, 0, 0))
 
     def _create_buttons(self):
         buttons = {}
         buttons["new_game"] = Button(300, 200, 200, 50, "New Game", (0, 200, 0), (255, 255, 255))
 
-        load_game_color = (0, 200, 0) if save_file_exists() else (100, 100, 100)
+        load_game_color = (0, 200, 0) if self.saves else (100, 100, 100)
         buttons["load_game"] = Button(300, 300, 200, 50, "Load Game", load_game_color, (255, 255, 255))
 
         buttons["quit"] = Button(300, 400, 200, 50, "Quit", (200, 0, 0), (255, 255, 255))
         return buttons
 
+    def _save_buttons(self):
+        """A button per save on the visible page, paired with its SaveInfo."""
+        buttons = []
+        for row, info in enumerate(self.saves[self.scroll:self.scroll + SAVES_PER_PAGE]):
+            saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(info.timestamp))
+            text = f"{info.name}  Level {info.level}  {saved_at}"
+            buttons.append((Button(150, 140 + row * 55, 500, 45, text, (0, 100, 150), (255, 255, 255)), info))
+        return buttons
+
     def handle_event(self, event):
-        if self.buttons["new_game"].is_clicked(event):
+        if self.choosing_save:
+            self._handle_save_list_event(event)
+        elif self.buttons["new_game"].is_clicked(event):
             self.selected_option = "new_game"
-        elif self.buttons["load_game"].is_clicked(event) and save_file_exists():
-            self.selected_option = "load_game"
+        elif self.buttons["load_game"].is_clicked(event) and self.saves:
+            self.choosing_save = True
+            self.scroll = 0
         elif self.buttons["quit"].is_clicked(event):
             self.selected_option = "quit"
 
+    def _handle_save_list_event(self, event):
+        if self.back_button.is_clicked(event) or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+            self.choosing_save = False
+        elif event.type == pygame.MOUSEWHEEL:
+            last_page_start = max(0, len(self.saves) - SAVES_PER_PAGE)
+            self.scroll = min(max(self.scroll - event.y, 0), last_page_start)
+        else:
+            for button, info in self._save_buttons():
+                if button.is_clicked(event):
+                    self.selected_save = info
+                    self.selected_option = "load_game"
+                    self.choosing_save = False
+                    break
+
     def update(self):
         # The main menu is static, so no update logic is needed for now
         pass
@@ -42,6 +80,14 @@ class MainMenuScreen:
 
         draw_text(screen, "Warrior, Rogue & Mage", self.font, (255, 255, 0), 150, 100)
 
+        if self.choosing_save:
+            for button, _ in self._save_buttons():
+                button.draw(screen)
+            shown = min(len(self.saves), self.scroll + SAVES_PER_PAGE)
+            draw_text(screen, f"{self.scroll + 1}-{shown} of {len(self.saves)} saves", self.small_font, (200, 200, 200), 150, 530)
+            self.back_button.draw(screen)
+            return
+
         # Draw buttons
         for button in self.buttons.values():
             button.draw(screen)
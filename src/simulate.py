@@ -0,0 +1,228 @@
+"""
+Headless mass-duel simulator.
+
+Runs many duels of a configured player character against each Monster in
+entities.py, using the same Combat rules as CombatScreen but without a
+display. Duels are spread over a process pool. Every duel draws from its own
+child of one RNGService, so results depend only on the seed, not on how
+the work was sharded.
+
+Example:
+    python src/simulate.py --duels 10000 --warrior 4 --rogue 3 --mage 3 --skills Swords Awareness
+"""
+import argparse
+import contextlib
+import inspect
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import entities
+from character import Character
+from combat import Combat
+from entities import Monster
+from items import all_items
+from monster_ai import choose_monster_action
+from rng import RNGService
+from talents import all_talents
+
+DEFAULT_CHUNK_SIZE = 500
+
+class PlayerConfig:
+    """Everything needed to build a fresh player character for each duel."""
+    def __init__(self, warrior=3, rogue=3, mage=4, skills=None, talents=None, weapon="sword", armor=None, use_fate=True):
+        self.warrior = warrior
+        self.rogue = rogue
+        self.mage = mage
+        self.skills = skills if skills is not None else ["Swords"]
+        self.talents = talents if talents is not None else []
+        self.weapon = weapon
+        self.armor = armor
+        self.use_fate = use_fate
+
+    def build(self, rng):
+        player = Character(
+            "Player", 0, 0, self.warrior, self.rogue, self.mage,
+            skills=list(self.skills),
+            talents=[all_talents[key] for key in self.talents],
+            rng=rng
+        )
+        for key in (self.weapon, self.armor):
+            if key:
+                item = all_items[key]
+                player.inventory.append(item)
+                player.equip(item)
+        return player
+
+class DuelStats:
+    """Aggregated results of many duels against one monster type."""
+    def __init__(self, monster_name):
+        self.monster_name = monster_name
+        self.duels = 0
+        self.wins = 0
+        self.draws = 0
+        self.fled = 0
+        self.total_turns = 0
+        self.hp_remaining = Counter()
+
+    def record(self, won, turns, hp_left, draw=False, fled=False):
+        self.duels += 1
+        self.total_turns += turns
+        self.hp_remaining[hp_left] += 1
+        if won:
+            self.wins += 1
+        elif draw:
+            self.draws += 1
+        elif fled:
+            self.fled += 1
+
+    def merge(self, other):
+        self.duels += other.duels
+        self.wins += other.wins
+        self.draws += other.draws
+        self.fled += other.fled
+        self.total_turns += other.total_turns
+        self.hp_remaining.update(other.hp_remaining)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.duels if self.duels else 0.0
+
+    @property
+    def mean_turns(self):
+        return self.total_turns / self.duels if self.duels else 0.0
+
+    def hp_percentile(self, fraction):
+        """Player HP remaining at the given fraction (0-1) of all duels."""
+        target = fraction * self.duels
+        seen = 0
+        for hp in sorted(self.hp_remaining):
+            seen += self.hp_remaining[hp]
+            if seen >= target:
+                return hp
+        return 0
+
+    def __str__(self):
+        return (
+            f"{self.monster_name:<15} win {self.win_rate:6.1%}  "
+            f"draw {self.draws / self.duels if self.duels else 0:5.1%}  "
+            f"fled {self.fled / self.duels if self.duels else 0:5.1%}  "
+            f"mean turns {self.mean_turns:5.1f}  "
+            f"HP left p10/p50/p90 {self.hp_percentile(0.1)}/{self.hp_percentile(0.5)}/{self.hp_percentile(0.9)}"
+        )
+
+def monster_classes():
+    """All concrete Monster subclasses defined in entities.py, by class name."""
+    return {
+        name: cls for name, cls in inspect.getmembers(entities, inspect.isclass)
+        if issubclass(cls, Monster) and cls is not Monster
+    }
+
+def run_duel(player, monster, combat, max_turns=200, use_fate=True):
+    """
+    Fights one duel until someone dies or the monster flees, and returns (player_won, turns).
+    The player always attacks with their equipped weapon and, with
+    `use_fate`, spends Fate to survive a fatal blow as CombatScreen offers.
+    """
+    unarmed = all_items["unarmed_strike"]
+    current, _ = combat.determine_initiative()
+    turns = 0
+    while turns < max_turns:
+        combat.process_status_effects(current)
+        if current is player:
+            if not player.is_dead:
+                combat.attack(player, monster, player.equipped_weapon or unarmed)
+            current = monster
+        else:
+            if not monster.is_dead:
+                combat.monster_turn(monster, player)
+            current = player
+        turns += 1
+
+        if player.is_dead and use_fate and player.fate > 0:
+            player.spend_fate(1)
+            player.hp = 1
+        if monster.is_dead:
+            return True, turns
+        if player.is_dead or combat.fled:
+            return False, turns
+    return False, turns
+
+def run_chunk(monster_name, player_config, seed, start, count, max_turns=200):
+    """Runs duels start..start+count against one monster type. Used by worker processes."""
+    monster_class = monster_classes()[monster_name]
+    service = RNGService(seed)
+    stats = DuelStats(monster_name)
+    # The rules print a line for almost every action; keep workers quiet.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for index in range(start, start + count):
+            rng = service.spawn(index)
+            player = player_config.build(rng)
+            monster = monster_class(0, 0)
+            monster.set_rng(rng)
+            combat = Combat(player, monster, rng=rng, monster_ai=choose_monster_action)
+            combat.ai_budget = None  # wall-clock limits would make results machine-dependent
+            won, turns = run_duel(player, monster, combat, max_turns, player_config.use_fate)
+            fled = combat.fled is monster
+            draw = not won and not player.is_dead and not fled
+            stats.record(won, turns, player.hp, draw, fled)
+    return stats
+
+def simulate(player_config, monster_names=None, duels=1000, seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, max_turns=200):
+    """
+    Runs `duels` duels against each monster and returns {monster name: DuelStats}.
+    With workers=1 everything runs in this process.
+    """
+    if monster_names is None:
+        monster_names = sorted(monster_classes())
+    jobs = [
+        (name, player_config, seed, start, min(chunk_size, duels - start), max_turns)
+        for name in monster_names
+        for start in range(0, duels, chunk_size)
+    ]
+    results = {name: DuelStats(name) for name in monster_names}
+
+    if workers == 1:
+        chunks = [run_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(run_chunk, *zip(*jobs)))
+
+    for chunk in chunks:
+        results[chunk.monster_name].merge(chunk)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless duels against every monster.")
+    parser.add_argument("--duels", type=int, default=1000, help="duels per monster")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--monsters", nargs="*", help="monster class names (default: all)")
+    parser.add_argument("--warrior", type=int, default=3)
+    parser.add_argument("--rogue", type=int, default=3)
+    parser.add_argument("--mage", type=int, default=4)
+    parser.add_argument("--skills", nargs="*", default=["Swords"])
+    parser.add_argument("--talents", nargs="*", default=[])
+    parser.add_argument("--weapon", default="sword")
+    parser.add_argument("--armor", default=None)
+    parser.add_argument("--no-fate", action="store_true", help="never spend Fate to survive")
+    parser.add_argument("--histogram", action="store_true", help="print the full HP-remaining distribution")
+    args = parser.parse_args(argv)
+
+    config = PlayerConfig(
+        warrior=args.warrior, rogue=args.rogue, mage=args.mage,
+        skills=args.skills, talents=args.talents,
+        weapon=args.weapon, armor=args.armor,
+        use_fate=not args.no_fate
+    )
+    results = simulate(config, args.monsters, args.duels, args.seed, args.workers, args.chunk_size, args.max_turns)
+    for stats in results.values():
+        print(stats)
+        if args.histogram:
+            for hp in sorted(stats.hp_remaining):
+                print(f"    HP {hp:3d}: {stats.hp_remaining[hp]}")
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ class Spell:
         self.dl = dl
         self.mana_cost = mana_cost
         self.effect = effect
-        self.duration = duration
+        self.duration = duration # Seconds of game time; 0 if the spell isn't sustained
 
     def __str__(self):
         return f"{self.name} (Circle {self.circle})"
@@ -1,5 +1,4 @@
 from spell import Spell
-from dice import Die
 
 # --- Effect Functions ---
 
@@ -13,7 +12,7 @@ def healing_hand_effect(caster, target, enhancement_level=0):
     if target is None:
         target = caster
 
-    d6 = Die()
+    d6 = caster.d6
     amount_to_heal = d6.roll()
     for _ in range(enhancement_level):
         amount_to_heal += d6.roll()
@@ -24,7 +23,7 @@ def healing_hand_effect(caster, target, enhancement_level=0):
 def frostburn_effect(caster, target, enhancement_level=0):
     """Deals 1d6 damage to a target (+1 per enhancement level)."""
     if target:
-        d6 = Die()
+        d6 = caster.d6
         damage = d6.roll() + enhancement_level
         target.take_damage(damage)
         print(f"{caster.name}'s frostburn deals {damage} damage to {target.name}.")
@@ -32,7 +31,7 @@ def frostburn_effect(caster, target, enhancement_level=0):
 def lightning_bolt_effect(caster, target, enhancement_level=0):
     """Deals 2d6 damage to a target (+1d6 per enhancement level)."""
     if target:
-        d6 = Die()
+        d6 = caster.d6
         damage = d6.roll() + d6.roll()
         for _ in range(enhancement_level):
             damage += d6.roll()
@@ -1,12 +1,18 @@
 class Talent:
-    def __init__(self, name, description, effect, talent_type="general"):
+    def __init__(self, name, description, effect=None, talent_type="general", modifiers=()):
         self.name = name
         self.description = description
         self.effect = effect
         self.type = talent_type
+        self.modifiers = tuple(modifiers)
 
     def apply(self, character):
-        self.effect(character)
+        character.add_modifiers(self, *self.modifiers)
+        if self.effect:
+            self.effect(character)
+
+    def remove(self, character):
+        character.remove_modifiers(self)
 
     def __str__(self):
         return self.name
@@ -1,7 +1,17 @@
 import pygame
 import os
+from collections import OrderedDict
+from dice import DiceExpression
 
 TILESIZE = 32
+CHUNK_TILES = 16 # tiles per side of a pre-rendered chunk
+# Rendered chunks kept at most, about 1 MB each: an 800x600 view plus a ring around it
+MAX_CHUNKS = 25
+
+GRASS_COLOR = (50, 150, 50)
+WALL_COLOR = (100, 100, 100)
+FIRE_COLOR = (200, 50, 50)
+TILE_COLORS = {'#': WALL_COLOR, 'F': FIRE_COLOR}
 
 class Tile(pygame.sprite.Sprite):
     def __init__(self, x, y, image):
@@ -13,10 +23,20 @@ class Tile(pygame.sprite.Sprite):
 class HazardTile(Tile):
     def __init__(self, x, y, image, damage, damage_type):
         super().__init__(x, y, image)
+        if isinstance(damage, str):
+            damage = DiceExpression.parse(damage)
         self.damage = damage
         self.damage_type = damage_type
 
 class Map:
+    """
+    A tile map. Walls and hazards are sprites, for collisions; drawing goes
+    through pre-rendered chunks of CHUNK_TILES x CHUNK_TILES tiles instead,
+    which are rendered the first time they come into view and only blitted
+    while they are on screen, so a frame costs the same on any size of map.
+    At most `max_chunks` rendered chunks are kept; the ones farthest from
+    the view go first, so memory doesn't grow with the area explored.
+    """
     def __init__(self, filepath):
         self.data = []
         # If the filepath is not absolute, assume it's a filename in the default maps folder
@@ -34,28 +54,86 @@ class Map:
         self.width = self.tilewidth * TILESIZE
         self.height = self.tileheight * TILESIZE
 
-        self.all_tiles = pygame.sprite.Group()
         self.walls = pygame.sprite.Group()
         self.hazards = pygame.sprite.Group()
 
-        # Define tile images
-        wall_img = pygame.Surface((TILESIZE, TILESIZE)); wall_img.fill((100, 100, 100))
-        grass_img = pygame.Surface((TILESIZE, TILESIZE)); grass_img.fill((50, 150, 50))
-        fire_img = pygame.Surface((TILESIZE, TILESIZE)); fire_img.fill((200, 50, 50))
+        # Define tile images; tiles share them, since chunks do the drawing
+        self.wall_img = pygame.Surface((TILESIZE, TILESIZE)); self.wall_img.fill(WALL_COLOR)
+        self.fire_img = pygame.Surface((TILESIZE, TILESIZE)); self.fire_img.fill(FIRE_COLOR)
 
         for row, tiles in enumerate(self.data):
             for col, tile_char in enumerate(tiles):
-                grass_tile = Tile(col, row, grass_img.copy())
-                self.all_tiles.add(grass_tile)
-
                 if tile_char == '#':
-                    wall_tile = Tile(col, row, wall_img.copy())
-                    self.all_tiles.add(wall_tile)
-                    self.walls.add(wall_tile)
+                    self.walls.add(Tile(col, row, self.wall_img))
                 elif tile_char == 'F':
-                    fire_tile = HazardTile(col, row, fire_img.copy(), damage="1d6", damage_type="fire")
-                    self.all_tiles.add(fire_tile)
-                    self.hazards.add(fire_tile)
+                    self.hazards.add(HazardTile(col, row, self.fire_img, damage="1d6", damage_type="fire"))
+
+        self.chunk_size = CHUNK_TILES * TILESIZE
+        self.max_chunks = MAX_CHUNKS
+        self.chunks = OrderedDict()  # (chunk column, chunk row) -> rendered Surface, least recently drawn first
+
+    def render_chunk(self, chunk_x, chunk_y):
+        """The chunk's tiles drawn onto one surface; chunks on the right and bottom edges may be smaller."""
+        first_col, first_row = chunk_x * CHUNK_TILES, chunk_y * CHUNK_TILES
+        cols = min(CHUNK_TILES, self.tilewidth - first_col)
+        rows = min(CHUNK_TILES, self.tileheight - first_row)
+        surface = pygame.Surface((cols * TILESIZE, rows * TILESIZE))
+        surface.fill(GRASS_COLOR)
+        for row in range(rows):
+            line = self.data[first_row + row]
+            for col in range(cols):
+                tile_char = line[first_col + col] if first_col + col < len(line) else '.'
+                color = TILE_COLORS.get(tile_char)
+                if color:
+                    surface.fill(color, (col * TILESIZE, row * TILESIZE, TILESIZE, TILESIZE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def get_chunk(self, chunk_x, chunk_y):
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = self.render_chunk(chunk_x, chunk_y)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def evict_chunks(self, visible):
+        """
+        Drops rendered chunks beyond `max_chunks`: the farthest from the
+        `visible` ones first, the least recently drawn among equally far
+        ones. Visible chunks are always kept.
+        """
+        excess = len(self.chunks) - self.max_chunks
+        if excess <= 0 or not visible:
+            return
+        (first_x, first_y), (last_x, last_y) = visible[0], visible[-1]
+        def distance(key):
+            x, y = key
+            return max(first_x - x, x - last_x, first_y - y, y - last_y)
+        # The sort is stable, so equally far chunks stay oldest first
+        for key in sorted(self.chunks, key=distance, reverse=True)[:excess]:
+            if distance(key) > 0:
+                del self.chunks[key]
+
+    def visible_chunks(self, view):
+        """(chunk column, chunk row) of every chunk that overlaps `view`, a Rect in map pixels."""
+        first_x = max(0, view.left // self.chunk_size)
+        first_y = max(0, view.top // self.chunk_size)
+        last_x = min((self.width - 1) // self.chunk_size, (view.right - 1) // self.chunk_size)
+        last_y = min((self.height - 1) // self.chunk_size, (view.bottom - 1) // self.chunk_size)
+        return [(x, y) for y in range(first_y, last_y + 1) for x in range(first_x, last_x + 1)]
+
+    def draw(self, surface, camera):
+        """Blits the chunks that are on screen at the camera's offset."""
+        offset_x, offset_y = camera.camera.topleft
+        view = pygame.Rect(-offset_x, -offset_y, surface.get_width(), surface.get_height())
+        visible = self.visible_chunks(view)
+        for chunk_x, chunk_y in visible:
+            surface.blit(self.get_chunk(chunk_x, chunk_y),
+                         (chunk_x * self.chunk_size + offset_x, chunk_y * self.chunk_size + offset_y))
+        self.evict_chunks(visible)
 
 class Camera:
     def __init__(self, width, height):
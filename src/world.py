@@ -0,0 +1,199 @@
+"""
+World state that is saved with the player: which of each map's monsters
+are gone, how hurt the survivors are, NPC flags, the hazard cooldown and
+the map the player is on.
+
+Each map's state is a separate chunk behind an index:
+
+    magic b"WRMW", version (u16), current map, hazard cooldown (u32),
+    CRC-32 of the index (u32), chunk count (u16),
+    per chunk: map name, size (u32), CRC-32 (u32); then the chunks
+
+WorldState.from_bytes() only reads the index. A map's chunk is checked and
+decoded the first time that map is asked for, and to_bytes() writes the
+chunks of maps that were never visited back out as they were, so loading
+and saving cost the same however many maps the world has.
+"""
+import zlib
+from collections import namedtuple
+
+from entities import TownGuard, Goblin, GiantRat, Skeleton, Bandit, GiantSpider, BanditLeader, Drake
+from save_codec import BinaryReader, BinaryWriter, SaveFormatError
+
+WORLD_MAGIC = b"WRMW"
+WORLD_VERSION = 1
+START_MAP = "town.txt"
+
+# `id` names the spawn within its map in saves; x, y are in pixels
+Spawn = namedtuple("Spawn", ["id", "factory", "x", "y"])
+
+MAP_SPAWNS = {
+    "town.txt": (
+        Spawn("town_guard", TownGuard, 10 * 32, 5 * 32),
+        Spawn("goblin", Goblin, 15 * 32, 12 * 32),
+        Spawn("giant_rat", GiantRat, 5 * 32, 14 * 32),
+        Spawn("skeleton", Skeleton, 15 * 32, 3 * 32),
+        Spawn("bandit", Bandit, 3 * 32, 3 * 32),
+        Spawn("giant_spider", GiantSpider, 17 * 32, 8 * 32),
+        Spawn("bandit_leader", BanditLeader, 18 * 32, 2 * 32),
+        Spawn("drake", Drake, 12 * 32, 14 * 32),
+    ),
+}
+
+class MapState:
+    """
+    What has changed on one map since it was first entered. `changed` is
+    set whenever it does, for the save journal to pick up.
+    """
+    __slots__ = ("removed", "hp", "flags", "changed")
+
+    def __init__(self):
+        self.removed = set()  # spawn ids of monsters that were killed or fled
+        self.hp = {}          # spawn id -> HP, for survivors that are hurt
+        self.flags = {}       # (spawn id, flag) -> int
+        self.changed = False
+
+    def remove(self, spawn_id):
+        if spawn_id not in self.removed:
+            self.removed.add(spawn_id)
+            self.hp.pop(spawn_id, None)
+            self.changed = True
+
+    def record(self, spawn_id, character):
+        """Notes `character`'s current HP and flags."""
+        if character.hp < character.max_hp:
+            if self.hp.get(spawn_id) != character.hp:
+                self.hp[spawn_id] = character.hp
+                self.changed = True
+        elif self.hp.pop(spawn_id, None) is not None:
+            self.changed = True
+        for flag in getattr(character, "saved_flags", ()):
+            value = int(getattr(character, flag))
+            if self.flags.get((spawn_id, flag), 0) != value:
+                self.flags[(spawn_id, flag)] = value
+                self.changed = True
+
+    def spawn(self, map_name):
+        """(spawn id, character) for everyone still on `map_name`, as they were left."""
+        spawned = []
+        for spawn in MAP_SPAWNS.get(map_name, ()):
+            if spawn.id in self.removed:
+                continue
+            character = spawn.factory(x=spawn.x, y=spawn.y)
+            if spawn.id in self.hp:
+                character.hp = self.hp[spawn.id]
+            for flag in getattr(character, "saved_flags", ()):
+                value = self.flags.get((spawn.id, flag))
+                if value is not None:
+                    setattr(character, flag, type(getattr(character, flag))(value))
+            spawned.append((spawn.id, character))
+        return spawned
+
+    def encode(self):
+        writer = BinaryWriter()
+        writer.strings(sorted(self.removed), "removed spawns")
+        writer.pack("H", len(self.hp), field="spawn HP count")
+        for spawn_id, hp in sorted(self.hp.items()):
+            writer.string(spawn_id, "spawn id")
+            writer.pack("h", hp, field=f"HP of spawn '{spawn_id}'")
+        writer.pack("H", len(self.flags), field="spawn flag count")
+        for (spawn_id, flag), value in sorted(self.flags.items()):
+            writer.string(spawn_id, "spawn id")
+            writer.string(flag, "flag")
+            writer.pack("i", value, field=f"flag '{flag}' of spawn '{spawn_id}'")
+        return writer.getvalue()
+
+    @classmethod
+    def decode(cls, data):
+        reader = BinaryReader(data)
+        state = cls()
+        state.removed = set(reader.strings())
+        (count,) = reader.unpack("H")
+        for _ in range(count):
+            spawn_id = reader.string()
+            state.hp[spawn_id] = reader.unpack("h")[0]
+        (count,) = reader.unpack("H")
+        for _ in range(count):
+            spawn_id, flag = reader.string(), reader.string()
+            state.flags[(spawn_id, flag)] = reader.unpack("i")[0]
+        return state
+
+class WorldState:
+    def __init__(self, current_map=START_MAP, hazard_cooldown=0):
+        self.current_map = current_map
+        self.hazard_cooldown = hazard_cooldown  # ticks left when the world was saved
+        self._chunks = {}  # map name -> (encoded MapState, CRC-32), not decoded yet
+        self._maps = {}    # map name -> MapState
+
+    def map_state(self, map_name):
+        """The MapState for `map_name`, decoding its chunk the first time it's asked for."""
+        state = self._maps.get(map_name)
+        if state is None:
+            chunk = self._chunks.get(map_name)
+            if chunk is None:
+                state = MapState()
+            else:
+                data, checksum = chunk
+                if zlib.crc32(data) != checksum:
+                    raise SaveFormatError(f"World data for {map_name} is corrupt")
+                state = MapState.decode(data)
+                del self._chunks[map_name]
+            self._maps[map_name] = state
+        return state
+
+    def loaded_maps(self):
+        return self._maps.items()
+
+    def replace_map(self, map_name, data):
+        """Replaces a map's state with an encoded one, e.g. from the save journal."""
+        self._maps.pop(map_name, None)
+        self._chunks[map_name] = (bytes(data), zlib.crc32(data))
+
+    def map_names(self):
+        return set(self._chunks) | set(self._maps)
+
+    def to_bytes(self):
+        chunks = dict(self._chunks)
+        for map_name, state in self._maps.items():
+            data = state.encode()
+            chunks[map_name] = (data, zlib.crc32(data))
+
+        index = BinaryWriter()
+        index.pack("H", len(chunks))
+        chunks = sorted(chunks.items())
+        for map_name, (data, checksum) in chunks:
+            index.string(map_name)
+            index.pack("II", len(data), checksum)
+        index = index.getvalue()
+
+        writer = BinaryWriter()
+        writer.raw(WORLD_MAGIC)
+        writer.pack("H", WORLD_VERSION)
+        writer.string(self.current_map)
+        writer.pack("II", self.hazard_cooldown, zlib.crc32(index), field="hazard cooldown")
+        writer.raw(index)
+        for _, (data, _) in chunks:
+            writer.raw(data)
+        return writer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Reads the index of a saved world; the maps themselves are decoded when first used."""
+        data = memoryview(data)
+        reader = BinaryReader(data)
+        if bytes(reader.raw(len(WORLD_MAGIC))) != WORLD_MAGIC:
+            raise SaveFormatError("Not world data")
+        (version,) = reader.unpack("H")
+        if version != WORLD_VERSION:
+            raise SaveFormatError(f"World format version {version} is not supported")
+        world = cls(reader.string())
+        world.hazard_cooldown, index_checksum = reader.unpack("II")
+
+        index_start = reader.offset
+        (count,) = reader.unpack("H")
+        entries = [(reader.string(), *reader.unpack("II")) for _ in range(count)]
+        if zlib.crc32(data[index_start:reader.offset]) != index_checksum:
+            raise SaveFormatError("World index is corrupt")
+        for map_name, size, checksum in entries:
+            world._chunks[map_name] = (reader.raw(size), checksum)
+        return world
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+import save_manager
+from autosave import Autosaver
+from character import Character
+from event_manager import EventManager
+from save_manager import load_game, write_save_file
+from scheduler import Scheduler, TICKS_PER_SECOND
+
+def make_autosaver(tmp_path, **kwargs):
+    player = Character("Hero", x=0, y=0, warrior=3, rogue=3, mage=3)
+    return player, Autosaver(player, str(tmp_path / "save.dat"), **kwargs)
+
+def test_save_writes_a_snapshot_in_the_background(tmp_path):
+    player, autosaver = make_autosaver(tmp_path)
+    autosaver.save()
+    # Changes after save() returns aren't part of that save
+    player.xp = 50
+    assert autosaver.wait(timeout=5)
+    assert load_game(autosaver.filename).xp == 0
+    autosaver.close(timeout=5)
+    assert autosaver.saves_written == 1
+
+def test_failed_write_keeps_the_old_save(tmp_path, monkeypatch):
+    path = tmp_path / "save.dat"
+    write_save_file(b"old", str(path))
+
+    def broken_fsync(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr(save_manager.os, "fsync", broken_fsync)
+    with pytest.raises(OSError):
+        write_save_file(b"new", str(path))
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["save.dat"]
+
+def test_policies(tmp_path):
+    clock, manager = Scheduler(), EventManager()
+    player, autosaver = make_autosaver(tmp_path, scheduler=clock, manager=manager)
+    autosaver.save_every(2)
+    autosaver.save_on("level_up")
+
+    clock.advance(2 * TICKS_PER_SECOND)
+    assert autosaver.wait(timeout=5) and autosaver.saves_written == 1
+    manager.post({"type": "level_up", "level": 2, "character": player})
+    assert autosaver.wait(timeout=5) and autosaver.saves_written == 2
+
+    autosaver.close(timeout=5)
+    clock.advance(4 * TICKS_PER_SECOND)
+    manager.post({"type": "level_up", "level": 3, "character": player})
+    assert autosaver.saves_written == 2
+    assert len(clock) == 0 and manager.listener_counts() == {}
+
+def test_result_reports_whether_a_save_was_written(tmp_path, monkeypatch):
+    player, autosaver = make_autosaver(tmp_path)
+    request = autosaver.save()
+    assert autosaver.wait(timeout=5)
+    assert autosaver.result(request) is True
+
+    def broken_fsync(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr(save_manager.os, "fsync", broken_fsync)
+    request = autosaver.save()
+    assert autosaver.wait(timeout=5)
+    assert autosaver.result(request) is False
+    assert isinstance(autosaver.last_error, OSError)
+
+    monkeypatch.undo()
+    newer = autosaver.save()
+    assert autosaver.wait(timeout=5)
+    assert autosaver.result(request) is True and autosaver.result(newer) is True
+    autosaver.close(timeout=5)
+    assert autosaver.save() is None
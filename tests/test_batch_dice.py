@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from batch_dice import BatchDice, BufferedDie
+from character import Character
+from combat import Combat
+
+def test_batch_roll_shapes_and_range():
+    batch = BatchDice(sides=6, seed=1)
+    rolls = batch.roll(1000)
+    assert rolls.shape == (1000,)
+    assert rolls.min() >= 1 and rolls.max() <= 6
+
+    matrix = batch.roll_matrix(20, 3)
+    assert matrix.shape == (20, 3)
+    assert matrix.min() >= 1 and matrix.max() <= 6
+
+def test_batch_exploding_roll():
+    batch = BatchDice(sides=6, seed=2)
+    totals = batch.exploding_roll(10000)
+    assert totals.min() >= 1
+    # An exploding total can never stop on a multiple of the die size
+    assert not (totals % 6 == 0).any()
+    # Some dice should have exploded in a sample this size
+    assert totals.max() > 6
+
+    assert batch.exploding_roll_matrix(4, 5).shape == (4, 5)
+
+def test_batch_dice_is_reproducible_with_seed():
+    assert BatchDice(seed=42).roll(50).tolist() == BatchDice(seed=42).roll(50).tolist()
+
+def test_buffered_die_serves_batch_rolls():
+    die = BufferedDie(batch=BatchDice(seed=7), buffer_size=8)
+    expected = BatchDice(seed=7).roll(8).tolist()
+    assert [die.roll() for _ in range(8)] == expected
+    # Crossing the end of the buffer refills it transparently
+    assert len(die.rolls(5)) == 5
+    assert len(die.rolls(20)) == 20
+
+def test_character_and_combat_draw_from_buffered_die():
+    char = Character("Test", x=0, y=0, warrior=5, rogue=2, mage=1)
+    char.d6 = BufferedDie(batch=BatchDice(seed=3))
+    char.hp = 1000
+    char.max_hp = 1000
+    damage = char.take_damage("2d6")
+    assert damage >= 2
+    assert char.hp == 1000 - damage
+
+    other = Character("Other", x=0, y=0, warrior=1, rogue=1, mage=1)
+    combat = Combat(char, other)
+    combat.d6 = BufferedDie(batch=BatchDice(seed=3))
+    first, second = combat.determine_initiative()
+    assert {first, second} == {char, other}
@@ -8,7 +8,7 @@ from talents import tough_as_nails, marksman, alertness, scholar, blood_mage
 from items import Weapon, Armor, MagicImplement, all_items
 from effects import Poisoned
 from ritual import Ritual
-from quest import Quest
+from quests import create_quest
 from unittest.mock import patch, MagicMock
 
 def test_character_initialization():
@@ -449,11 +449,11 @@ def test_journal():
     char = Character("Test", x=0, y=0, warrior=1, rogue=1, mage=1)
     assert len(char.journal) == 0
 
-    quest = Quest("Test Quest", "A quest for testing.", [], lambda p: None)
+    quest = create_quest("goblin_menace")
     char.add_quest(quest)
 
     assert len(char.journal) == 1
-    assert char.get_quest("Test Quest") == quest
+    assert char.get_quest("Goblin Menace") == quest
     assert char.get_quest("Non-existent Quest") is None
 
 def test_contribute_to_ritual():
@@ -562,3 +562,12 @@ def test_sustained_spell_penalty(mock_roll):
     success, total = char.attribute_check("mage", ["Thaumaturgy"], 10)
     assert success
     assert total == 10
+
+def test_character_is_headless_and_picklable():
+    import pickle
+    char = Character("Test", x=64, y=32, warrior=3, rogue=3, mage=4)
+    assert not hasattr(char, "__dict__")
+    assert not hasattr(char, "image")
+    clone = pickle.loads(pickle.dumps(char))
+    assert (clone.x, clone.y) == (64, 32)
+    assert clone.max_hp == char.max_hp
@@ -0,0 +1,14 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from character import Character
+from character_sprite import CharacterSprite
+
+def test_sprite_syncs_position_back_to_character():
+    char = Character("Test", x=10, y=20, warrior=3, rogue=3, mage=4)
+    sprite = CharacterSprite(char)
+    assert sprite.rect.topleft == (10, 20)
+    sprite.rect.x += 5
+    sprite.sync()
+    assert (char.x, char.y) == (15, 20)
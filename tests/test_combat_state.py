@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from unittest.mock import patch
+from character import Character
+from combat import Combat
+from combat_state import CombatState
+from dice import Die
+from effects import Poisoned
+from entities import GiantSpider, Skeleton
+from items import all_items
+
+def _fighters():
+    attacker = Character("Attacker", x=0, y=0, warrior=4, rogue=2, mage=0, skills=["Swords"])
+    attacker.inventory.append(all_items["sword"])
+    attacker.equip(all_items["sword"])
+    defender = Character("Defender", x=0, y=0, warrior=3, rogue=3, mage=0)
+    defender.inventory.append(all_items["chain_mail"])
+    defender.equip(all_items["chain_mail"])
+    return attacker, defender
+
+def test_snapshot_extracts_combat_stats():
+    attacker, defender = _fighters()
+    defender.add_status_effect(Poisoned(duration=2))
+    state = CombatState.from_characters([attacker, defender])
+    assert state.combatants[0].hp == attacker.hp
+    assert state.combatants[0].profile.damage == "1d6"
+    assert state.combatants[1].profile.total_defense == defender.total_defense
+    assert state.combatants[1].effects == (("Poisoned", 2, 2, "poison"),)
+
+def test_copy_is_independent():
+    attacker, defender = _fighters()
+    state = CombatState.from_characters([attacker, defender])
+    clone = state.copy()
+    clone.combatants[1].hp -= 5
+    assert state.combatants[1].hp == defender.hp
+    assert clone.combatants[1].profile is state.combatants[1].profile
+
+def test_apply_attack_matches_combat_attack():
+    attacker, defender = _fighters()
+    state = CombatState.from_characters([attacker, defender])
+    rolls = [5, 3]  # attack roll, damage roll
+    with patch('random.randint', side_effect=list(rolls)):
+        expected = Combat(attacker, defender).attack(attacker, defender, attacker.equipped_weapon)
+    with patch('random.randint', side_effect=list(rolls)):
+        result = state.apply_attack(0, 1, Die())
+    assert result == expected
+    assert state.combatants[1].hp == defender.hp
+
+def test_resistance_and_special_attack():
+    attacker, _ = _fighters()
+    skeleton = Skeleton(0, 0)
+    state = CombatState.from_characters([attacker, skeleton])
+    state.combatants[1].take_damage(6, "slashing")
+    assert state.combatants[1].hp == skeleton.hp - 3
+
+    with patch('random.randint', side_effect=[3, 4]):
+        damage = state.apply_special(1, 0, "Fire Spray", Die())
+    assert damage == 7
+    assert state.combatants[0].hp == attacker.hp - 7
+
+def test_spider_poison_and_status_ticks():
+    attacker, _ = _fighters()
+    spider = GiantSpider(0, 0)
+    state = CombatState.from_characters([spider, attacker])
+    # Hit roll 6 explodes into 1, damage 2, poison roll 5
+    with patch('random.randint', side_effect=[6, 1, 2, 5]):
+        success, _, _ = state.apply_attack(0, 1, Die())
+    assert success
+    hp = state.combatants[1].hp
+    assert state.combatants[1].has_effect("Poisoned")
+
+    for _ in range(3):
+        state.tick_status_effects(1)
+    assert state.combatants[1].hp == hp - 6
+    assert state.combatants[1].effects == ()
@@ -2,7 +2,8 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from dice import Die
+import pytest
+from dice import Die, DiceExpression
 from unittest.mock import patch
 
 def test_die_roll():
@@ -31,3 +32,50 @@ def test_exploding_roll_multiple_explosions():
         roll = die.exploding_roll()
         assert roll == 16 # 6 + 6 + 4
         assert mock_randint.call_count == 3
+
+def test_dice_expression_parse():
+    expression = DiceExpression.parse("2d6-1")
+    assert (expression.num_dice, expression.sides, expression.modifier) == (2, 6, -1)
+    assert expression.keep_highest is None
+    assert expression.exploding
+
+    expression = DiceExpression.parse("4d8kh3+2", exploding=False)
+    assert (expression.num_dice, expression.sides, expression.keep_highest, expression.modifier) == (4, 8, 3, 2)
+    assert not expression.exploding
+    assert str(expression) == "4d8kh3+2nx"
+    assert DiceExpression.parse("4d8kh3+2nx") == expression
+
+def test_dice_expression_is_cached():
+    assert DiceExpression.parse("1d6+3") is DiceExpression.parse("1d6+3")
+    assert DiceExpression.parse("1d6") is not DiceExpression.parse("1d6", exploding=False)
+    assert DiceExpression.parse("1d6") == "1d6"
+
+def test_dice_expression_hashes_like_its_notation():
+    expression = DiceExpression.parse("2d6+1")
+    assert expression == "2d6+1"
+    assert hash(expression) == hash("2d6+1")
+    assert "2d6+1" in {expression}
+    assert expression in {"2d6+1": 1}
+
+def test_dice_expression_notation_keeps_the_exploding_flag():
+    exploding = DiceExpression.parse("1d6")
+    plain = DiceExpression.parse("1d6", exploding=False)
+    assert plain != exploding and plain != "1d6"
+    assert {exploding, plain, "1d6"} == {exploding, plain}
+    assert DiceExpression.parse(str(plain)) == plain
+
+def test_dice_expression_invalid():
+    with pytest.raises(ValueError):
+        DiceExpression.parse("d")
+
+def test_dice_expression_roll_uses_die_size():
+    expression = DiceExpression.parse("2d10+1", exploding=False)
+    with patch('random.randint', side_effect=[7, 9]) as mock_randint:
+        assert expression.roll(Die(sides=6)) == 17
+        mock_randint.assert_called_with(1, 10)
+
+def test_dice_expression_keep_highest_and_explode():
+    expression = DiceExpression.parse("3d6kh2")
+    with patch('random.randint', side_effect=[6, 2, 1, 4]):
+        # 6 explodes into 6 + 2, then 1 and 4; keep 8 and 4
+        assert expression.roll(Die()) == 12
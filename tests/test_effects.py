@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from character import Character
+from effects import StatusEffect, Poisoned, REFRESH, STACK
+from modifiers import Modifier
+
+class Blessed(StatusEffect):
+    stack_rule = REFRESH
+    modifiers = (Modifier("defense", 1),)
+
+    def __init__(self, duration):
+        super().__init__("Blessed", duration)
+
+class Bleeding(StatusEffect):
+    stack_rule = STACK
+
+    def __init__(self, duration):
+        super().__init__("Bleeding", duration)
+
+def make_character():
+    return Character("Test", x=0, y=0, warrior=5, rogue=3, mage=1)
+
+def test_tick_expires_effects_in_one_pass():
+    char = make_character()
+    char.add_status_effect(Poisoned(duration=1))
+    char.add_status_effect(Blessed(duration=3))
+
+    events = char.status_effects.tick()
+    assert [event.effect.name for event in events] == ["Poisoned"]
+    assert str(events[0]) == "Poisoned has worn off for Test."
+    assert char.hp == char.max_hp - 2
+    assert char.get_status_effect("Blessed").duration == 2
+    assert len(char.status_effects) == 1
+
+def test_duplicate_effects_are_ignored_by_default():
+    char = make_character()
+    first = Poisoned(duration=3)
+    char.add_status_effect(first)
+    char.add_status_effect(Poisoned(duration=5))
+    assert char.get_status_effect("Poisoned") is first
+    assert first.duration == 3
+
+def test_refresh_restarts_duration_and_keeps_modifiers():
+    char = make_character()
+    base_defense = char.total_defense
+    char.add_status_effect(Blessed(duration=2))
+    assert char.total_defense == base_defense + 1
+
+    char.status_effects.tick()
+    char.add_status_effect(Blessed(duration=2))
+    assert char.status_effects.tick() == []
+    assert char.get_status_effect("Blessed").duration == 1
+
+    assert len(char.status_effects.tick()) == 1
+    assert char.total_defense == base_defense
+
+def test_stack_counts_and_keeps_longer_duration():
+    char = make_character()
+    char.add_status_effect(Bleeding(duration=3))
+    char.add_status_effect(Bleeding(duration=1))
+    bleeding = char.get_status_effect("Bleeding")
+    assert bleeding.stacks == 2
+    assert bleeding.duration == 3
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from unittest.mock import patch
+from character import Character
+from encounter import Encounter
+from entities import Bandit, BanditLeader, Goblin
+from rng import RNGService
+
+def _hero(name, hp=20):
+    hero = Character(name, x=0, y=0, warrior=4, rogue=2, mage=0, skills=["Swords"])
+    hero.hp = hero.max_hp = hp
+    return hero
+
+@patch('dice.Die.roll')
+def test_turn_order_follows_initiative(mock_roll):
+    mock_roll.side_effect = [2, 5, 3]
+    slow, fast, middle = _hero("Slow"), _hero("Fast"), _hero("Middle")
+    encounter = Encounter([[slow, fast], [middle]])
+    assert encounter.turn_order() == [fast, middle, slow]
+
+@patch('dice.Die.roll')
+def test_ties_are_resolved_without_rerolling(mock_roll):
+    mock_roll.return_value = 4
+    heroes = [_hero(f"Hero {i}") for i in range(30)]
+    encounter = Encounter([heroes[:15], heroes[15:]])
+    # One initiative roll per combatant, no rerolls
+    assert mock_roll.call_count == 30
+    assert sorted(encounter.turn_order(), key=id) == sorted(heroes, key=id)
+
+def test_every_combatant_acts_once_per_round():
+    heroes = [_hero(f"Hero {i}", hp=1000) for i in range(6)]
+    encounter = Encounter([heroes[:3], heroes[3:]], rng=RNGService(3))
+    actors = [encounter.next_actor() for _ in range(6)]
+    assert sorted(actors, key=id) == sorted(heroes, key=id)
+    assert encounter.round == 1
+    encounter.next_actor()
+    assert encounter.round == 2
+
+def test_choose_target_is_used():
+    picked = []
+    def first_enemy(encounter, actor, enemies):
+        picked.append(enemies[0])
+        return enemies[0]
+
+    hero = _hero("Hero")
+    goblin = Goblin(0, 0)
+    rng = RNGService(1)
+    for member in (hero, goblin):
+        member.set_rng(rng)
+    encounter = Encounter([[hero], [goblin]], rng=rng, choose_target=first_enemy)
+    encounter.take_turn()
+    encounter.take_turn()
+    assert set(picked) == {hero, goblin}
+
+def test_group_fight_runs_to_completion():
+    rng = RNGService(8)
+    heroes = [_hero(f"Hero {i}", hp=30) for i in range(4)]
+    camp = [BanditLeader(0, 0), Bandit(0, 0), Bandit(0, 0)]
+    for member in heroes + camp:
+        member.set_rng(rng)
+    encounter = Encounter([heroes, camp], rng=rng)
+    winner = encounter.run()
+    assert winner in (0, 1)
+    assert encounter.is_over
+    assert encounter.living(1 - winner) == []
@@ -0,0 +1,107 @@
+import sys
+import os
+import gc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from event_manager import EventManager
+
+class Listener:
+    def __init__(self):
+        self.events = []
+
+    def update(self, event):
+        self.events.append(event)
+
+def test_bound_method_listeners_are_weak():
+    manager = EventManager()
+    listener = Listener()
+    manager.subscribe("ping", listener.update)
+    assert manager.listener_counts() == {"ping": 1}
+
+    del listener
+    gc.collect()
+    manager.post({"type": "ping"})
+    assert manager.listener_counts() == {}
+
+def test_subscribing_twice_is_a_no_op():
+    manager = EventManager()
+    listener = Listener()
+    first = manager.subscribe("ping", listener.update)
+    assert manager.subscribe("ping", listener.update) is first
+    manager.post({"type": "ping"})
+    assert len(listener.events) == 1
+
+def test_unsubscribe_handle_and_owner():
+    manager = EventManager()
+    owner = Listener()
+    seen = []
+    handle = manager.subscribe("ping", seen.append)
+    manager.subscribe("ping", Listener().update, owner=owner)
+    kept = Listener()
+    manager.subscribe("pong", kept.update, owner=owner)
+
+    handle.unsubscribe()
+    manager.post({"type": "ping"})
+    assert seen == []
+
+    manager.unsubscribe_owner(owner)
+    assert manager.listener_counts() == {}
+
+def test_listener_can_unsubscribe_while_dispatching():
+    manager = EventManager()
+    calls = []
+    handles = []
+    def once(event):
+        calls.append(event)
+        handles[0].unsubscribe()
+    handles.append(manager.subscribe("ping", once))
+    manager.post({"type": "ping"})
+    manager.post({"type": "ping"})
+    assert len(calls) == 1
+
+def test_queued_events_wait_for_flush():
+    manager = EventManager(queued=True)
+    listener = Listener()
+    manager.subscribe("ping", listener.update)
+    manager.post({"type": "ping"})
+    assert listener.events == []
+    assert manager.flush() == 1
+    assert len(listener.events) == 1
+
+def test_queued_events_with_a_rule_are_coalesced():
+    manager = EventManager(queued=True)
+    manager.add_coalescing_rule("moved", lambda event: event["who"], lambda pending, event: event)
+    listener = Listener()
+    manager.subscribe("moved", listener.update)
+    for x in range(5):
+        manager.post({"type": "moved", "who": "player", "x": x})
+    manager.post({"type": "moved", "who": "goblin", "x": 9})
+    manager.flush()
+    assert [(event["who"], event["x"]) for event in listener.events] == [("player", 4), ("goblin", 9)]
+
+def test_queued_inventory_updates_keep_every_change():
+    from character import Character
+    from items import all_items
+    manager = EventManager(queued=True)
+    listener = Listener()
+    manager.subscribe("inventory_updated", listener.update)
+    char = Character("Test", x=0, y=0, warrior=3, rogue=3, mage=3)
+    heirloom = all_items["stolen_heirloom"]
+    # Picked up and handed over in the same frame; a collect objective must still see the pickup
+    manager.post({"type": "inventory_updated", "item": heirloom, "count": 1, "character": char})
+    manager.post({"type": "inventory_updated", "item": heirloom, "count": -1, "character": char})
+    manager.flush()
+    assert [event["count"] for event in listener.events] == [1, -1]
+
+def test_events_posted_during_flush_are_dispatched_in_the_same_flush():
+    manager = EventManager(queued=True)
+    seen = []
+    def chain(event):
+        seen.append(event["type"])
+        if event["type"] == "ping":
+            manager.post({"type": "pong"})
+    manager.subscribe("ping", chain)
+    manager.subscribe("pong", chain)
+    manager.post({"type": "ping"})
+    assert manager.flush() == 2
+    assert seen == ["ping", "pong"]
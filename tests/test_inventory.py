@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from inventory import Inventory
+from items import all_items
+from character import Character
+from event_manager import event_manager
+
+def test_identical_items_stack():
+    potion = all_items["health_potion"]
+    inventory = Inventory([potion, all_items["sword"], potion])
+    assert len(inventory) == 3
+    assert inventory.count(potion) == 2
+    assert inventory.count("Sword") == 1
+    assert inventory.stacks() == [(potion, 2), (all_items["sword"], 1)]
+    assert list(inventory) == [potion, potion, all_items["sword"]]
+
+def test_remove_and_contains():
+    potion = all_items["health_potion"]
+    inventory = Inventory([potion, potion])
+    inventory.remove(potion)
+    assert potion in inventory
+    assert "Health Potion" in inventory
+    inventory.remove(potion)
+    assert potion not in inventory
+    with pytest.raises(ValueError):
+        inventory.remove(potion)
+    assert inventory.remove_named("Health Potion") is None
+
+def test_listeners_see_every_change():
+    changes = []
+    inventory = Inventory()
+    inventory.subscribe(lambda item, delta: changes.append((item.name, delta)))
+    inventory.add(all_items["health_potion"], 3)
+    inventory.remove_named("Health Potion", 2)
+    assert changes == [("Health Potion", 3), ("Health Potion", -2)]
+
+def test_character_posts_inventory_updated():
+    events = []
+    subscription = event_manager.subscribe("inventory_updated", events.append)
+    char = Character("Test", x=0, y=0, warrior=3, rogue=3, mage=3)
+    char.add_item_to_inventory(all_items["health_potion"])
+    assert events == [] # Only characters that opt in, i.e. the player, post
+    char.post_inventory_events()
+    char.add_item_to_inventory(all_items["sword"])
+    assert char.remove_item_from_inventory("Sword")
+    char.post_inventory_events(False)
+    char.add_item_to_inventory(all_items["sword"])
+    assert [(event["character"], event["count"]) for event in events] == [(char, 1), (char, -1)]
+    subscription.unsubscribe()
@@ -6,7 +6,7 @@ import pygame
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from tilemap import Map, HazardTile
+from tilemap import Map, HazardTile, Camera, WALL_COLOR, FIRE_COLOR
 
 @pytest.fixture
 def temp_map_file(tmp_path):
@@ -46,3 +46,45 @@ def test_hazard_tile_properties(temp_map_file):
     assert isinstance(hazard_tile, HazardTile)
     assert hazard_tile.damage == "1d6"
     assert hazard_tile.damage_type == "fire"
+
+def test_only_visible_chunks_are_drawn(tmp_path):
+    """A big map only renders and blits the chunks under the viewport."""
+    rows = ["." * 100 for _ in range(100)]
+    rows[40] = "." * 40 + "#F" + "." * 58
+    map_file = tmp_path / "big_map.txt"
+    map_file.write_text("\n".join(rows))
+    game_map = Map(str(map_file))
+
+    # 800x600 pixels at (1200, 1200) is tiles 37-62 by 37-55: chunks 2-3 by 2-3
+    camera = Camera(game_map.width, game_map.height)
+    camera.camera.topleft = (-1200, -1200)
+    screen = pygame.Surface((800, 600))
+    game_map.draw(screen, camera)
+    assert sorted(game_map.chunks) == [(2, 2), (2, 3), (3, 2), (3, 3)]
+
+    # Tile (40, 40) is a wall, (41, 40) is fire; 40 tiles = chunk 2, offset 8
+    chunk = game_map.chunks[(2, 2)]
+    assert chunk.get_at((8 * 32 + 1, 8 * 32 + 1))[:3] == WALL_COLOR
+    assert chunk.get_at((9 * 32 + 1, 8 * 32 + 1))[:3] == FIRE_COLOR
+    assert screen.get_at((40 * 32 + 1 - 1200, 40 * 32 + 1 - 1200))[:3] == WALL_COLOR
+
+    # The edge chunk of a 100-tile map holds the last 4 tiles
+    assert game_map.get_chunk(6, 6).get_size() == (4 * 32, 4 * 32)
+
+def test_chunk_cache_is_bounded(tmp_path):
+    """Exploring a big map keeps at most max_chunks rendered, dropping the farthest."""
+    map_file = tmp_path / "huge_map.txt"
+    map_file.write_text("\n".join("." * 320 for _ in range(32)))
+    game_map = Map(str(map_file))
+    game_map.max_chunks = 6
+    camera = Camera(game_map.width, game_map.height)
+    screen = pygame.Surface((800, 600))
+
+    # Walk east along the top of the map, one chunk at a time
+    for step in range(15):
+        camera.camera.topleft = (-step * game_map.chunk_size, 0)
+        game_map.draw(screen, camera)
+        assert len(game_map.chunks) <= game_map.max_chunks
+
+    # The view (chunks 14-15 by 0-1) and its nearest neighbours are kept; the far west is gone
+    assert set(game_map.chunks) == {(x, y) for x in (13, 14, 15) for y in (0, 1)}
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from modifiers import Modifier, ModifierStack, ModifiedStats, SET
+from character import Character
+from talents import tough_as_nails, no_talent_for_magic, exceptional_attribute_mage
+from items import all_items
+
+def test_stack_adds_and_removes_by_source():
+    stack = ModifierStack()
+    stack.add("ring", Modifier("defense", 1))
+    stack.add("cloak", Modifier("defense", 2), Modifier("lore", 1))
+    assert stack.apply("defense", 5) == 8
+    assert stack.total("lore") == 1
+
+    assert stack.remove("cloak")
+    assert stack.apply("defense", 5) == 6
+    assert stack.total("lore") == 0
+    assert not stack.remove("cloak")
+
+def test_set_overrides_adds():
+    stack = ModifierStack()
+    stack.add("amulet", Modifier("mage", 2))
+    stack.add("curse", Modifier("mage", 0, SET))
+    assert stack.apply("mage", 4) == 0
+    stack.remove("curse")
+    assert stack.apply("mage", 4) == 6
+
+def test_modified_stats_writes_to_base():
+    stack = ModifierStack()
+    stats = ModifiedStats({"mage": 3}, stack)
+    stack.add("talent", Modifier("mage", 1))
+    stats["mage"] += 1
+    assert stats["mage"] == 5
+    stack.remove("talent")
+    assert stats["mage"] == 4
+
+def test_talents_are_reversible():
+    char = Character("Test", x=0, y=0, warrior=3, rogue=3, mage=3)
+    char.add_talent(tough_as_nails)
+    char.add_talent(exceptional_attribute_mage)
+    assert char.max_hp == 11 and char.hp == 11
+    assert char.attributes["mage"] == 4
+
+    char.remove_talent(tough_as_nails)
+    char.remove_talent(exceptional_attribute_mage)
+    assert char.max_hp == 9 and char.hp == 9
+    assert char.attributes["mage"] == 3
+
+def test_no_talent_for_magic_is_reversible():
+    char = Character("Dwarf", x=0, y=0, warrior=3, rogue=3, mage=2, talents=[no_talent_for_magic])
+    assert char.attributes["mage"] == 0
+    assert char.max_mana == 0 and char.mana == 0
+
+    char.remove_talent(no_talent_for_magic)
+    assert char.attributes["mage"] == 2
+    assert char.max_mana == 4
+
+def test_armor_modifiers_follow_equipment():
+    char = Character("Test", x=0, y=0, warrior=3, rogue=2, mage=3)
+    armor = all_items["leather_armor"]
+    char.inventory.append(armor)
+    char.equip(armor)
+    assert char.spell_cost_penalty == armor.armor_penalty
+    char.unequip(armor)
+    assert char.spell_cost_penalty == 0
+    assert char.modifiers.sources() == []
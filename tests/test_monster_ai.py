@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import time
+import pytest
+from character import Character
+from combat import Combat
+from combat_state import CombatState
+from dice import DiceExpression
+from entities import Bandit, Drake, GiantRat, Goblin
+from monster_ai import MonsterAI, choose_monster_action, damage_buckets
+
+def _player(rogue=3):
+    player = Character("Player", x=0, y=0, warrior=4, rogue=rogue, mage=3, skills=["Swords"])
+    return player
+
+def test_damage_buckets_cover_the_distribution():
+    buckets = damage_buckets(DiceExpression.parse("2d6"))
+    assert len(buckets) <= 3
+    assert sum(prob for prob, _ in buckets) == pytest.approx(1.0)
+    damages = [damage for _, damage in buckets]
+    assert damages == sorted(damages)
+
+def test_single_action_monster_skips_search():
+    assert choose_monster_action(Goblin(0, 0), _player()) == "attack"
+
+def test_drake_breathes_fire_when_claws_cannot_hit():
+    player = _player()
+    player.defense = 40
+    assert choose_monster_action(Drake(0, 0), player, budget=None) == "Fire Spray"
+
+def test_drake_attacks_a_fire_immune_target():
+    player = _player()
+    player.damage_resistances = {"fire": 1.0}
+    assert choose_monster_action(Drake(0, 0), player, budget=None) == "attack"
+
+def test_dying_rat_flees():
+    rat = GiantRat(0, 0)
+    rat.hp = 1
+    # A clumsy player, so the wounded rat has a chance to get away
+    assert choose_monster_action(rat, _player(rogue=1), budget=None) == "flee"
+
+def test_healthy_monsters_stand_their_ground():
+    for monster in (GiantRat(0, 0), Bandit(0, 0)):
+        for rogue in range(4):
+            assert choose_monster_action(monster, _player(rogue), budget=None) == "attack"
+
+def test_search_respects_time_budget():
+    drake = Drake(0, 0)
+    state = CombatState.from_characters([drake, _player()])
+    ai = MonsterAI(drake.ai_actions, max_depth=50, budget=0.002)
+    start = time.perf_counter()
+    ai.choose_action(state, 0, 1)
+    assert time.perf_counter() - start < 0.05
+    assert ai.depth_reached < 50
+
+def test_combat_resolves_flee():
+    rat = GiantRat(0, 0)
+    rat.hp = 1
+    player = _player(rogue=1)
+    combat = Combat(player, rat, monster_ai=choose_monster_action)
+    combat.ai_budget = None
+    for _ in range(50):
+        combat.monster_turn(rat, player)
+        if combat.fled:
+            break
+    assert combat.fled is rat
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from character import Character
+from dice import DiceExpression
+from probability import (die_pmf, check_pmf, check_success_probability,
+                         attribute_check_probability, damage_pmf, expected_value)
+
+def test_plain_die_pmf():
+    pmf = die_pmf(6)
+    assert list(pmf) == [1, 2, 3, 4, 5, 6]
+    assert sum(pmf.values()) == pytest.approx(1.0)
+
+def test_exploding_die_pmf():
+    pmf = die_pmf(6, exploding=True, epsilon=1e-12)
+    assert 6 not in pmf and 12 not in pmf
+    assert pmf[7] == pytest.approx(1 / 36)
+    assert sum(pmf.values()) == pytest.approx(1.0, abs=1e-10)
+    # The mean of an exploding d6 is 3.5 * 6/5 = 4.2
+    assert expected_value(pmf) == pytest.approx(4.2, abs=1e-8)
+
+def test_check_success_probability():
+    # Without a skill: d6 + 5 >= 9 needs a 4, 5 or 6
+    assert check_success_probability(5, False, 9) == pytest.approx(0.5)
+    # With a skill, +7 vs DL 13 needs a 6 that explodes into at least 0 more
+    assert check_success_probability(7, True, 13) == pytest.approx(1 / 6, abs=1e-8)
+    assert check_success_probability(7, True, 14) == pytest.approx(1 / 6, abs=1e-8)
+    assert check_success_probability(7, True, 15) == pytest.approx(5 / 36, abs=1e-8)
+
+def test_attribute_check_probability_matches_character_modifiers():
+    char = Character("Test", x=0, y=0, warrior=4, rogue=2, mage=1, skills=["Swords"])
+    # d6 + 4 + 2 >= 10 needs a 4+
+    assert attribute_check_probability(char, "warrior", ["Swords"], 10) == pytest.approx(0.5)
+    assert check_pmf(6, True) is check_pmf(6, True)
+
+    char.hp = 3  # seriously wounded: -3, so only an exploding 6 reaches 10
+    assert attribute_check_probability(char, "warrior", ["Swords"], 10) == pytest.approx(1 / 6, abs=1e-8)
+    assert attribute_check_probability(char, "warrior", ["Swords"], 13) == pytest.approx(1 / 6 * 3 / 6, abs=1e-8)
+
+def test_damage_pmf():
+    pmf = damage_pmf(DiceExpression.parse("1d6", exploding=False), damage_bonus=2)
+    assert list(pmf) == [3, 4, 5, 6, 7, 8]
+
+    pmf = damage_pmf(DiceExpression.parse("2d6", exploding=False))
+    assert pmf[7] == pytest.approx(6 / 36)
+
+    pmf = damage_pmf("1d6")
+    assert expected_value(pmf) == pytest.approx(4.2, abs=1e-6)
+    assert damage_pmf("1d6") is pmf
+
+def test_damage_pmf_cache_keeps_exploding_and_plain_dice_apart():
+    exploding = damage_pmf("1d6", damage_bonus=2)
+    plain = damage_pmf(DiceExpression.parse("1d6", exploding=False), damage_bonus=2)
+    assert plain is not exploding
+    assert max(plain) == 8
+    assert max(exploding) > 8
+
+def test_damage_pmf_keep_highest_and_resistance():
+    pmf = damage_pmf(DiceExpression.parse("2d6kh1", exploding=False))
+    assert pmf[6] == pytest.approx(11 / 36)
+    assert pmf[1] == pytest.approx(1 / 36)
+
+    pmf = damage_pmf(DiceExpression.parse("1d6", exploding=False), resistance=0.5)
+    assert pmf == {0: pytest.approx(1 / 6), 1: pytest.approx(2 / 6), 2: pytest.approx(2 / 6), 3: pytest.approx(1 / 6)}
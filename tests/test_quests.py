@@ -0,0 +1,116 @@
+import sys
+import os
+import json
+import pickle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from quests import QuestCatalog, QuestFormatError, QuestProgress, create_quest, quest_catalog
+from character import Character
+from event_manager import EventManager
+from items import all_items
+
+def test_shipped_quests_are_valid():
+    definitions = {definition.id: definition for definition in quest_catalog.validate_all()}
+    heirloom = definitions["stolen_heirloom"]
+    assert heirloom.title == "The Stolen Heirloom"
+    assert [objective.kind for objective in heirloom.objectives] == ["kill", "collect"]
+    assert definitions["goblin_menace"].rewards[0].count == 100
+
+def test_catalog_compiles_files_on_first_reference(tmp_path):
+    (tmp_path / "broken.toml").write_text("title = ")
+    (tmp_path / "rats.json").write_text(json.dumps({
+        "title": "Rats!", "description": "Clear the cellar.",
+        "objectives": [{"kind": "kill", "description": "Kill 3 rats", "target": "Giant Rat", "count": 3}],
+    }))
+    catalog = QuestCatalog(str(tmp_path))
+    assert sorted(catalog.ids()) == ["broken", "rats"]
+    # Only the quest that is asked for gets parsed
+    assert catalog.get("rats").objectives[0].count == 3
+    with pytest.raises(QuestFormatError):
+        catalog.get("broken")
+    with pytest.raises(KeyError):
+        catalog.get("missing")
+
+@pytest.mark.parametrize("objective", [
+    {"kind": "slay", "description": "?", "target": "Goblin"},
+    {"kind": "kill", "description": "No target"},
+    {"kind": "kill", "description": "Bad count", "target": "Goblin", "count": 0},
+    {"kind": "kill", "description": "Too many", "target": "Goblin", "count": 0x10000},
+    {"kind": "collect", "description": "Unknown item", "item": "holy_grail"},
+])
+def test_invalid_objectives_are_rejected(tmp_path, objective):
+    (tmp_path / "bad.json").write_text(json.dumps({"title": "Bad", "description": "Bad.", "objectives": [objective]}))
+    with pytest.raises(QuestFormatError):
+        QuestCatalog(str(tmp_path)).get("bad")
+
+def test_progress_records_share_one_definition():
+    first, second = create_quest("goblin_menace"), create_quest("goblin_menace")
+    assert first.definition is second.definition
+
+    manager = EventManager()
+    first.subscribe(manager)
+    manager.post({"type": "monster_killed", "name": "Orc"})
+    assert first.counters[0] == 0
+    manager.post({"type": "monster_killed", "name": "Goblin"})
+    assert first.is_complete and not second.is_complete
+    assert first.objectives[0].is_complete
+    # A finished quest stops listening
+    assert manager.listener_counts() == {}
+
+    player = Character("Test", x=0, y=0, warrior=3, rogue=3, mage=3)
+    first.give_reward(player)
+    assert player.level == 2 # 100 XP is exactly one level
+    assert player.has_item("Health Potion")
+
+def test_progress_counts_up_and_saves_compactly(tmp_path):
+    (tmp_path / "rats.json").write_text(json.dumps({
+        "title": "Rats!", "description": "Clear the cellar.",
+        "objectives": [
+            {"kind": "kill", "description": "Kill 3 rats", "target": "Giant Rat", "count": 3},
+            {"kind": "level", "description": "Reach level 2", "level": 2},
+        ],
+    }))
+    progress = QuestProgress(QuestCatalog(str(tmp_path)).get("rats"))
+    for _ in range(5):
+        progress.update({"type": "monster_killed", "name": "Giant Rat"})
+    assert list(progress.counters) == [3, 0]
+    assert progress.completed == 0b01 and not progress.is_complete
+    progress.update({"type": "level_up", "level": 2})
+    assert progress.is_complete
+
+    heirloom = create_quest("stolen_heirloom")
+    manager = EventManager()
+    heirloom.subscribe(manager)
+    manager.post({"type": "inventory_updated", "item": all_items["stolen_heirloom"], "count": 1, "character": None})
+    assert heirloom.objectives[1].is_complete
+
+    saved = pickle.dumps(create_quest("stolen_heirloom"))
+    assert len(saved) < 120
+    restored = pickle.loads(saved)
+    assert restored.definition is quest_catalog.get("stolen_heirloom")
+    assert list(restored.counters) == [0, 0]
+
+def test_objectives_only_see_their_events():
+    heirloom = create_quest("stolen_heirloom")
+    manager = EventManager()
+    heirloom.subscribe(manager)
+    assert manager.listener_counts() == {("monster_killed", "Bandit Leader"): 1, ("inventory_updated", "Stolen Heirloom"): 1}
+
+    manager.post({"type": "monster_killed", "name": "Goblin"})
+    manager.post({"type": "monster_killed", "name": "Bandit Leader"})
+    assert heirloom.objectives[0].is_complete and not heirloom.is_complete
+    # Finished objectives drop their subscription
+    assert manager.listener_counts() == {("inventory_updated", "Stolen Heirloom"): 1}
+
+def test_collect_objective_sees_the_players_pickups():
+    from event_manager import event_manager
+    quest = create_quest("stolen_heirloom")
+    quest.subscribe(event_manager)
+    player = Character("Test Player", 0, 0, 1, 1, 1)
+    player.post_inventory_events()
+
+    player.add_item_to_inventory(all_items["sword"])
+    assert not quest.objectives[1].is_complete
+    player.add_item_to_inventory(all_items["stolen_heirloom"])
+    assert quest.objectives[1].is_complete
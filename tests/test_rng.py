@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rng import RNGService, DICE, LOOT, AI
+from character import Character
+from combat import Combat
+from entities import Bandit
+from items import all_items
+
+def test_streams_are_reproducible():
+    first = RNGService(seed=123)
+    second = RNGService(seed=123)
+    # Using streams in a different order must not change their contents
+    loot = [second.stream(LOOT).random() for _ in range(5)]
+    dice = [second.stream(DICE).random() for _ in range(5)]
+    assert [first.stream(DICE).random() for _ in range(5)] == dice
+    assert [first.stream(LOOT).random() for _ in range(5)] == loot
+
+def test_streams_are_independent():
+    service = RNGService(seed=1)
+    assert service.stream(DICE) is service.stream(DICE)
+    assert service.stream(DICE).random() != service.stream(AI).random()
+
+def test_spawned_children_are_deterministic_and_distinct():
+    parent = RNGService(seed=99)
+    assert parent.spawn(0).seed == RNGService(seed=99).spawn(0).seed
+    assert parent.spawn(0).seed != parent.spawn(1).seed
+
+def _run_fight(seed):
+    rng = RNGService(seed)
+    attacker = Character("Attacker", x=0, y=0, warrior=4, rogue=2, mage=0, skills=["Swords"], rng=rng)
+    bandit = Bandit(x=0, y=0)
+    bandit.set_rng(rng)
+    combat = Combat(attacker, bandit, rng=rng)
+    log = []
+    for _ in range(5):
+        log.append(combat.attack(attacker, bandit, all_items["sword"]))
+    log.append(bandit.drop_loot().name)
+    return log
+
+def test_injected_streams_reproduce_a_fight():
+    assert _run_fight(7) == _run_fight(7)
@@ -0,0 +1,135 @@
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+import save_codec
+import save_manager
+from save_codec import SaveFormatError, character_state, decode_character, decode_state, encode_character, encode_state
+from save_manager import load_game, save_game
+from character import Character
+from effects import Poisoned
+from items import all_items
+from quests import create_quest
+from spells import all_spells
+from talents import all_talents
+
+def make_player():
+    player = Character("Hero", 320, 256, 4, 3, 2, skills=["Swords", "Thaumaturgy", "Perception"],
+                       talents=[all_talents["tough_as_nails"], all_talents["scholar"]])
+    player.spellbook.append(all_spells["magic_light"])
+    player.add_item_to_inventory(all_items["sword"])
+    player.add_item_to_inventory(all_items["leather_armor"])
+    player.add_item_to_inventory(all_items["health_potion"])
+    player.add_item_to_inventory(all_items["health_potion"])
+    player.equip(all_items["sword"])
+    player.equip(all_items["leather_armor"])
+    quest = create_quest("stolen_heirloom")
+    quest.update({"type": "monster_killed", "name": "Bandit Leader"})
+    player.add_quest(quest)
+    player.add_status_effect(Poisoned(duration=3, damage=1))
+    player.add_xp(40)
+    player.hp -= 2
+    return player
+
+def test_round_trip_keeps_state():
+    player = make_player()
+    loaded = decode_character(encode_character(player))
+
+    assert (loaded.name, loaded.x, loaded.y) == ("Hero", 320, 256)
+    assert loaded.attributes.base == player.attributes.base
+    assert (loaded.hp, loaded.max_hp, loaded.mana, loaded.max_mana, loaded.fate) == \
+           (player.hp, player.max_hp, player.mana, player.max_mana, player.fate)
+    assert (loaded.level, loaded.xp, loaded.total_defense) == (player.level, player.xp, player.total_defense)
+    assert loaded.talents == player.talents and loaded.spellbook == player.spellbook
+    assert loaded.inventory.stacks() == player.inventory.stacks()
+    assert loaded.equipped_weapon is all_items["sword"]
+    assert loaded.equipped_body_armor is all_items["leather_armor"]
+
+    quest = loaded.get_quest("The Stolen Heirloom")
+    assert [objective.is_complete for objective in quest.objectives] == [True, False]
+    poison = loaded.get_status_effect("Poisoned")
+    assert (poison.duration, poison.damage) == (3, 1)
+
+def test_save_is_much_smaller_than_pickle():
+    player = make_player()
+    assert len(encode_character(player)) * 5 < len(pickle.dumps(player))
+
+def test_rejects_bad_data():
+    data = encode_character(make_player())
+    with pytest.raises(SaveFormatError):
+        decode_state(b"not a save")
+    with pytest.raises(SaveFormatError):
+        decode_state(data[:-3])
+    newer = save_codec.HEADER.pack(save_codec.MAGIC, save_codec.SAVE_VERSION + 1) + data[save_codec.HEADER.size:]
+    with pytest.raises(SaveFormatError):
+        decode_state(newer)
+
+def test_values_that_overflow_the_format_are_refused():
+    player = make_player()
+    player.xp = 2 ** 32
+    with pytest.raises(SaveFormatError, match="level and xp"):
+        encode_character(player)
+
+    state = character_state(make_player())
+    state["inventory"] = [("health_potion", 70000)]
+    with pytest.raises(SaveFormatError, match="count of item 'health_potion'"):
+        encode_state(state)
+
+def test_older_versions_are_migrated(monkeypatch):
+    data = encode_character(make_player())
+    # Pretend the next format version added a field
+    version = save_codec.SAVE_VERSION
+    monkeypatch.setattr(save_codec, "SAVE_VERSION", version + 1)
+    monkeypatch.setitem(save_codec.MIGRATIONS, version, lambda state: dict(state, title="the Brave"))
+    state = decode_state(data)
+    assert state["title"] == "the Brave" and state["name"] == "Hero"
+
+def test_version_1_saves_load_without_sustained_spells():
+    data = encode_character(make_player())
+    # Version 1 is version 2 without the trailing count of sustained spells
+    v1 = save_codec.HEADER.pack(save_codec.MAGIC, 1) + data[save_codec.HEADER.size:-2]
+    loaded = decode_character(v1)
+    assert loaded.name == "Hero" and loaded.sustained_spells == []
+
+def test_sustained_spells_keep_their_remaining_time():
+    from scheduler import scheduler
+    player = make_player()
+    light = all_spells["magic_light"]
+    player.sustain_spell(light, 100)
+    scheduler.advance(40)
+    loaded = decode_character(encode_character(player))
+    player.dismiss_sustained_spells()
+
+    assert loaded.sustained_spells == [light]
+    assert loaded.get_sustained_penalty() == -1
+    assert loaded.spell_time_left(light) == 60
+    scheduler.advance(60)
+    assert loaded.sustained_spells == []
+
+def test_pickled_characters_keep_their_spell_timers():
+    from scheduler import scheduler
+    player = make_player()
+    light = all_spells["magic_light"]
+    player.sustain_spell(light, 100)
+    clone = pickle.loads(pickle.dumps(player))
+    player.dismiss_sustained_spells()
+
+    assert clone.spell_timers[clone.sustained_spells[0]].active
+    scheduler.advance(100)
+    assert clone.sustained_spells == []
+
+def test_load_game_refuses_pickles(tmp_path):
+    player = make_player()
+    legacy = tmp_path / "legacy.dat"
+    legacy.write_bytes(pickle.dumps(player))
+    assert load_game(str(legacy)) is None
+
+    # So is anything else that isn't a slot file
+    legacy.write_bytes(encode_character(player))
+    assert load_game(str(legacy)) is None
+
+    save_game(player, str(legacy))
+    assert legacy.read_bytes().startswith(save_manager.FILE_MAGIC)
+    assert load_game(str(legacy)).level == player.level
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from autosave import Autosaver
+from character import Character
+from event_manager import EventManager
+from items import all_items
+from quests import create_quest
+from save_journal import SaveJournal, segment_generations, segment_path
+from save_manager import load_game, save_game
+from scheduler import Scheduler
+
+def start_game(tmp_path):
+    path = str(tmp_path / "slot1.sav")
+    player = Character("Hero", x=0, y=0, warrior=3, rogue=3, mage=3)
+    player.add_item_to_inventory(all_items["health_potion"])
+    save_game(player, path)
+    return path, player, SaveJournal(path, player)
+
+def play_a_little(player):
+    player.hp -= 3
+    player.fate -= 1
+    player.add_xp(40)
+    player.add_item_to_inventory(all_items["sword"])
+    player.equip(all_items["sword"])
+    player.remove_item_from_inventory("Health Potion")
+    quest = create_quest("goblin_menace")
+    player.add_quest(quest)
+    quest.update({"type": "monster_killed", "name": "Goblin"})
+
+def test_replay_recovers_changes_since_the_save(tmp_path):
+    path, player, journal = start_game(tmp_path)
+    assert journal.commit() == 0
+    play_a_little(player)
+    assert journal.commit() > 0
+    # The game crashes here: no save, no close()
+
+    loaded = load_game(path)
+    assert (loaded.hp, loaded.fate, loaded.xp) == (player.hp, player.fate, player.xp)
+    assert loaded.inventory.stacks() == player.inventory.stacks()
+    assert loaded.equipped_weapon is all_items["sword"]
+    assert loaded.get_quest("Goblin Menace").is_complete
+
+def test_torn_record_is_ignored(tmp_path):
+    path, player, journal = start_game(tmp_path)
+    player.hp -= 1
+    journal.commit()
+    player.hp -= 1
+    journal.commit()
+    journal.close()
+    segment = segment_path(path, journal.generation)
+    with open(segment, "r+b") as f:
+        f.truncate(os.path.getsize(segment) - 2)
+    assert load_game(path).hp == player.hp + 1
+
+def test_snapshot_compacts_the_journal(tmp_path):
+    path, player, journal = start_game(tmp_path)
+    autosaver = Autosaver(player, path, scheduler=Scheduler(), manager=EventManager(), journal=journal)
+    player.hp -= 2
+    journal.commit()
+    assert segment_generations(path) == [1]
+
+    autosaver.save()
+    player.hp -= 1
+    journal.commit()
+    assert autosaver.wait(timeout=5)
+    # Only what happened after the snapshot is left
+    assert segment_generations(path) == [2]
+    assert load_game(path).hp == player.hp
+
+    journal.close()
+    autosaver.close(timeout=5)
+
+def test_a_dead_player_is_not_journaled(tmp_path):
+    path, player, journal = start_game(tmp_path)
+    player.hp -= 2
+    journal.commit()
+    player.hp = -2
+    assert journal.commit() == 0
+    assert load_game(path).hp == player.max_hp - 2
+
+    # The player lost: the run since the last save is thrown away
+    journal.discard()
+    assert segment_generations(path) == []
+    assert load_game(path).hp == player.max_hp
+
+def test_advancement_choices_are_journaled(tmp_path):
+    from spells import all_spells
+    from talents import all_talents
+    path, player, journal = start_game(tmp_path)
+    # What AdvancementScreen does, after the level-up autosave
+    player.attributes["mage"] += 1
+    player.skills.append("Thaumaturgy")
+    player.add_talent(all_talents["tough_as_nails"])
+    player.spellbook.append(all_spells["magic_light"])
+    player.max_hp += 4
+    player.hp = player.max_hp
+    journal.commit()
+    # The game crashes here
+
+    loaded = load_game(path)
+    assert loaded.attributes.base == player.attributes.base
+    assert loaded.skills == ["Thaumaturgy"]
+    assert loaded.talents == [all_talents["tough_as_nails"]]
+    assert loaded.spellbook == [all_spells["magic_light"]]
+    assert (loaded.hp, loaded.max_hp) == (player.hp, player.max_hp)
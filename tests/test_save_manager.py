@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from save_codec import SaveFormatError, character_state
+from save_manager import (FILE_HEADER, list_saves, load_game, new_slot_path,
+                          pack_save, read_save_info, save_game, slot_path, unpack_save)
+from character import Character
+
+def make_player(name="Hero", level=1):
+    player = Character(name, x=0, y=0, warrior=3, rogue=3, mage=3)
+    player.level = level
+    return player
+
+def test_listing_reads_only_headers(tmp_path):
+    folder = str(tmp_path)
+    for number, (name, level) in enumerate([("Ann", 3), ("Bo", 1), ("Cy", 7)]):
+        path = slot_path(f"slot{number + 1}", folder)
+        save_game(make_player(name, level), path)
+    (tmp_path / "junk.sav").write_bytes(b"garbage")
+    assert new_slot_path(folder) == slot_path("slot4", folder)
+
+    saves = list_saves(folder)
+    assert sorted((info.name, info.level) for info in saves) == [("Ann", 3), ("Bo", 1), ("Cy", 7)]
+    assert [info.timestamp for info in saves] == sorted((info.timestamp for info in saves), reverse=True)
+
+    # The header is enough: chop the payload off and it still lists
+    path = saves[0].path
+    with open(path, "r+b") as f:
+        f.truncate(FILE_HEADER.size + len(saves[0].name))
+    assert read_save_info(path) == saves[0]
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_payload_is_checksummed(tmp_path, compress):
+    data = pack_save(character_state(make_player()), compress=compress)
+    (tmp_path / "slot1.sav").write_bytes(data)
+    assert read_save_info(str(tmp_path / "slot1.sav")).compressed == compress
+    unpack_save(data)
+
+    corrupt = bytearray(data)
+    corrupt[-1] ^= 0xFF
+    with pytest.raises(SaveFormatError):
+        unpack_save(bytes(corrupt))
+    with pytest.raises(SaveFormatError):
+        unpack_save(data[:-1])
+
+def test_corrupt_save_does_not_load(tmp_path):
+    path = str(tmp_path / "slot1.sav")
+    save_game(make_player(), path)
+    data = bytearray(open(path, "rb").read())
+    data[-2] ^= 0xFF
+    open(path, "wb").write(bytes(data))
+    assert load_game(path) is None
+
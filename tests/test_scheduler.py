@@ -0,0 +1,62 @@
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from unittest.mock import patch, MagicMock
+from scheduler import Scheduler, scheduler, TICKS_PER_SECOND
+from character import Character
+from spell import Spell
+
+def test_timers_fire_on_their_tick_across_all_levels():
+    # Tiny wheels so that cascades and the overflow bucket are exercised
+    wheel = Scheduler(bits=2, levels=3)
+    rng = random.Random(7)
+    fired = []
+    expected = []
+    for _ in range(300):
+        delay = rng.randint(1, 200)
+        wheel.call_later(delay, lambda due=wheel.now + delay: fired.append((due, wheel.now)))
+        expected.append(wheel.now + delay)
+        wheel.advance(rng.randint(0, 3))
+    wheel.advance(250)
+    assert sorted(due for due, _ in fired) == sorted(expected)
+    assert all(due == now for due, now in fired)
+    assert len(wheel) == 0
+
+def test_cancel_and_repeat():
+    wheel = Scheduler()
+    calls = []
+    handle = wheel.call_later(5, calls.append, "once")
+    handle.cancel()
+    repeating = wheel.call_every(3, calls.append, "tick")
+    wheel.advance(10)
+    assert calls == ["tick", "tick", "tick"]
+    repeating.cancel()
+    wheel.advance(10)
+    assert len(calls) == 3
+    assert not repeating.active
+
+def test_callback_can_cancel_a_timer_due_on_the_same_tick():
+    wheel = Scheduler()
+    calls = []
+    second = None
+    wheel.call_later(2, lambda: second.cancel())
+    second = wheel.call_later(2, calls.append, "second")
+    wheel.advance(2)
+    assert calls == []
+
+@patch('dice.Die.roll')
+def test_sustained_spell_expires(mock_roll):
+    mock_roll.return_value = 5
+    char = Character("Test", x=0, y=0, warrior=1, rogue=1, mage=5, skills=["Thaumaturgy"])
+    spell = Spell("Shield", circle=1, dl=5, mana_cost=1, effect=MagicMock(), duration=2)
+    char.spellbook.append(spell)
+
+    assert char.cast_spell(spell)
+    assert spell in char.sustained_spells
+    scheduler.advance(2 * TICKS_PER_SECOND - 1)
+    assert spell in char.sustained_spells
+    scheduler.advance(1)
+    assert spell not in char.sustained_spells
+    assert spell not in char.spell_timers
@@ -0,0 +1,26 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from simulate import PlayerConfig, simulate, monster_classes, run_chunk
+
+def test_monster_classes_found():
+    names = monster_classes()
+    assert {"Goblin", "Skeleton", "Drake", "BanditLeader"} <= set(names)
+
+def test_simulate_reports_stats():
+    config = PlayerConfig(warrior=4, rogue=3, mage=3, skills=["Swords"])
+    results = simulate(config, ["Goblin", "Drake"], duels=40, seed=5, workers=1, chunk_size=15)
+    goblin = results["Goblin"]
+    assert goblin.duels == 40
+    assert 0.0 <= goblin.win_rate <= 1.0
+    assert goblin.mean_turns > 0
+    assert sum(goblin.hp_remaining.values()) == 40
+
+def test_results_do_not_depend_on_sharding():
+    config = PlayerConfig()
+    whole = run_chunk("Skeleton", config, 11, 0, 30)
+    first = run_chunk("Skeleton", config, 11, 0, 12)
+    second = run_chunk("Skeleton", config, 11, 12, 18)
+    first.merge(second)
+    assert (whole.wins, whole.total_turns, whole.hp_remaining) == (first.wins, first.total_turns, first.hp_remaining)
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from character import Character
+from save_codec import SaveFormatError
+from save_journal import SaveJournal
+from save_manager import load_slot, save_game
+from world import MAP_SPAWNS, START_MAP, MapState, WorldState
+
+def spawned(world, map_name=START_MAP):
+    return dict(world.map_state(map_name).spawn(map_name))
+
+def test_new_world_spawns_everyone():
+    characters = spawned(WorldState())
+    assert set(characters) == {spawn.id for spawn in MAP_SPAWNS[START_MAP]}
+    assert not characters["town_guard"].heirloom_quest_complete
+
+def test_map_state_round_trip():
+    world = WorldState(hazard_cooldown=30)
+    state = world.map_state(START_MAP)
+    characters = spawned(world)
+    state.remove("goblin")
+    characters["drake"].hp -= 4
+    characters["town_guard"].heirloom_quest_complete = True
+    for spawn_id, character in characters.items():
+        state.record(spawn_id, character)
+    assert state.changed
+
+    loaded = WorldState.from_bytes(world.to_bytes())
+    assert (loaded.current_map, loaded.hazard_cooldown) == (START_MAP, 30)
+    respawned = spawned(loaded)
+    assert "goblin" not in respawned
+    assert respawned["drake"].hp == characters["drake"].hp
+    assert respawned["town_guard"].heirloom_quest_complete is True
+
+def test_maps_are_decoded_lazily():
+    world = WorldState()
+    world.map_state("caves.txt").remove("cave_troll")
+    world.map_state(START_MAP).remove("goblin")
+    data = bytearray(world.to_bytes())
+    # Chunks are written in name order, so this corrupts only the town
+    data[-1] ^= 0xFF
+    loaded = WorldState.from_bytes(bytes(data))
+    assert loaded.map_names() == {START_MAP, "caves.txt"}
+    assert dict(loaded.loaded_maps()) == {}
+    assert loaded.map_state("caves.txt").removed == {"cave_troll"}
+    with pytest.raises(SaveFormatError):
+        loaded.map_state(START_MAP)
+
+    # A map that was never entered is written back out as it was
+    untouched = WorldState.from_bytes(world.to_bytes())
+    untouched.map_state("caves.txt")
+    assert untouched.to_bytes() == world.to_bytes()
+
+def test_world_is_saved_with_the_player_and_journaled(tmp_path):
+    path = str(tmp_path / "slot1.sav")
+    player = Character("Hero", x=0, y=0, warrior=3, rogue=3, mage=3)
+    world = WorldState()
+    world.map_state(START_MAP).remove("goblin")
+    save_game(player, path, world=world)
+
+    journal = SaveJournal(path, player, world)
+    world.map_state(START_MAP).remove("drake")
+    journal.commit()
+    # Crash before the next save
+
+    loaded_player, loaded_world = load_slot(path)
+    assert loaded_player.name == "Hero"
+    assert {"goblin", "drake"} <= loaded_world.map_state(START_MAP).removed